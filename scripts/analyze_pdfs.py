@@ -3,6 +3,8 @@ import sys
 import os
 import io
 
+from catalog_config import load_config
+
 # Set encoding for Windows console
 if sys.platform == "win32":
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
@@ -40,7 +42,8 @@ def analyze_pdf(pdf_path):
     doc.close()
 
 if __name__ == "__main__":
-    assets_dir = "d:/Antigravity/DSU_Graduation_Catalog/assets"
+    # 경로는 data/catalog_config.json (assets_dir)
+    assets_dir = load_config()["assets_dir"]
     pdfs = [
         "2024_Artbook_HQ.pdf",
         "2023_Artbook_Ebook.pdf"
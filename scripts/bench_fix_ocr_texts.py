@@ -0,0 +1,90 @@
+"""
+fix_common_ocr_errors 마이크로 벤치마크
+
+실제 ocr_text.json 파일의 full_text / details[].text 를 모아서
+기존 방식(치환 표 항목마다 str.replace)과 컴파일된 단일 패스 방식의
+결과가 같은지 확인하고 처리 시간을 비교한다.
+
+사용법:
+    python scripts/bench_fix_ocr_texts.py [ocr_text.json ...]
+"""
+import sys
+import json
+import re
+import time
+from pathlib import Path
+
+from fix_ocr_texts import OCR_REPLACEMENTS, fix_common_ocr_errors
+
+
+def fix_common_ocr_errors_replace_loop(text):
+    """기존 구현: 항목마다 문자열 전체를 다시 훑는 str.replace 반복"""
+    if not text:
+        return text
+
+    fixed = text
+    for wrong, correct in OCR_REPLACEMENTS.items():
+        fixed = fixed.replace(wrong, correct)
+
+    fixed = re.sub(r'\s+', ' ', fixed)
+    return fixed.strip()
+
+
+def collect_texts(json_paths):
+    """OCR JSON 파일들에서 process_ocr_file이 정리하는 모든 텍스트 수집"""
+    texts = []
+    for json_path in json_paths:
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        for page_data in data.get('ocr_results', {}).values():
+            texts.append(page_data.get('full_text', ''))
+            texts.extend(d.get('text', '') for d in page_data.get('details', []))
+    return texts
+
+
+def time_function(func, texts, repeat=5):
+    """repeat번 실행한 것 중 가장 빠른 시간 (초)"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    if len(sys.argv) > 1:
+        json_paths = [Path(p) for p in sys.argv[1:]]
+    else:
+        from catalog_config import load_config
+
+        config = load_config()
+        json_paths = sorted(path for year in config["years"]
+                            for path in Path(config["projects_dir"], year).glob("*/ocr_text.json"))
+
+    if not json_paths:
+        print("❌ OCR JSON 파일을 찾을 수 없습니다.")
+        return
+
+    texts = collect_texts(json_paths)
+    total_chars = sum(len(t) for t in texts)
+    print(f"파일 {len(json_paths)}개, 텍스트 {len(texts)}개, {total_chars:,}자")
+
+    # 결과가 완전히 같은지 먼저 확인
+    mismatches = [t for t in texts
+                  if fix_common_ocr_errors_replace_loop(t) != fix_common_ocr_errors(t)]
+    if mismatches:
+        print(f"❌ 결과 불일치 {len(mismatches)}건 (예: {mismatches[0][:50]!r})")
+        return
+
+    before = time_function(fix_common_ocr_errors_replace_loop, texts)
+    after = time_function(fix_common_ocr_errors, texts)
+
+    print(f"str.replace 반복: {before * 1000:.1f}ms")
+    print(f"단일 패스 컴파일: {after * 1000:.1f}ms")
+    print(f"속도 향상: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,424 @@
+"""
+PDF → 에셋 파이프라인 벤치마크
+
+합성 PDF(벡터 텍스트 + 삽입된 래스터 이미지 + 한국어/영어 글자)를 만들어
+단계별로 처리 시간을 잰다. 여러 DPI/너비 설정마다 페이지/초, MB/초, 단계 중 최대 RSS,
+페이지별 지연 시간 백분위수(p50/p90/p99)를 출력하고 JSON으로 저장하므로
+버전 간 결과를 비교할 수 있다.
+
+RSS는 단계마다 백그라운드 스레드가 현재 RSS를 주기적으로 읽어 최댓값(peak_rss_mb)과
+단계 시작 대비 증가량(rss_delta_mb)을 기록한다. psutil이 있으면 워커 프로세스(OCR 등)도
+합산하고, 없으면 Linux의 /proc/self/statm으로 현재 프로세스만 잰다.
+
+    render   PDF 페이지 → PNG (pdf_render.render_page, extract_pages_as_images와 같은 경로)
+    encode   PNG → WebP 너비 단계 (image_encode.encode_web_variants)
+    text     텍스트 레이어 읽기 + OCR 필요 여부 판단 (pdf_text.plan_page)
+    ocr      EasyOCR (easyocr가 설치되어 있고 --ocr를 줄 때만)
+    clean    OCR 텍스트 정리 (fix_ocr_texts.clean_text)
+
+--ocr를 주면 같은 설정으로 스트리밍 처리(page_pipeline.stream_pages)도 실행해서, 렌더링/
+인코딩/OCR을 겹쳐 실행한 전체 시간을 위 단계들을 차례로 실행한 시간의 합과 비교한다
+(겹침 = 단계 합 / 스트리밍 시간, 1보다 클수록 많이 겹침).
+
+사용법:
+    python scripts/bench_pipeline.py [--pages 20] [--ocr] [--output result.json]
+    python scripts/bench_pipeline.py --compare old.json new.json
+"""
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import fitz  # PyMuPDF
+import numpy as np
+from PIL import Image
+
+# (DPI, 최대 너비) 설정 목록. 최대 너비가 None이면 DPI 그대로 렌더링
+BENCH_SETTINGS = [
+    (150, None),
+    (200, None),
+    (200, 1920),
+    (300, 1920),
+]
+WEB_WIDTHS = (480, 960, 1920)
+
+SAMPLE_TEXT_KO = "졸업 작품 아트북 캐릭터 디자인과 배경 콘셉트 아트, 스토리보드와 애니메이션 제작 과정"
+SAMPLE_TEXT_EN = "Graduation artbook: character design, background concept art, storyboard and animation"
+
+
+def make_synthetic_pdf(path, pages=20, seed=0):
+    """
+    벤치마크용 합성 PDF 만들기 (아트북과 비슷하게 큰 이미지 + 제목 + 본문)
+
+    페이지마다 크기가 다른 래스터 이미지 1~3개와 한국어/영어 본문을 넣는다.
+    """
+    rng = np.random.default_rng(seed)
+    doc = fitz.open()
+
+    for index in range(pages):
+        page = doc.new_page(width=595, height=842)
+
+        for _ in range(1 + index % 3):
+            width, height = rng.integers(300, 1200, size=2)
+            # 그라디언트 + 잡음 (사진/일러스트처럼 압축이 잘 안 되는 이미지)
+            gradient = np.linspace(0, 255, int(width), dtype=np.float32)[None, :, None]
+            noise = rng.normal(0, 40, size=(int(height), int(width), 3))
+            pixels = np.clip(gradient * rng.random(3) + noise, 0, 255).astype(np.uint8)
+
+            buffer = tempfile.SpooledTemporaryFile()
+            Image.fromarray(pixels).save(buffer, "JPEG", quality=85)
+            buffer.seek(0)
+            x0, y0 = rng.integers(20, 300), rng.integers(150, 500)
+            rect = fitz.Rect(x0, y0, x0 + width / 4, y0 + height / 4) & page.rect
+            page.insert_image(rect, stream=buffer.read())
+
+        page.insert_text((50, 80), f"Project {index // 5 + 1} 작품 {index // 5 + 1}",
+                         fontname="korea", fontsize=28)
+        for line in range(index % 4 * 5):
+            text = SAMPLE_TEXT_KO if line % 2 else SAMPLE_TEXT_EN
+            page.insert_text((50, 560 + line * 14), text, fontname="korea", fontsize=9)
+
+    doc.save(path, deflate=True)
+    doc.close()
+    return path
+
+
+# RSS 측정 간격 (초)
+RSS_INTERVAL = 0.01
+
+
+def current_rss():
+    """현재 RSS (바이트, psutil이 있으면 자식 프로세스 포함, 측정할 수 없으면 None)"""
+    try:
+        import psutil
+    except ImportError:
+        try:
+            with open("/proc/self/statm", "r") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, AttributeError):
+            return None
+
+    process = psutil.Process()
+    total = process.memory_info().rss
+    for child in process.children(recursive=True):
+        try:
+            total += child.memory_info().rss
+        except psutil.Error:
+            pass
+    return total
+
+
+class RSSSampler:
+    """
+    with 블록 동안 RSS를 주기적으로 읽어 최댓값 기록
+
+    ru_maxrss는 프로세스 전체의 최고 기록이라 앞 단계의 최대값이 뒤 단계에도 그대로
+    남으므로, 단계마다 따로 샘플링한다.
+    """
+
+    def __init__(self, interval=RSS_INTERVAL):
+        self.interval = interval
+        self.start = self.peak = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            rss = current_rss()
+            if rss is not None:
+                self.peak = max(self.peak, rss)
+
+    def __enter__(self):
+        self.start = self.peak = current_rss()
+        if self.start is not None:
+            self._thread = threading.Thread(target=self._sample, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self.peak = max(self.peak, current_rss() or 0)
+
+    def summary(self):
+        """{"peak_rss_mb", "rss_delta_mb"} (측정할 수 없으면 None)"""
+        if self.start is None:
+            return {"peak_rss_mb": None, "rss_delta_mb": None}
+        return {"peak_rss_mb": round(self.peak / 1024 / 1024, 1),
+                "rss_delta_mb": round((self.peak - self.start) / 1024 / 1024, 1)}
+
+
+def summarize(latencies, total_bytes, elapsed, memory=None):
+    """
+    단계 하나의 측정값 요약
+
+    Args:
+        memory: RSSSampler.summary() 결과
+    """
+    latencies_ms = np.asarray(latencies) * 1000
+    return {
+        "pages": len(latencies),
+        "seconds": round(elapsed, 4),
+        "pages_per_sec": round(len(latencies) / elapsed, 3) if elapsed else None,
+        "mb_per_sec": round(total_bytes / 1024 / 1024 / elapsed, 3) if elapsed else None,
+        "bytes": total_bytes,
+        "p50_ms": round(float(np.percentile(latencies_ms, 50)), 3),
+        "p90_ms": round(float(np.percentile(latencies_ms, 90)), 3),
+        "p99_ms": round(float(np.percentile(latencies_ms, 99)), 3),
+        **(memory or {"peak_rss_mb": None, "rss_delta_mb": None})
+    }
+
+
+def time_pages(func, items):
+    """
+    항목마다 func를 실행해 (지연 시간 리스트, 처리한 바이트 합, 전체 시간, 결과 리스트,
+    RSS 요약)
+
+    func는 (결과, 처리한 바이트 수)를 반환해야 한다.
+    """
+    latencies = []
+    results = []
+    total_bytes = 0
+    with RSSSampler() as sampler:
+        start = time.perf_counter()
+        for item in items:
+            t0 = time.perf_counter()
+            result, nbytes = func(item)
+            latencies.append(time.perf_counter() - t0)
+            results.append(result)
+            total_bytes += nbytes
+        elapsed = time.perf_counter() - start
+    return latencies, total_bytes, elapsed, results, sampler.summary()
+
+
+def bench_setting(pdf_path, work_dir, dpi, max_width, run_ocr=False):
+    """DPI/너비 설정 하나로 모든 단계 측정"""
+    from image_encode import encode_web_variants
+    from pdf_render import page_filename, render_page
+    from pdf_text import page_number, plan_page
+
+    stages = {}
+    doc = fitz.open(pdf_path)
+
+    def render(page_num):
+        path = os.path.join(work_dir, page_filename(page_num))
+        render_page(doc[page_num - 1], path, dpi=dpi, max_width=max_width)
+        return path, os.path.getsize(path)
+
+    latencies, nbytes, elapsed, image_paths, memory = time_pages(render, range(1, len(doc) + 1))
+    stages["render"] = summarize(latencies, nbytes, elapsed, memory)
+
+    def encode(image_path):
+        stem = os.path.splitext(os.path.basename(image_path))[0]
+        with Image.open(image_path) as img:
+            img.load()
+            info = encode_web_variants(img, work_dir, stem, formats=("webp",), widths=WEB_WIDTHS)
+        return info, sum(v["bytes"] for v in info["variants"])
+
+    latencies, nbytes, elapsed, _, memory = time_pages(encode, image_paths)
+    stages["encode"] = summarize(latencies, nbytes, elapsed, memory)
+
+    def text_layer(image_path):
+        plan = plan_page(doc[page_number(image_path) - 1], image_path)
+        return plan, len(plan["native"]["full_text"].encode("utf-8"))
+
+    latencies, nbytes, elapsed, plans, memory = time_pages(text_layer, image_paths)
+    stages["text"] = summarize(latencies, nbytes, elapsed, memory)
+    texts = [plan["native"]["full_text"] for plan in plans]
+
+    if run_ocr:
+        from ocr_engine import BatchOCREngine
+
+        with BatchOCREngine() as engine:
+            # 모델 로딩 시간은 제외하고 페이지 처리만 측정
+            engine.recognize(image_paths[:1])
+
+            def ocr(image_path):
+                result = engine.recognize([image_path])[0]
+                return result, os.path.getsize(image_path)
+
+            latencies, nbytes, elapsed, results, memory = time_pages(ocr, image_paths)
+        stages["ocr"] = summarize(latencies, nbytes, elapsed, memory)
+        texts = [result["full_text"] for result in results]
+
+    from fix_ocr_texts import clean_text
+
+    def clean(text):
+        return clean_text(text), len(text.encode("utf-8"))
+
+    latencies, nbytes, elapsed, _, memory = time_pages(clean, texts)
+    stages["clean"] = summarize(latencies, nbytes, elapsed, memory)
+
+    doc.close()
+    return stages
+
+
+def bench_stream(pdf_path, work_dir, dpi, max_width, stages):
+    """
+    스트리밍 처리(렌더링 → 인코딩 → OCR 겹쳐 실행) 전체 시간과 단계 합 비교
+
+    Args:
+        stages: bench_setting() 결과 (차례로 실행한 단계별 시간)
+
+    Returns:
+        {seconds, stage_seconds, overlap, ocr_workers}
+    """
+    from extract_pdf_content import BUILD_SETTINGS, OCR_BATCH_SIZE, OCR_WORKERS
+    from ocr_engine import BatchOCREngine
+    from page_pipeline import stream_pages
+
+    # 위 단계 측정과 같은 작업: 모든 페이지 전체 OCR, 중복 제거 없음
+    settings = {**BUILD_SETTINGS, "dpi": dpi, "max_width": max_width, "single_pass": True,
+                "web_formats": ["webp"], "web_widths": list(WEB_WIDTHS),
+                "text_layer": False, "ocr_regions": False, "dedupe": False}
+    with fitz.open(pdf_path) as doc:
+        pages = len(doc)
+
+    with BatchOCREngine(batch_size=OCR_BATCH_SIZE, workers=OCR_WORKERS) as engine:
+        # 모델 로딩 시간은 제외 (워커마다 Reader를 미리 만들도록 한 배치씩)
+        warmup = os.path.join(work_dir, "warmup.png")
+        Image.new("RGB", (64, 64), "white").save(warmup)
+        engine.recognize([warmup] * OCR_BATCH_SIZE * OCR_WORKERS)
+
+        start = time.perf_counter()
+        stream_pages(pdf_path, (1, pages), work_dir, engine, settings)
+        elapsed = time.perf_counter() - start
+
+    stage_seconds = sum(stages[name]["seconds"] for name in ("render", "encode", "ocr"))
+    return {"seconds": round(elapsed, 4), "stage_seconds": round(stage_seconds, 4),
+            "overlap": round(stage_seconds / elapsed, 2) if elapsed else None,
+            "ocr_workers": OCR_WORKERS}
+
+
+def environment():
+    """결과 비교에 필요한 실행 환경 정보"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+
+    import PIL
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "pymupdf": fitz.VersionBind,
+        "pillow": PIL.__version__,
+        "numpy": np.__version__,
+        "commit": commit
+    }
+
+
+def run_benchmark(pages=20, run_ocr=False, settings=BENCH_SETTINGS):
+    """
+    합성 PDF로 모든 설정을 측정
+
+    Returns:
+        {"environment": {...}, "pdf": {...}, "results": [{dpi, max_width, stages}, ...]}
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = make_synthetic_pdf(os.path.join(tmp, "synthetic.pdf"), pages=pages)
+        report = {
+            "environment": environment(),
+            "pdf": {"pages": pages, "bytes": os.path.getsize(pdf_path)},
+            "results": []
+        }
+
+        for dpi, max_width in settings:
+            work_dir = os.path.join(tmp, f"{dpi}-{max_width}")
+            os.makedirs(work_dir)
+            result = {
+                "dpi": dpi,
+                "max_width": max_width,
+                "stages": bench_setting(pdf_path, work_dir, dpi, max_width, run_ocr)
+            }
+            if run_ocr:
+                stream_dir = os.path.join(tmp, f"{dpi}-{max_width}-stream")
+                os.makedirs(stream_dir)
+                result["stream"] = bench_stream(pdf_path, stream_dir, dpi, max_width,
+                                                result["stages"])
+            report["results"].append(result)
+    return report
+
+
+def _fmt(value, spec):
+    """None이면 "-" (시간이 0으로 잰 단계, 측정할 수 없는 RSS)"""
+    return "-" if value is None else format(value, spec)
+
+
+def print_report(report):
+    print(f"\n합성 PDF: {report['pdf']['pages']}페이지, {report['pdf']['bytes'] / 1024 / 1024:.1f}MB")
+    print(f"{'설정':<14}{'단계':<8}{'페이지/초':>10}{'MB/초':>9}{'p50ms':>9}{'p90ms':>9}"
+          f"{'p99ms':>9}{'RSS MB':>9}{'+RSS MB':>9}")
+    for result in report["results"]:
+        label = f"{result['dpi']}dpi/{result['max_width'] or '-'}"
+        for name, stage in result["stages"].items():
+            print(f"{label:<14}{name:<8}{_fmt(stage['pages_per_sec'], '.1f'):>10}"
+                  f"{_fmt(stage['mb_per_sec'], '.2f'):>9}"
+                  f"{stage['p50_ms']:>9.1f}{stage['p90_ms']:>9.1f}{stage['p99_ms']:>9.1f}"
+                  f"{_fmt(stage.get('peak_rss_mb'), '.0f'):>9}"
+                  f"{_fmt(stage.get('rss_delta_mb'), '.0f'):>9}")
+        stream = result.get("stream")
+        if stream:
+            print(f"{label:<14}{'stream':<8}{stream['seconds']:.2f}초 "
+                  f"(단계 합 {stream['stage_seconds']:.2f}초, 겹침 {_fmt(stream['overlap'], '.2f')}x, "
+                  f"OCR 워커 {stream['ocr_workers']}개)")
+
+
+def compare_reports(old, new):
+    """두 결과 파일의 단계별 p50 / 페이지/초 비교 출력"""
+    old_results = {(r["dpi"], r["max_width"]): r["stages"] for r in old["results"]}
+    print(f"\n{old['environment'].get('commit')} → {new['environment'].get('commit')}")
+    for result in new["results"]:
+        key = (result["dpi"], result["max_width"])
+        if key not in old_results:
+            continue
+        for name, stage in result["stages"].items():
+            before = old_results[key].get(name)
+            if not before:
+                continue
+            if stage["pages_per_sec"] and before["pages_per_sec"]:
+                ratio = f"{stage['pages_per_sec'] / before['pages_per_sec']:.2f}x"
+            else:
+                ratio = "-"
+            print(f"  {key[0]}dpi/{key[1] or '-'} {name:<7} "
+                  f"p50 {before['p50_ms']:.1f} → {stage['p50_ms']:.1f}ms ({ratio})")
+
+
+def main():
+    args = sys.argv[1:]
+
+    if "--compare" in args:
+        index = args.index("--compare")
+        with open(args[index + 1], "r", encoding="utf-8") as f:
+            old = json.load(f)
+        with open(args[index + 2], "r", encoding="utf-8") as f:
+            new = json.load(f)
+        compare_reports(old, new)
+        return
+
+    pages = int(args[args.index("--pages") + 1]) if "--pages" in args else 20
+    output = (args[args.index("--output") + 1] if "--output" in args
+              else f".cache/bench/pipeline-{time.strftime('%Y%m%d-%H%M%S')}.json")
+
+    report = run_benchmark(pages=pages, run_ocr="--ocr" in args)
+    print_report(report)
+
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n✓ 결과 저장: {output}")
+
+
+if __name__ == "__main__":
+    # UTF-8 인코딩 강제 설정 (Windows cp949 문제 해결)
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+    sys.stderr.reconfigure(encoding='utf-8', errors='replace')
+
+    main()
@@ -0,0 +1,206 @@
+"""
+빌드 대상 의존성 그래프
+
+대상(target)마다 의존 대상, 입력, 실행 함수를 등록하면 필요한 대상만 의존성 순서대로
+실행한다. 입력이 바뀌었거나 출력이 없어졌거나 의존 대상이 다시 빌드된 대상만
+오래된(stale) 것으로 보고, 서로 의존하지 않는 대상은 스레드 풀에서 동시에 실행한다.
+
+상태는 BuildManifest 형식으로 저장하므로 extract_pdf_content의 증분 빌드와
+같은 방법(입력 비교 + 출력 해시)으로 최신 여부를 판단한다.
+
+    graph = BuildGraph(BuildManifest(".cache/catalog_build.json"))
+    graph.add(Target("render:2024/catcher", render, inputs=lambda: {...}, resource="render"))
+    graph.add(Target("ocr:2024/catcher", ocr, deps=["render:2024/catcher"], ...))
+    graph.run(graph.select(["ocr"]), jobs=3)
+"""
+import fnmatch
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+class Target:
+    """
+    빌드 대상 하나
+
+    Args:
+        name: "종류:키" 형식 이름 (예: "ocr:2024/catcher", "export:2024")
+        action: 인자 없이 실행해 출력 파일 경로 리스트를 반환하는 함수
+        deps: 먼저 빌드해야 하는 대상 이름 리스트
+        inputs: 입력 딕셔너리를 반환하는 함수 (의존 대상이 끝난 뒤에 계산하고, 기록할 때는
+            실행이 끝난 뒤에 다시 계산)
+        resource: 같은 자원 이름을 가진 대상은 한 번에 하나만 실행
+            (예: 프로세스 풀을 쓰는 렌더링, Reader 하나를 공유하는 OCR)
+    """
+
+    def __init__(self, name, action, deps=(), inputs=None, resource=None):
+        self.name = name
+        self.action = action
+        self.deps = list(deps)
+        self.inputs = inputs or dict
+        self.resource = resource
+
+    @property
+    def kind(self):
+        return self.name.split(":", 1)[0]
+
+
+class BuildGraph:
+    """
+    대상 그래프와 빌드 상태
+
+    Args:
+        manifest: 대상별 입력/출력을 기록하는 BuildManifest
+    """
+
+    def __init__(self, manifest):
+        self.manifest = manifest
+        self.targets = {}
+
+    def add(self, target):
+        if target.name in self.targets:
+            raise ValueError(f"대상 이름 중복: {target.name}")
+        self.targets[target.name] = target
+        return target
+
+    def select(self, patterns=None):
+        """
+        패턴에 맞는 대상과 그 의존 대상 전체
+
+        패턴: "ocr" (종류 전체), "ocr:2024/*" (glob), "2024/catcher" (그 프로젝트의 모든 단계)
+        패턴이 없으면 모든 대상.
+        """
+        if not patterns:
+            chosen = set(self.targets)
+        else:
+            chosen = set()
+            for pattern in patterns:
+                if ":" not in pattern:
+                    pattern = f"{pattern}:*" if "/" not in pattern else f"*:{pattern}"
+                matched = fnmatch.filter(self.targets, pattern)
+                if not matched:
+                    raise KeyError(f"일치하는 대상 없음: {pattern}")
+                chosen.update(matched)
+
+        stack = list(chosen)
+        while stack:
+            for dep in self.targets[stack.pop()].deps:
+                if dep not in chosen:
+                    chosen.add(dep)
+                    stack.append(dep)
+        return chosen
+
+    def order(self, names):
+        """의존성 순서(위상 정렬)로 정렬한 대상 이름 리스트 (순환이 있으면 ValueError)"""
+        ordered = []
+        state = {}
+
+        def visit(name):
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"순환 의존성: {name}")
+            state[name] = "visiting"
+            for dep in self.targets[name].deps:
+                if dep in names:
+                    visit(dep)
+            state[name] = "done"
+            ordered.append(name)
+
+        for name in sorted(names):
+            visit(name)
+        return ordered
+
+    def _inputs(self, target):
+        # 의존 대상의 빌드 시각을 입력에 넣어 앞 단계가 다시 실행되면 뒤 단계도 오래된 것으로 봄
+        return {**target.inputs(),
+                "deps": {dep: self.manifest.built_at(dep) for dep in target.deps}}
+
+    def is_stale(self, name):
+        target = self.targets[name]
+        return not self.manifest.is_up_to_date(name, self._inputs(target))
+
+    def plan(self, names, force=False):
+        """실제로 실행하지 않고 다시 빌드할 대상 목록 (의존 대상이 오래되면 함께 오래됨)"""
+        stale = []
+        for name in self.order(names):
+            target = self.targets[name]
+            if force or any(dep in stale for dep in target.deps) or self.is_stale(name):
+                stale.append(name)
+        return stale
+
+    def run(self, names, jobs=1, force=False):
+        """
+        대상 빌드 (오래된 대상만, 독립 대상은 최대 jobs개 동시 실행)
+
+        실패한 대상에 의존하는 대상은 건너뛰고 나머지 갈래는 계속 빌드한다.
+
+        Returns:
+            (다시 빌드한 대상, 최신이라 건너뛴 대상, 실패/건너뛴 대상) 이름 리스트
+        """
+        pending = self.order(names)
+        built, skipped, failed = [], [], []
+        finished = set()
+        running = {}
+        busy = set()
+
+        def ready(name):
+            target = self.targets[name]
+            return (all(dep in finished or dep not in names for dep in target.deps)
+                    and target.resource not in busy)
+
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+            while pending or running:
+                progressed = False
+                for name in list(pending):
+                    if len(running) >= max(1, jobs):
+                        break
+                    target = self.targets[name]
+                    if any(dep in failed for dep in target.deps):
+                        pending.remove(name)
+                        progressed = True
+                        failed.append(name)
+                        print(f"  ⏭️ {name}: 의존 대상 실패로 건너뜀")
+                        continue
+                    if not ready(name):
+                        continue
+
+                    pending.remove(name)
+                    progressed = True
+                    inputs = self._inputs(target)
+                    rebuilt_dep = any(dep in built for dep in target.deps)
+                    if not force and not rebuilt_dep and self.manifest.is_up_to_date(name, inputs):
+                        skipped.append(name)
+                        finished.add(name)
+                        continue
+
+                    print(f"\n▶ {name}")
+                    if target.resource:
+                        busy.add(target.resource)
+                    running[pool.submit(target.action)] = (name, inputs)
+
+                if not running:
+                    if not progressed:
+                        raise RuntimeError(f"실행할 수 있는 대상 없음: {pending}")
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, inputs = running.pop(future)
+                    busy.discard(self.targets[name].resource)
+                    try:
+                        outputs = future.result()
+                        # 실행 중에 생긴 입력(예: 새로 판정된 중복 페이지의 원본)까지 기록해야
+                        # 바뀐 것 없이 다시 빌드했을 때 최신으로 판단됨
+                        inputs = self._inputs(self.targets[name])
+                    except Exception:
+                        failed.append(name)
+                        print(f"  ❌ {name} 실패:\n{traceback.format_exc()}")
+                        continue
+
+                    # 기록은 메인 스레드에서만 (매니페스트는 스레드 안전하지 않음)
+                    self.manifest.record(name, inputs, outputs or [])
+                    self.manifest.save()
+                    built.append(name)
+                    finished.add(name)
+                    print(f"  ✓ {name}")
+
+        return built, skipped, failed
@@ -0,0 +1,149 @@
+"""
+증분 빌드 매니페스트
+
+프로젝트별로 입력(원본 PDF, 페이지 범위, 렌더링/OCR 설정)과 출력 파일 해시를
+기록해 두고, 다음 실행 때 입력과 출력이 그대로면 해당 프로젝트를 건너뛴다.
+"""
+import hashlib
+import json
+import os
+import time
+
+DEFAULT_MANIFEST_PATH = ".cache/build_manifest.json"
+MANIFEST_VERSION = 1
+
+# 후속 스크립트(fix_ocr_texts, rewrite_ocr)가 수정하는 출력은 존재 여부만 확인
+MUTABLE_OUTPUTS = {"ocr_text.json"}
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    """파일 SHA-256 해시 (큰 PDF도 메모리에 모두 올리지 않도록 청크 단위로 읽음)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _stat_entry(path):
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime": stat.st_mtime}
+
+
+class BuildManifest:
+    """
+    프로젝트별 빌드 입력/출력 기록
+
+    Args:
+        path: 매니페스트 JSON 경로
+    """
+
+    def __init__(self, path=DEFAULT_MANIFEST_PATH):
+        self.path = path
+        self.projects = {}
+        # 한 번 실행 중 같은 PDF를 여러 번 해시하지 않도록 기억
+        self._pdf_memo = {}
+
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == MANIFEST_VERSION:
+                self.projects = data.get("projects", {})
+
+    def pdf_fingerprint(self, pdf_path):
+        """
+        원본 PDF 지문 (경로, 크기, 수정 시각, SHA-256)
+
+        크기와 수정 시각이 이전 기록과 같으면 해시를 다시 계산하지 않는다.
+        """
+        if pdf_path in self._pdf_memo:
+            return self._pdf_memo[pdf_path]
+
+        fingerprint = {"path": pdf_path, **_stat_entry(pdf_path)}
+        for entry in self.projects.values():
+            previous = entry["inputs"].get("pdf")
+            if (previous and previous["path"] == pdf_path and previous["size"] == fingerprint["size"]
+                    and previous["mtime"] == fingerprint["mtime"]):
+                fingerprint["sha256"] = previous["sha256"]
+                break
+        else:
+            fingerprint["sha256"] = file_sha256(pdf_path)
+
+        self._pdf_memo[pdf_path] = fingerprint
+        return fingerprint
+
+    def project_inputs(self, project_info, settings):
+        """
+        프로젝트 빌드에 영향을 주는 입력 묶음
+
+        Args:
+            project_info: parse_artbook_mapping이 반환한 프로젝트 딕셔너리
+            settings: 렌더링/이미지/OCR 설정 딕셔너리
+        """
+        return {
+            "pdf": self.pdf_fingerprint(project_info['pdf']),
+            "pages": list(project_info['pages']),
+            "settings": settings
+        }
+
+    @staticmethod
+    def _comparable(inputs):
+        # 내용이 같으면 수정 시각만 바뀐 PDF(복사, touch)는 변경으로 보지 않음
+        if "pdf" not in inputs:
+            return inputs
+        pdf = {k: v for k, v in inputs["pdf"].items() if k != "mtime"}
+        return {**inputs, "pdf": pdf}
+
+    def _outputs_intact(self, outputs):
+        for path, recorded in outputs.items():
+            if not os.path.exists(path):
+                return False
+            if os.path.basename(path) in MUTABLE_OUTPUTS:
+                continue
+
+            current = _stat_entry(path)
+            if current["size"] != recorded["size"]:
+                return False
+            if current["mtime"] != recorded["mtime"] and file_sha256(path) != recorded["sha256"]:
+                return False
+        return True
+
+    def is_up_to_date(self, key, inputs):
+        """
+        입력이 같고 출력이 그대로 남아 있으면 True
+
+        Args:
+            key: 프로젝트 키 (예: "2024/catcher", catalog build에서는 "ocr:2024/catcher")
+            inputs: project_inputs()의 반환값
+        """
+        entry = self.projects.get(key)
+        if entry is None:
+            return False
+        if self._comparable(entry["inputs"]) != self._comparable(inputs):
+            return False
+        return self._outputs_intact(entry["outputs"])
+
+    def record(self, key, inputs, output_paths):
+        """빌드 완료된 프로젝트의 입력과 출력 해시 기록"""
+        self.projects[key] = {
+            "inputs": inputs,
+            "built_at": time.time(),
+            "outputs": {
+                path: {**_stat_entry(path), "sha256": file_sha256(path)}
+                for path in output_paths
+            }
+        }
+
+    def built_at(self, key):
+        """마지막으로 기록된 빌드 시각 (없으면 None, 뒤 단계의 입력으로 사용)"""
+        entry = self.projects.get(key)
+        return entry.get("built_at") if entry else None
+
+    def save(self):
+        """매니페스트 저장 (중간에 중단되어도 파일이 깨지지 않도록 임시 파일 후 교체)"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": MANIFEST_VERSION, "projects": self.projects},
+                      f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
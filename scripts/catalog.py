@@ -0,0 +1,440 @@
+"""
+카탈로그 빌드 스크립트 통합 실행기
+
+각 스크립트를 하위 명령으로 실행한다. 하위 명령에 필요한 모듈(fitz, PIL, EasyOCR 등)은
+그 명령을 실행할 때만 불러오므로 --help와 mapping/inspect/show는 1초 안에 시작한다.
+
+사용법:
+    python scripts/catalog.py --help
+    python scripts/catalog.py build [TARGET ...] [--jobs 3] [--dry-run] [--force]
+    python scripts/catalog.py mapping [--year 2024] [--json]
+    python scripts/catalog.py inspect [PDF ...]
+    python scripts/catalog.py show 2023/snowcchio [--backup]
+    python scripts/catalog.py diff old.pdf new.pdf
+    python scripts/catalog.py extract [--metrics m.jsonl --quiet]   # extract_pdf_content.py
+    python scripts/catalog.py artwork [--min-side 400]              # extract_artwork.py
+    python scripts/catalog.py hires book.pdf 12 --dpi 600            # tiled_render.py
+    python scripts/catalog.py tiles [--workers 4]                    # deep_zoom.py
+    python scripts/catalog.py clean [--watch]                        # fix_ocr_texts.py
+    python scripts/catalog.py rewrite                                # rewrite_ocr.py
+    python scripts/catalog.py detect [--score]                       # detect_projects.py
+    python scripts/catalog.py thumbnails [--sheet]                   # page_thumbnails.py
+    python scripts/catalog.py bench [--pages 20]                     # bench_pipeline.py
+"""
+import argparse
+import json
+import os
+import runpy
+import sys
+import threading
+
+from build_graph import BuildGraph, Target
+from build_manifest import BuildManifest
+from catalog_config import cache_path, load_config, project_dir
+from parse_mapping import parse_artbook_mapping
+
+# 빌드 단계 순서: render → ocr → clean → rewrite → export (연도별)
+# artwork(삽입 이미지 원본 추출)는 다른 단계와 독립, tiles(딥 줌 피라미드)는 render 다음
+BUILD_KINDS = ("render", "ocr", "clean", "rewrite", "export", "artwork", "tiles")
+BUILD_JOBS = 3
+
+# OCR 단계 결과에 영향을 주는 BUILD_SETTINGS 키 (렌더링 단계는 page_fingerprint.index_settings)
+TEXT_SETTING_KEYS = ("text_layer", "min_text_chars", "min_text_coverage", "ocr_regions")
+
+# 하위 명령 → 그대로 실행할 스크립트 모듈 (나머지 인자는 스크립트에 전달)
+SCRIPT_COMMANDS = {
+    "extract": ("extract_pdf_content", "PDF 페이지 렌더링 + 웹 인코딩 + 텍스트/OCR 추출"),
+    "artwork": ("extract_artwork", "삽입된 작품 이미지 원본 추출 (재렌더링 없음)"),
+    "hires": ("tiled_render", "인쇄 해상도 페이지 렌더링 (타일 단위, 메모리 상한)"),
+    "tiles": ("deep_zoom", "페이지 이미지의 딥 줌 타일 피라미드 생성 (DZI, WebP)"),
+    "clean": ("fix_ocr_texts", "OCR 텍스트 오타 수정 (규칙이 바뀐 페이지만)"),
+    "rewrite": ("rewrite_ocr", "수동 재작성 텍스트 적용"),
+    "detect": ("detect_projects", "작품 경계 자동 감지"),
+    "thumbnails": ("page_thumbnails", "저해상도 페이지 썸네일 캐시 생성"),
+    "bench": ("bench_pipeline", "합성 PDF 파이프라인 벤치마크"),
+}
+
+
+def mapping_pdfs(mapping):
+    """매핑 파일에 나온 PDF 경로 (중복 제거, 순서 유지)"""
+    return list(dict.fromkeys(project["pdf"] for projects in mapping.values()
+                              for project in projects))
+
+
+def load_mapping(config):
+    return parse_artbook_mapping(config["mapping"], config["assets_dir"])
+
+
+def cmd_mapping(args):
+    """매핑 파일의 연도별 프로젝트와 페이지 범위 출력"""
+    mapping = load_mapping(args.config)
+    if args.year:
+        mapping = {args.year: mapping.get(args.year, [])}
+
+    if args.json:
+        print(json.dumps(mapping, ensure_ascii=False, indent=2))
+        return
+
+    for year, projects in mapping.items():
+        print(f"\n{year}년: {len(projects)}개 프로젝트")
+        for project in projects:
+            start, end = project["pages"]
+            print(f"  {start:>4}-{end:<4} ({end - start + 1:>3}p)  {project['title']}")
+
+
+def cmd_inspect(args):
+    """PDF 페이지 수/크기/이미지/텍스트 미리보기"""
+    from inspect_pdf import inspect_pdf
+
+    pdfs = args.pdfs or mapping_pdfs(load_mapping(args.config))
+    for pdf in pdfs:
+        try:
+            inspect_pdf(pdf)
+        except Exception as e:
+            print(f"❌ {pdf}: {e}")
+
+
+def cmd_show(args):
+    """프로젝트의 OCR 텍스트 출력"""
+    from pathlib import Path
+
+    from ocr_store import load_ocr_data
+
+    json_path = Path(args.config["projects_dir"]) / args.project / (
+        "ocr_text.backup.json" if args.backup else "ocr_text.json")
+    data = load_ocr_data(json_path)
+    if data is None:
+        print(f"파일 없음: {json_path}")
+        return 1
+
+    print(f"프로젝트: {data['title']} ({data['year']})")
+    for page_name in sorted(data["ocr_results"]):
+        print(f"\n--- {page_name} ---")
+        print(data["ocr_results"][page_name].get("full_text", ""))
+
+
+def cmd_diff(args):
+    """두 PDF 개정판의 바뀐 페이지 (렌더링 없이 페이지 지문 비교)"""
+    from page_fingerprint import diff_pdfs
+
+    changed, added, removed = diff_pdfs(args.old, args.new)
+    print(f"바뀐 페이지: {len(changed)}개")
+    if changed:
+        print("  " + ", ".join(str(n) for n in changed))
+    if added or removed:
+        print(f"추가: {added}, 없어짐: {removed}")
+
+
+def _file_digest(paths):
+    """규칙 파일 등 작은 입력 파일들의 내용 해시"""
+    import hashlib
+
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(str(path).encode("utf-8"))
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+class CatalogBuild:
+    """
+    카탈로그 전체 빌드 그래프
+
+    프로젝트마다 render → ocr → clean → rewrite 대상을, 연도마다 export 대상을 만든다.
+    렌더링은 안에서 프로세스 풀을 쓰고 OCR은 Reader 하나를 공유하므로 같은 종류끼리는
+    하나씩 실행하고, 서로 다른 프로젝트의 렌더링/OCR/정리는 동시에 진행한다.
+
+    Args:
+        config: load_config() 결과
+        mapping: parse_artbook_mapping() 결과
+        settings: 렌더링/OCR 설정 (기본 extract_pdf_content.BUILD_SETTINGS)
+    """
+
+    def __init__(self, config, mapping, settings=None):
+        from extract_pdf_content import BUILD_SETTINGS
+
+        self.config = config
+        self.settings = settings or BUILD_SETTINGS
+        self.manifest = BuildManifest(cache_path(config, "catalog_build.json"))
+        self.graph = BuildGraph(self.manifest)
+        self._ocr_cache = None
+        self._ocr_engine = None
+        self._hash_index = None
+        self._hash_index_lock = threading.Lock()
+
+        for year in config["years"]:
+            rewrites = [self._add_project(year, project) for project in mapping.get(year, [])]
+            self._add_export(year, rewrites)
+
+    def _add_project(self, year, project):
+        """프로젝트 하나의 render/ocr/clean/rewrite/artwork/tiles 대상 추가 → rewrite 대상 이름"""
+        from extract_pdf_content import slugify
+
+        project_id = slugify(project["title"])
+        key = f"{year}/{project_id}"
+        output_dir = project_dir(self.config, year, project_id)
+        json_path = os.path.join(output_dir, "ocr_text.json")
+        pages = list(project["pages"])
+
+        def render():
+            from extract_pdf_content import render_project
+
+            image_paths, web_outputs = render_project(project, output_dir, self.settings,
+                                                      project_id, self.hash_index())
+            return image_paths + web_outputs
+
+        def render_inputs():
+            from image_encode import duplicate_sources
+            from page_fingerprint import index_settings
+
+            # 중복 페이지의 원본은 다른 프로젝트에 있을 수 있으므로 원본 내용도 입력에 넣음
+            return {"pdf": self.manifest.pdf_fingerprint(project["pdf"]), "pages": pages,
+                    "settings": index_settings(self.settings),
+                    "duplicates": duplicate_sources(output_dir)}
+
+        def ocr():
+            from extract_pdf_content import ocr_project
+            from pdf_render import page_filename
+
+            image_paths = [os.path.join(output_dir, page_filename(n))
+                           for n in range(pages[0], pages[1] + 1)]
+            image_paths = [path for path in image_paths if os.path.exists(path)]
+            return [ocr_project(project, year, project_id, output_dir, image_paths,
+                                self.ocr_engine(), self.settings)]
+
+        def ocr_inputs():
+            from image_encode import load_variants
+            from ocr_engine import ocr_settings
+            from page_pipeline import duplicate_results
+
+            return {"pdf": self.manifest.pdf_fingerprint(project["pdf"]), "pages": pages,
+                    "settings": {**{k: self.settings.get(k) for k in TEXT_SETTING_KEYS},
+                                 "ocr": ocr_settings()},
+                    "duplicates": duplicate_results(output_dir, load_variants(output_dir))}
+
+        def clean():
+            from fix_ocr_texts import process_ocr_file
+
+            pages_cleaned = process_ocr_file(json_path, year, project_id, raise_errors=True)
+            print(f"  ✓ {key}: {pages_cleaned}개 페이지 정리")
+            backup_path = os.path.join(output_dir, "ocr_text.backup.json")
+            return [json_path] + ([backup_path] if os.path.exists(backup_path) else [])
+
+        def clean_inputs():
+            from fix_ocr_texts import rule_store
+
+            return {"rules": _file_digest(rule_store.layer_paths(year, project_id))}
+
+        def rewrite():
+            from pathlib import Path
+
+            from rewrite_ocr import rewrite_project
+
+            # 재작성 텍스트가 없는 프로젝트는 건드리지 않음
+            if rewrite_inputs()["pages"]:
+                rewrite_project(Path(output_dir), project_id)
+            return [json_path]
+
+        def rewrite_inputs():
+            from rewrite_ocr import rule_store
+
+            return {"pages": rule_store.get(year, project_id).pages}
+
+        def artwork():
+            from extract_artwork import extract_artwork
+
+            outputs = extract_artwork(project["pdf"], pages, output_dir,
+                                      hash_index=self.hash_index())
+            print(f"  ✓ {key}: 이미지 {len(outputs) - 1}개")
+            return outputs
+
+        def artwork_inputs():
+            from extract_artwork import MIN_SIDE
+
+            return {"pdf": self.manifest.pdf_fingerprint(project["pdf"]), "pages": pages,
+                    "min_side": MIN_SIDE}
+
+        def tiles():
+            from deep_zoom import build_project_tiles
+            from extract_pdf_content import RENDER_WORKERS
+            from pdf_render import page_filename
+
+            image_paths = [os.path.join(output_dir, page_filename(n))
+                           for n in range(pages[0], pages[1] + 1)]
+            image_paths = [path for path in image_paths if os.path.exists(path)]
+            outputs = build_project_tiles(output_dir, image_paths, RENDER_WORKERS)
+            print(f"  ✓ {key}: 페이지 {len(image_paths)}개 타일 피라미드")
+            return outputs
+
+        def tiles_inputs():
+            from deep_zoom import pyramid_settings
+
+            return {"settings": pyramid_settings()}
+
+        self.graph.add(Target(f"render:{key}", render, inputs=render_inputs, resource="render"))
+        self.graph.add(Target(f"ocr:{key}", ocr, deps=[f"render:{key}"], inputs=ocr_inputs,
+                              resource="ocr"))
+        self.graph.add(Target(f"clean:{key}", clean, deps=[f"ocr:{key}"], inputs=clean_inputs))
+        self.graph.add(Target(f"rewrite:{key}", rewrite, deps=[f"clean:{key}"],
+                              inputs=rewrite_inputs))
+        self.graph.add(Target(f"artwork:{key}", artwork, inputs=artwork_inputs))
+        self.graph.add(Target(f"tiles:{key}", tiles, deps=[f"render:{key}"], inputs=tiles_inputs,
+                              resource="render"))
+        return f"rewrite:{key}"
+
+    def _add_export(self, year, rewrites):
+        """연도의 모든 ocr_text.json을 컬럼형 저장소(ocr_text.bin)로 묶는 대상 추가"""
+        def export():
+            from ocr_store import convert_year
+
+            converted = convert_year(os.path.join(self.config["projects_dir"], year))
+            if converted is None:
+                return []
+            store_path, json_size, store_size = converted
+            print(f"  ✓ {store_path}: {json_size / 1024:.0f}KB → {store_size / 1024:.0f}KB")
+            return [str(store_path)]
+
+        self.graph.add(Target(f"export:{year}", export, deps=rewrites))
+
+    def ocr_engine(self):
+        """첫 OCR 대상이 실행될 때 OCR 캐시와 엔진 생성 (모든 프로젝트가 공유)"""
+        if self._ocr_engine is None:
+            from extract_pdf_content import (OCR_BATCH_SIZE, OCR_CACHE_MAX_BYTES, OCR_WORKERS)
+            from ocr_cache import OCRCache
+            from ocr_engine import BatchOCREngine
+
+            self._ocr_cache = OCRCache(cache_path(self.config, "ocr_cache.sqlite"),
+                                       max_bytes=OCR_CACHE_MAX_BYTES)
+            self._ocr_engine = BatchOCREngine(batch_size=OCR_BATCH_SIZE, workers=OCR_WORKERS,
+                                              cache=self._ocr_cache)
+        return self._ocr_engine
+
+    def hash_index(self):
+        """중복 이미지 색인 (render/artwork 대상이 공유, dedupe 설정이 꺼져 있으면 None)"""
+        if not self.settings.get("dedupe"):
+            return None
+        with self._hash_index_lock:
+            if self._hash_index is None:
+                from image_hash import HASH_INDEX_FILENAME, HashIndex
+
+                self._hash_index = HashIndex(cache_path(self.config, HASH_INDEX_FILENAME))
+        return self._hash_index
+
+    def close(self):
+        if self._ocr_engine is not None:
+            self._ocr_engine.close()
+            self._ocr_cache.print_stats()
+            self._ocr_cache.close()
+
+
+def cmd_build(args):
+    """바뀐 입력에 영향을 받는 대상만 의존성 순서대로 빌드"""
+    from metrics import METRICS
+
+    METRICS.configure(quiet=args.quiet)
+    build = CatalogBuild(args.config, load_mapping(args.config))
+    try:
+        names = build.graph.select(args.targets)
+    except KeyError as e:
+        print(f"❌ {e.args[0]} (종류: {', '.join(BUILD_KINDS)})")
+        return 1
+
+    if args.dry_run:
+        stale = build.graph.plan(names, force=args.force)
+        print(f"다시 빌드할 대상: {len(stale)}개 / 전체 {len(names)}개")
+        for name in stale:
+            print(f"  {name}")
+        return 0
+
+    try:
+        built, skipped, failed = build.graph.run(names, jobs=args.jobs, force=args.force)
+    finally:
+        build.close()
+
+    print(f"\n{'='*60}")
+    print(f"빌드: {len(built)}개, 최신이라 건너뜀: {len(skipped)}개, 실패: {len(failed)}개")
+    for name in failed:
+        print(f"  ❌ {name}")
+    return 1 if failed else 0
+
+
+def run_script(module_name, argv):
+    """스크립트를 `python scripts/{module_name}.py {argv}`와 같게 실행"""
+    sys.argv = [f"{module_name}.py", *argv]
+    runpy.run_module(module_name, run_name="__main__", alter_sys=True)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="catalog",
+        description="DSU 졸업 작품 카탈로그 빌드 도구",
+    )
+    parser.add_argument("--config", help="경로 설정 파일 (기본 data/catalog_config.json)")
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+
+    build = commands.add_parser("build", help="바뀐 부분만 다시 빌드 (render → ocr → clean → "
+                                              "rewrite → export)")
+    build.add_argument("targets", nargs="*", metavar="TARGET",
+                       help="대상 패턴: 종류(ocr), 연도/프로젝트(2024/catcher), "
+                            "glob(clean:2023/*). 기본: 전체")
+    build.add_argument("--jobs", "-j", type=int, default=BUILD_JOBS,
+                       help=f"동시에 실행할 대상 수 (기본 {BUILD_JOBS})")
+    build.add_argument("--dry-run", action="store_true", help="다시 빌드할 대상만 출력")
+    build.add_argument("--force", action="store_true", help="최신 대상도 다시 빌드")
+    build.add_argument("--quiet", action="store_true", help="페이지별 진행 출력 생략")
+    build.set_defaults(func=cmd_build)
+
+    mapping = commands.add_parser("mapping", help="매핑 파일의 프로젝트 목록 출력")
+    mapping.add_argument("--year", help="이 연도만 출력")
+    mapping.add_argument("--json", action="store_true", help="JSON으로 출력")
+    mapping.set_defaults(func=cmd_mapping)
+
+    inspect = commands.add_parser("inspect", help="PDF 구조 확인 (기본: 매핑 파일의 PDF)")
+    inspect.add_argument("pdfs", nargs="*", metavar="PDF")
+    inspect.set_defaults(func=cmd_inspect)
+
+    show = commands.add_parser("show", help="프로젝트 OCR 텍스트 출력")
+    show.add_argument("project", help="연도/프로젝트 ID (예: 2023/snowcchio)")
+    show.add_argument("--backup", action="store_true", help="정리 전 원본(backup) 출력")
+    show.set_defaults(func=cmd_show)
+
+    diff = commands.add_parser("diff", help="두 PDF 개정판의 바뀐 페이지 출력")
+    diff.add_argument("old", help="이전 PDF")
+    diff.add_argument("new", help="새 PDF")
+    diff.set_defaults(func=cmd_diff)
+
+    for name, (module_name, description) in SCRIPT_COMMANDS.items():
+        script = commands.add_parser(name, help=description,
+                                     description=f"scripts/{module_name}.py 실행 "
+                                                 "(나머지 인자는 스크립트에 그대로 전달)")
+        script.set_defaults(module=module_name)
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+
+    if args.command is None:
+        parser.print_help()
+        return 0
+    if hasattr(args, "module"):
+        if args.config:
+            # 스크립트들은 load_config()에서 이 환경 변수를 읽음
+            os.environ["CATALOG_CONFIG"] = args.config
+        run_script(args.module, extra)
+        return 0
+    if extra:
+        parser.error(f"알 수 없는 인자: {' '.join(extra)}")
+    args.config = load_config(args.config)
+    return args.func(args) or 0
+
+
+if __name__ == "__main__":
+    # UTF-8 인코딩 강제 설정 (Windows cp949 문제 해결)
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+    sys.stderr.reconfigure(encoding='utf-8', errors='replace')
+
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""
+카탈로그 빌드 경로 설정
+
+스크립트마다 흩어져 있던 경로(매핑 파일, PDF 폴더, 출력 폴더, 캐시 폴더)를
+data/catalog_config.json 한 곳에서 읽는다. 파일에 없는 키는 기본값을 쓰고,
+환경 변수 CATALOG_CONFIG로 다른 설정 파일을 지정할 수 있다.
+
+    {
+        "mapping": "data/artbook_mapping.md",
+        "assets_dir": "assets",
+        "projects_dir": "public/assets/projects",
+        "cache_dir": ".cache",
+        "years": ["2023", "2024"]
+    }
+
+상대 경로는 저장소 루트(스크립트를 실행하는 위치) 기준이다.
+"""
+import json
+import os
+
+CONFIG_PATH = "data/catalog_config.json"
+
+DEFAULT_CONFIG = {
+    "mapping": "data/artbook_mapping.md",
+    "assets_dir": "assets",
+    "projects_dir": "public/assets/projects",
+    "cache_dir": ".cache",
+    "years": ["2023", "2024"]
+}
+
+
+def load_config(path=None):
+    """
+    설정 파일을 읽어 기본값과 합친 딕셔너리 반환
+
+    Args:
+        path: 설정 파일 경로 (기본: $CATALOG_CONFIG 또는 data/catalog_config.json)
+    """
+    path = path or os.environ.get("CATALOG_CONFIG") or CONFIG_PATH
+    config = dict(DEFAULT_CONFIG)
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            config.update(json.load(f))
+    config["years"] = [str(year) for year in config["years"]]
+    return config
+
+
+def cache_path(config, *parts):
+    """캐시 폴더 아래 경로 (예: cache_path(config, "ocr_cache.sqlite"))"""
+    return os.path.join(config["cache_dir"], *parts)
+
+
+def project_dir(config, year, project_id):
+    """프로젝트 출력 폴더 (예: public/assets/projects/2024/catcher)"""
+    return os.path.join(config["projects_dir"], str(year), project_id)
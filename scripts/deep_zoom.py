@@ -0,0 +1,263 @@
+"""
+딥 줌 타일 피라미드 생성 (DZI, 256px WebP 타일)
+
+프론트엔드가 1920px 페이지 이미지를 통째로 받지 않고 현재 배율에서 보이는 타일만
+받도록, 렌더링된 페이지 PNG(extract_pages_as_images)로 Deep Zoom Image 피라미드를 만든다.
+OpenSeadragon 등 DZI 뷰어가 그대로 읽을 수 있는 배치다.
+
+    public/assets/projects/{year}/{project}/tiles/page_001.dzi
+    public/assets/projects/{year}/{project}/tiles/page_001_files/{레벨}/{열}_{행}.webp
+    public/assets/projects/{year}/{project}/tiles/deep_zoom.json   (프로젝트 매니페스트)
+
+레벨 0은 1x1 픽셀, 가장 높은 레벨이 원본 크기이며 레벨마다 절반으로 줄인다.
+페이지마다 독립적이므로 프로세스 풀에서 페이지 단위로 병렬 생성하고, 원본 PNG가
+바뀌지 않은 페이지와 중복 페이지(image_variants.json의 same_as)는 다시 만들지 않는다
+(중복 페이지는 원본 페이지의 .dzi가 있을 때만 그것을 가리키고, 없으면 직접 만든다).
+
+사용법:
+    python scripts/deep_zoom.py                 # 설정 파일의 모든 프로젝트
+    python scripts/deep_zoom.py --workers 4
+"""
+import json
+import math
+import os
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image
+
+from metrics import METRICS
+
+TILES_DIRNAME = "tiles"
+MANIFEST_FILENAME = "deep_zoom.json"
+MANIFEST_VERSION = 1
+
+TILE_SIZE = 256
+# 타일 가장자리에 이웃 타일 픽셀을 겹쳐 넣어 확대 시 이음매가 보이지 않게 함 (DZI 표준값)
+TILE_OVERLAP = 1
+TILE_FORMAT = "webp"
+TILE_QUALITY = 80
+
+DZI_TEMPLATE = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<Image xmlns="http://schemas.microsoft.com/deepzoom/2008" TileSize="{tile_size}" '
+    'Overlap="{overlap}" Format="{format}">\n'
+    '  <Size Width="{width}" Height="{height}"/>\n'
+    '</Image>\n'
+)
+
+
+def pyramid_settings(tile_size=TILE_SIZE, overlap=TILE_OVERLAP, fmt=TILE_FORMAT,
+                     quality=TILE_QUALITY):
+    """피라미드 설정 (바뀌면 모든 페이지를 다시 생성)"""
+    return {"tile_size": tile_size, "overlap": overlap, "format": fmt, "quality": quality}
+
+
+def max_level(width, height):
+    """원본 크기 레벨 번호 (레벨 0 = 1x1)"""
+    return math.ceil(math.log2(max(width, height, 1)))
+
+
+def tile_boxes(width, height, tile_size=TILE_SIZE, overlap=TILE_OVERLAP):
+    """
+    한 레벨의 타일 영역
+
+    Yields:
+        (열, 행, (x0, y0, x1, y1)) - 겹침 픽셀 포함
+    """
+    for col in range(math.ceil(width / tile_size)):
+        for row in range(math.ceil(height / tile_size)):
+            x0 = max(0, col * tile_size - overlap)
+            y0 = max(0, row * tile_size - overlap)
+            x1 = min(width, (col + 1) * tile_size + overlap)
+            y1 = min(height, (row + 1) * tile_size + overlap)
+            yield col, row, (x0, y0, x1, y1)
+
+
+def build_pyramid(image_path, tiles_dir, settings=None):
+    """
+    페이지 이미지 하나의 DZI 피라미드 생성
+
+    가장 높은 레벨부터 타일을 자르고, 다음 레벨은 직전 레벨을 절반으로 줄여서 만든다
+    (원본을 레벨마다 다시 리샘플링하지 않음).
+
+    Args:
+        image_path: 페이지 PNG 경로
+        tiles_dir: 출력 디렉토리 ({stem}.dzi와 {stem}_files/가 생김)
+        settings: pyramid_settings() 결과
+
+    Returns:
+        {dzi, width, height, levels, tiles, bytes}
+    """
+    settings = settings or pyramid_settings()
+    tile_size, overlap, fmt = settings["tile_size"], settings["overlap"], settings["format"]
+    stem = os.path.splitext(os.path.basename(image_path))[0]
+    files_dir = os.path.join(tiles_dir, f"{stem}_files")
+    # 이전 피라미드의 타일이 남으면 크기가 줄었을 때 레벨/열/행이 맞지 않는 타일이 섞임
+    if os.path.isdir(files_dir):
+        shutil.rmtree(files_dir)
+
+    tiles = total_bytes = 0
+    with Image.open(image_path) as img:
+        level_image = img.convert("RGB")
+    width, height = level_image.size
+    top = max_level(width, height)
+
+    for level in range(top, -1, -1):
+        level_dir = os.path.join(files_dir, str(level))
+        os.makedirs(level_dir, exist_ok=True)
+        for col, row, box in tile_boxes(*level_image.size, tile_size, overlap):
+            path = os.path.join(level_dir, f"{col}_{row}.{fmt}")
+            level_image.crop(box).save(path, fmt.upper(), quality=settings["quality"])
+            tiles += 1
+            total_bytes += os.path.getsize(path)
+        if level:
+            level_image = level_image.reduce(2)
+
+    dzi_path = os.path.join(tiles_dir, f"{stem}.dzi")
+    with open(dzi_path, "w", encoding="utf-8") as f:
+        f.write(DZI_TEMPLATE.format(tile_size=tile_size, overlap=overlap, format=fmt,
+                                    width=width, height=height))
+
+    return {"dzi": os.path.basename(dzi_path), "width": width, "height": height,
+            "levels": top + 1, "tiles": tiles, "bytes": total_bytes}
+
+
+def _source_stat(image_path):
+    stat = os.stat(image_path)
+    return {"size": stat.st_size, "mtime": stat.st_mtime}
+
+
+def _build_one(image_path, tiles_dir, settings):
+    # 워커 프로세스에서 실행 (결과에 원본 파일 상태를 함께 기록)
+    return {**build_pyramid(image_path, tiles_dir, settings), "source": _source_stat(image_path)}
+
+
+def load_manifest(tiles_dir):
+    path = os.path.join(tiles_dir, MANIFEST_FILENAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    return manifest if manifest.get("version") == MANIFEST_VERSION else {}
+
+
+def build_project_tiles(output_dir, image_paths, workers=1, settings=None):
+    """
+    프로젝트 페이지들의 피라미드 생성 + tiles/deep_zoom.json 매니페스트 저장
+
+    Args:
+        output_dir: 프로젝트 출력 디렉토리 (페이지 PNG와 image_variants.json이 있는 곳)
+        image_paths: 페이지 PNG 경로 리스트
+        workers: 피라미드 생성 프로세스 수
+        settings: pyramid_settings() 결과
+
+    Returns:
+        생성된 파일 경로 리스트 (.dzi 파일들 + 마지막에 매니페스트). 타일 파일은 개수가
+        많아 빌드 매니페스트에 넣지 않는다
+    """
+    from image_encode import VARIANTS_FILENAME
+
+    settings = settings or pyramid_settings()
+    tiles_dir = os.path.join(output_dir, TILES_DIRNAME)
+    os.makedirs(tiles_dir, exist_ok=True)
+
+    previous = load_manifest(tiles_dir)
+    previous_pages = previous.get("pages", {}) if previous.get("settings") == settings else {}
+
+    # 중복 페이지는 원본 페이지의 피라미드를 가리킴 (원본 프로젝트에서 생성)
+    variants = {}
+    sidecar_path = os.path.join(output_dir, VARIANTS_FILENAME)
+    if os.path.exists(sidecar_path):
+        with open(sidecar_path, "r", encoding="utf-8") as f:
+            variants = json.load(f)
+
+    pages = {}
+    todo = []
+    for image_path in image_paths:
+        filename = os.path.basename(image_path)
+        same_as = (variants.get(filename) or {}).get("same_as")
+        if same_as:
+            # same_as는 output_dir 기준 → 매니페스트(tiles/) 기준 경로로 바꿈
+            canonical = os.path.join(output_dir, same_as)
+            stem = os.path.splitext(os.path.basename(canonical))[0]
+            dzi_path = os.path.join(os.path.dirname(canonical), TILES_DIRNAME, f"{stem}.dzi")
+            if os.path.exists(dzi_path):
+                relative = os.path.relpath(dzi_path, tiles_dir).replace(os.sep, "/")
+                pages[filename] = {"dzi": relative, "same_as": same_as}
+                continue
+            # 원본 프로젝트의 타일이 아직 없으면 (tiles 대상을 따로 실행한 경우 등) 직접 생성
+
+        entry = previous_pages.get(filename)
+        dzi_path = os.path.join(tiles_dir, entry["dzi"]) if entry and "dzi" in entry else None
+        if (entry and not entry.get("same_as") and entry.get("source") == _source_stat(image_path)
+                and os.path.exists(dzi_path)):
+            pages[filename] = entry
+        else:
+            todo.append(image_path)
+
+    if todo:
+        duplicates = sum(1 for entry in pages.values() if entry.get("same_as"))
+        METRICS.progress(f"  - 딥 줌 타일: {len(todo)}페이지 생성 "
+                         f"(그대로 {len(pages) - duplicates}, 중복 {duplicates})")
+        with METRICS.stage("deep_zoom", pages=len(todo)):
+            if workers > 1 and len(todo) > 1:
+                with ProcessPoolExecutor(max_workers=min(workers, len(todo))) as pool:
+                    built = list(pool.map(_build_one, todo, [tiles_dir] * len(todo),
+                                          [settings] * len(todo)))
+            else:
+                built = [_build_one(path, tiles_dir, settings) for path in todo]
+        for image_path, entry in zip(todo, built):
+            pages[os.path.basename(image_path)] = entry
+            METRICS.count("tiles_written", entry["tiles"])
+            METRICS.count("bytes_written", entry["bytes"])
+            METRICS.progress(f"  ✓ {entry['dzi']}: {entry['width']}x{entry['height']}, "
+                             f"레벨 {entry['levels']}개, 타일 {entry['tiles']}개 "
+                             f"({entry['bytes'] / 1024:.0f}KB)")
+
+    manifest_path = os.path.join(tiles_dir, MANIFEST_FILENAME)
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": MANIFEST_VERSION, "settings": settings,
+                   "pages": dict(sorted(pages.items()))}, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+    dzi_paths = [os.path.join(tiles_dir, entry["dzi"]) for entry in pages.values()
+                 if not entry.get("same_as")]
+    return sorted(dzi_paths) + [manifest_path]
+
+
+def main():
+    from catalog_config import load_config, project_dir
+    from extract_pdf_content import slugify
+    from parse_mapping import parse_artbook_mapping
+    from pdf_render import page_filename
+
+    from extract_pdf_content import RENDER_WORKERS
+
+    workers = int(sys.argv[sys.argv.index("--workers") + 1]) if "--workers" in sys.argv \
+        else RENDER_WORKERS
+
+    config = load_config()
+    mapping = parse_artbook_mapping(config["mapping"], config["assets_dir"])
+    for year in config["years"]:
+        for project in mapping.get(year, []):
+            output_dir = project_dir(config, year, slugify(project["title"]))
+            start, end = project["pages"]
+            image_paths = [os.path.join(output_dir, page_filename(n)) for n in range(start, end + 1)]
+            image_paths = [path for path in image_paths if os.path.exists(path)]
+            if not image_paths:
+                print(f"  경고: 페이지 이미지가 없습니다 (먼저 extract 실행): {output_dir}")
+                continue
+
+            outputs = build_project_tiles(output_dir, image_paths, workers)
+            print(f"✓ [{year}] {project['title']}: 페이지 {len(image_paths)}개 → {outputs[-1]}")
+
+
+if __name__ == "__main__":
+    # UTF-8 인코딩 강제 설정 (Windows cp949 문제 해결)
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+    sys.stderr.reconfigure(encoding='utf-8', errors='replace')
+
+    main()
@@ -0,0 +1,354 @@
+"""
+작품(프로젝트) 경계 자동 감지
+
+페이지마다 특징 벡터(큰 글씨 제목, 이미지 면적 비율, 텍스트 밀도, 저해상도
+썸네일 색상 히스토그램)를 한 번에 계산하고, 인접 페이지 사이의 변화량으로
+경계 점수를 매겨 책을 작품 단위로 나눈다. 썸네일은 page_thumbnails 캐시를 쓴다.
+결과는 parse_artbook_mapping()과 같은 구조이므로 artbook_mapping.md를 대신할 수 있다.
+
+사용법:
+    python scripts/detect_projects.py                  # 감지 결과 출력
+    python scripts/detect_projects.py --score          # artbook_mapping.md와 비교 채점
+    python scripts/detect_projects.py --write out.md   # 매핑 파일 형식으로 저장
+"""
+import os
+import re
+import sys
+
+import fitz  # PyMuPDF
+import numpy as np
+
+from page_thumbnails import load_thumbnails
+
+# 채널당 색상 구간 수 (4 → 64개 구간)
+HIST_BINS = 4
+
+# 본문 글씨 크기 대비 이 배율 이상이면 제목 글씨로 봄
+TITLE_SIZE_RATIO = 1.8
+
+# 경계 점수 가중치 (제목, 색상 변화, 이미지 비율 변화, 텍스트 밀도 변화)
+WEIGHTS = np.array([0.45, 0.3, 0.1, 0.15])
+
+# 작품 하나의 최소 페이지 수 / 경계로 인정할 최소 점수
+MIN_PAGES = 4
+MIN_SCORE = 0.35
+
+
+def color_histograms(thumbnails, sizes, bins=HIST_BINS):
+    """
+    모든 페이지 썸네일의 색상 히스토그램을 한 번에 계산 (패딩 영역 제외)
+
+    Args:
+        thumbnails: (페이지, H, W, 3) uint8 배열 (page_thumbnails.load_thumbnails)
+        sizes: 페이지별 실제 (너비, 높이)
+
+    Returns:
+        (페이지, bins³) 히스토그램 (행 합 1)
+    """
+    count, height, width, _ = thumbnails.shape
+    quantized = np.asarray(thumbnails) // (256 // bins)
+    codes = (quantized[..., 0].astype(np.int64) * bins + quantized[..., 1]) * bins + quantized[..., 2]
+    codes += np.arange(count)[:, None, None] * bins ** 3
+
+    widths = np.array([w for w, _ in sizes])
+    heights = np.array([h for _, h in sizes])
+    mask = ((np.arange(height)[None, :, None] < heights[:, None, None])
+            & (np.arange(width)[None, None, :] < widths[:, None, None]))
+
+    histograms = np.bincount(codes[mask], minlength=count * bins ** 3).reshape(count, -1)
+    return histograms / np.maximum(histograms.sum(axis=1, keepdims=True), 1)
+
+
+def page_features(doc, thumbnails, sizes, bins=HIST_BINS):
+    """
+    문서 전체의 페이지 특징을 한 번에 계산
+
+    Args:
+        doc: fitz.Document
+        thumbnails, sizes: page_thumbnails.load_thumbnails()의 반환값
+
+    Returns:
+        {
+            "max_size":  (n,) 페이지의 가장 큰 글씨 크기,
+            "body_size": 문서 전체 본문 글씨 크기 (글자 수 가중 중앙값),
+            "titles":    [페이지별 가장 큰 글씨 텍스트],
+            "image_coverage": (n,) 이미지 면적 / 페이지 면적 (최대 1),
+            "text_density":   (n,) 글자 수 / 페이지 면적 (1000pt² 당),
+            "histograms":     (n, bins³) 썸네일 색상 히스토그램 (합 1)
+        }
+    """
+    n = len(doc)
+    max_size = np.zeros(n)
+    image_coverage = np.zeros(n)
+    text_density = np.zeros(n)
+    titles = []
+    size_samples = []
+    size_weights = []
+
+    for index, page in enumerate(doc):
+        area = page.rect.width * page.rect.height
+
+        # 글씨 크기별 글자 수 + 가장 큰 글씨 텍스트
+        chars = 0
+        title, title_size = "", 0.0
+        for block in page.get_text("dict")["blocks"]:
+            if block.get("type") != 0:
+                continue
+            for line in block.get("lines", []):
+                for span in line.get("spans", []):
+                    text = span.get("text", "").strip()
+                    if not text:
+                        continue
+                    size = span.get("size", 0)
+                    chars += len(text)
+                    size_samples.append(size)
+                    size_weights.append(len(text))
+                    if size > title_size:
+                        title, title_size = text, size
+                    elif size == title_size and len(title) < 60:
+                        title = f"{title} {text}"
+        max_size[index] = title_size
+        titles.append(title.strip())
+        text_density[index] = chars / area * 1000
+
+        covered = sum((fitz.Rect(info["bbox"]) & page.rect).get_area()
+                      for info in page.get_image_info())
+        image_coverage[index] = min(1.0, covered / area)
+
+    body_size = 0.0
+    if size_samples:
+        order = np.argsort(size_samples)
+        cumulative = np.cumsum(np.asarray(size_weights)[order])
+        body_size = float(np.asarray(size_samples)[order][np.searchsorted(cumulative, cumulative[-1] / 2)])
+
+    return {
+        "max_size": max_size,
+        "body_size": body_size,
+        "titles": titles,
+        "image_coverage": image_coverage,
+        "text_density": text_density,
+        "histograms": color_histograms(thumbnails, sizes, bins)
+    }
+
+
+def _normalize(values):
+    """0~1 범위로 (큰 값 하나가 전체를 누르지 않도록 95 백분위수 기준)"""
+    top = np.percentile(values, 95) if len(values) else 0
+    if top <= 0:
+        return np.zeros_like(values)
+    return np.clip(values / top, 0, 1)
+
+
+def boundary_scores(features, weights=WEIGHTS, title_ratio=TITLE_SIZE_RATIO):
+    """
+    페이지마다 "여기서 새 작품이 시작된다" 점수 (0~1)
+
+    Returns:
+        (n,) 점수 배열 (첫 페이지는 항상 1)
+    """
+    body = features["body_size"] or 1.0
+    title = np.clip((features["max_size"] / body - 1) / (title_ratio - 1), 0, 1)
+
+    hist = features["histograms"]
+    color_change = np.zeros(len(hist))
+    color_change[1:] = 0.5 * np.abs(hist[1:] - hist[:-1]).sum(axis=1)
+
+    coverage_change = np.zeros(len(hist))
+    coverage_change[1:] = np.abs(np.diff(features["image_coverage"]))
+
+    density = np.log1p(features["text_density"])
+    density_change = np.zeros(len(hist))
+    density_change[1:] = np.abs(np.diff(density))
+
+    matrix = np.stack([title, _normalize(color_change), coverage_change,
+                       _normalize(density_change)], axis=1)
+    scores = matrix @ (weights / weights.sum())
+    if len(scores):
+        scores[0] = 1.0
+    return scores
+
+
+def segment(scores, min_pages=MIN_PAGES, min_score=MIN_SCORE, count=None):
+    """
+    경계 점수로 책을 나누기
+
+    점수가 높은 페이지부터 경계로 받아들이되, 이미 정한 경계와 min_pages보다
+    가까우면 건너뛴다.
+
+    Args:
+        scores: boundary_scores() 결과
+        min_pages: 작품 하나의 최소 페이지 수
+        min_score: 경계로 인정할 최소 점수 (count를 주면 무시)
+        count: 작품 수를 알고 있으면 지정
+
+    Returns:
+        작품 시작 페이지 리스트 (1-based, 오름차순)
+    """
+    starts = [0]
+    for index in np.argsort(-scores, kind="stable"):
+        if count is not None and len(starts) >= count:
+            break
+        if count is None and scores[index] < min_score:
+            break
+        if all(abs(index - start) >= min_pages for start in starts):
+            starts.append(int(index))
+    return [start + 1 for start in sorted(starts)]
+
+
+def detect_projects(pdf_path, count=None, min_pages=MIN_PAGES, min_score=MIN_SCORE):
+    """
+    PDF 하나의 작품 목록 감지
+
+    Returns:
+        [{"title": str, "pages": (시작, 끝), "pdf": str}, ...]
+        (parse_artbook_mapping()의 연도별 리스트와 같은 형식)
+    """
+    # 색상 특징은 캐시된 저해상도 썸네일에서 계산 (다시 실행할 때는 렌더링하지 않음)
+    thumbnails, sizes = load_thumbnails(pdf_path)
+    with fitz.open(pdf_path) as doc:
+        features = page_features(doc, thumbnails, sizes)
+        total = len(doc)
+
+    scores = boundary_scores(features)
+    starts = segment(scores, min_pages=min_pages, min_score=min_score, count=count)
+    ends = [start - 1 for start in starts[1:]] + [total]
+
+    projects = []
+    for number, (start, end) in enumerate(zip(starts, ends), 1):
+        # 작품 첫 두 페이지 중 가장 큰 글씨를 제목으로 사용
+        candidates = range(start - 1, min(start + 1, end))
+        best = max(candidates, key=lambda i: features["max_size"][i])
+        title = features["titles"][best] or f"Project {number}"
+        projects.append({
+            "title": title,
+            "pages": (start, end),
+            "pdf": pdf_path
+        })
+    return projects
+
+
+def detect_mapping(pdf_paths, counts=None):
+    """
+    여러 PDF의 작품 목록 감지 (파일명의 4자리 숫자를 연도로 사용)
+
+    Args:
+        pdf_paths: PDF 경로 리스트
+        counts: {연도: 작품 수} (알고 있는 연도만)
+
+    Returns:
+        parse_artbook_mapping()과 같은 {연도: [프로젝트, ...]}
+    """
+    result = {}
+    for pdf_path in pdf_paths:
+        match = re.search(r'(\d{4})', os.path.basename(pdf_path))
+        year = match.group(1) if match else os.path.splitext(os.path.basename(pdf_path))[0]
+        result[year] = detect_projects(pdf_path, count=(counts or {}).get(year))
+    return result
+
+
+def format_mapping(mapping):
+    """감지 결과를 artbook_mapping.md 형식으로 변환 (parse_artbook_mapping으로 다시 읽을 수 있음)"""
+    lines = ["# DSU Artbook Page Mapping", ""]
+    for year, projects in mapping.items():
+        pdf_name = os.path.basename(projects[0]["pdf"]) if projects else ""
+        lines.append(f"## {year} Artbook ({pdf_name})")
+        lines.append(f"*Detected: {len(projects)} projects*")
+        lines.append("")
+        for project in projects:
+            start, end = project["pages"]
+            lines.append(f"- **{project['title']}**: Page {start} - {end}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def score_mapping(predicted, reference, tolerance=1):
+    """
+    감지한 작품 시작 페이지를 기준 매핑과 비교
+
+    시작 페이지가 tolerance 페이지 이내면 맞은 것으로 보고 (일대일 대응),
+    기준 작품마다 가장 많이 겹치는 감지 구간과의 IoU 평균도 계산한다.
+
+    Returns:
+        {precision, recall, f1, mean_iou, missed: [시작 페이지], extra: [시작 페이지]}
+    """
+    ref_starts = [p["pages"][0] for p in reference]
+    pred_starts = [p["pages"][0] for p in predicted]
+
+    unmatched = list(pred_starts)
+    missed = []
+    for start in ref_starts:
+        near = [p for p in unmatched if abs(p - start) <= tolerance]
+        if near:
+            unmatched.remove(min(near, key=lambda p: abs(p - start)))
+        else:
+            missed.append(start)
+
+    hits = len(ref_starts) - len(missed)
+    precision = hits / len(pred_starts) if pred_starts else 0.0
+    recall = hits / len(ref_starts) if ref_starts else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+
+    ious = []
+    for ref in reference:
+        r0, r1 = ref["pages"]
+        best = 0.0
+        for pred in predicted:
+            p0, p1 = pred["pages"]
+            overlap = min(r1, p1) - max(r0, p0) + 1
+            if overlap > 0:
+                best = max(best, overlap / (max(r1, p1) - min(r0, p0) + 1))
+        ious.append(best)
+
+    return {
+        "precision": precision,
+        "recall": recall,
+        "f1": f1,
+        "mean_iou": float(np.mean(ious)) if ious else 0.0,
+        "missed": missed,
+        "extra": unmatched
+    }
+
+
+def main():
+    from parse_mapping import parse_artbook_mapping
+
+    reference = parse_artbook_mapping("data/artbook_mapping.md")
+    pdf_paths = [projects[0]["pdf"] for projects in reference.values() if projects]
+    pdf_paths = [path for path in pdf_paths if os.path.exists(path)]
+    if not pdf_paths:
+        print("❌ PDF 파일을 찾을 수 없습니다.")
+        return
+
+    # 채점할 때는 작품 수를 기준 매핑에 맞춰서 경계 위치만 비교
+    counts = None
+    if "--score" in sys.argv:
+        counts = {year: len(projects) for year, projects in reference.items()}
+    mapping = detect_mapping(pdf_paths, counts=counts)
+
+    for year, projects in mapping.items():
+        print(f"\n{year}년: {len(projects)}개 작품 감지")
+        for project in projects:
+            print(f"  - {project['title']}: Page {project['pages'][0]} - {project['pages'][1]}")
+
+        if counts is not None and year in reference:
+            result = score_mapping(projects, reference[year])
+            print(f"  정밀도 {result['precision']:.2f} / 재현율 {result['recall']:.2f} / "
+                  f"F1 {result['f1']:.2f} / 평균 IoU {result['mean_iou']:.2f}")
+            if result["missed"]:
+                print(f"  놓친 시작 페이지: {result['missed']}")
+            if result["extra"]:
+                print(f"  잘못 감지한 시작 페이지: {result['extra']}")
+
+    if "--write" in sys.argv:
+        output = sys.argv[sys.argv.index("--write") + 1]
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(format_mapping(mapping))
+        print(f"\n✓ 저장: {output}")
+
+
+if __name__ == "__main__":
+    # UTF-8 인코딩 강제 설정 (Windows cp949 문제 해결)
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+    sys.stderr.reconfigure(encoding='utf-8', errors='replace')
+
+    main()
@@ -0,0 +1,221 @@
+"""
+PDF에 삽입된 작품 이미지 원본 추출 (페이지 재렌더링 없이)
+
+아트북의 작품 이미지는 대부분 이미 JPEG로 압축되어 PDF에 들어 있으므로, 페이지를
+다시 렌더링해 큰 PNG로 저장하는 대신 page.get_images()의 xref에서 원본 스트림을 그대로
+꺼낸다. 여러 페이지에 같은 이미지가 쓰이면(같은 xref 또는 같은 바이트) 한 번만 저장하고,
+작품별 artwork/ 폴더에 파일과 artwork.json 매니페스트를 남긴다.
+
+    public/assets/projects/{year}/{project}/artwork/art_012_1.jpeg
+    public/assets/projects/{year}/{project}/artwork/artwork.json
+
+브라우저가 표시하지 못하는 형식(JPEG 2000, JBIG2 등), 투명 마스크(SMask)가 있는 이미지,
+브라우저에서 색이 틀어지는 이미지(인쇄용 CMYK/DeviceN JPEG, /Decode 배열로 색을 뒤집는
+이미지)만 PNG로 다시 인코딩한다 (무손실). 다시 실행하면 새 매니페스트에 없는 옛 파일은 지운다.
+
+해시 색인(image_hash)을 주면 다른 프로젝트에 이미 저장된 (거의) 같은 이미지는 저장하지
+않고, 매니페스트 항목의 file이 그 이미지를 가리킨다 ("same_as": true).
+
+사용법:
+    python scripts/extract_artwork.py                 # 매핑 파일의 모든 프로젝트
+    python scripts/extract_artwork.py --min-side 400  # 작은 장식 이미지 제외 기준
+"""
+import hashlib
+import json
+import os
+import sys
+
+import fitz  # PyMuPDF
+
+from metrics import METRICS
+
+ARTWORK_DIRNAME = "artwork"
+MANIFEST_FILENAME = "artwork.json"
+
+# 해시 색인에서 작품 이미지끼리만 비교 (페이지 이미지와 섞지 않음)
+HASH_SPACE = "artwork"
+
+# 짧은 변이 이보다 작은 이미지(아이콘, 장식, 로고)는 작품으로 보지 않음
+MIN_SIDE = 256
+
+# 원본 바이트를 그대로 저장하는 형식 (나머지는 PNG로 변환)
+WEB_EXTENSIONS = {"jpeg", "jpg", "png", "gif", "webp"}
+
+
+def collect_images(doc, page_numbers, min_side=MIN_SIDE):
+    """
+    페이지들에 쓰인 이미지 xref 목록 (xref 중복 제거, 처음 나온 페이지 순서)
+
+    Returns:
+        [{"xref", "smask", "width", "height", "pages": [페이지 번호...],
+          "bbox": 처음 나온 페이지에서의 위치}]
+    """
+    images = {}
+    for page_num in page_numbers:
+        page = doc[page_num - 1]
+        for xref, smask, width, height, *_ in page.get_images(full=True):
+            if min(width, height) < min_side:
+                continue
+            if xref in images:
+                if page_num not in images[xref]["pages"]:
+                    images[xref]["pages"].append(page_num)
+                continue
+
+            rects = page.get_image_rects(xref)
+            images[xref] = {
+                "xref": xref,
+                "smask": smask,
+                "width": width,
+                "height": height,
+                "pages": [page_num],
+                "bbox": [round(v, 1) for v in rects[0]] if rects else None
+            }
+    return list(images.values())
+
+
+def image_bytes(doc, image):
+    """
+    이미지 하나의 저장할 바이트와 확장자
+
+    원본이 웹 형식이고 투명 마스크가 없고 RGB/흑백이며 /Decode 배열이 없으면 재압축 없이
+    원본 스트림 그대로. CMYK 등 4채널 이상이나 /Decode가 있는 JPEG는 브라우저가 PDF와
+    다른 색(반전된 색)으로 표시하므로 MuPDF로 디코딩해 RGB로 변환한다.
+    """
+    extracted = doc.extract_image(image["xref"])
+    decode = doc.xref_get_key(image["xref"], "Decode")[0] != "null"
+    if (extracted and extracted["ext"] in WEB_EXTENSIONS and not image["smask"]
+            and extracted["colorspace"] <= 3 and not decode):
+        return extracted["image"], extracted["ext"], False
+
+    # 마스크 합성 / 웹에서 못 쓰는 형식 / CMYK·Decode 색 변환 → PNG (무손실)
+    pix = fitz.Pixmap(doc, image["xref"])
+    if image["smask"]:
+        pix = fitz.Pixmap(pix, fitz.Pixmap(doc, image["smask"]))
+    if pix.colorspace and pix.colorspace.n > 3:
+        pix = fitz.Pixmap(fitz.csRGB, pix)
+    return pix.tobytes("png"), "png", True
+
+
+def extract_artwork(pdf_path, page_range, output_dir, min_side=MIN_SIDE, hash_index=None):
+    """
+    프로젝트 페이지 범위의 작품 이미지를 artwork/ 폴더에 저장
+
+    Args:
+        pdf_path: PDF 파일 경로
+        page_range: (시작, 끝) 1-based, 끝 포함
+        output_dir: 프로젝트 출력 디렉토리 (그 아래 artwork/에 저장)
+        min_side: 이보다 작은 이미지는 제외
+        hash_index: image_hash.HashIndex (있으면 다른 곳에 저장된 같은 이미지는 저장하지 않음)
+
+    Returns:
+        생성/참조한 파일 경로 리스트 (이미지들 + 마지막에 artwork.json)
+    """
+    artwork_dir = os.path.join(output_dir, ARTWORK_DIRNAME)
+    os.makedirs(artwork_dir, exist_ok=True)
+
+    entries = []
+    by_digest = {}
+    with fitz.open(pdf_path) as doc:
+        last_page = min(page_range[1], len(doc))
+        page_numbers = range(page_range[0], last_page + 1)
+
+        for image in collect_images(doc, page_numbers, min_side):
+            with METRICS.stage("artwork", xref=image["xref"]):
+                data, ext, converted = image_bytes(doc, image)
+            digest = hashlib.sha256(data).hexdigest()
+
+            # xref는 다르지만 바이트가 같은 이미지 (같은 파일을 여러 번 삽입한 경우)
+            if digest in by_digest:
+                by_digest[digest]["pages"].extend(
+                    n for n in image["pages"] if n not in by_digest[digest]["pages"])
+                continue
+
+            index = sum(1 for e in entries if e["pages"][0] == image["pages"][0]) + 1
+            filename = f"art_{image['pages'][0]:03d}_{index}.{ext}"
+            path = os.path.join(artwork_dir, filename)
+
+            # 다른 프로젝트에 저장된 같은 이미지 (재압축/크기만 다른 경우 포함)
+            canonical = None
+            if hash_index is not None:
+                from image_hash import image_hashes
+
+                hashes = image_hashes([data])[0]
+                canonical = hash_index.find(path, hashes, HASH_SPACE, source=data)
+            if canonical:
+                filename = os.path.relpath(canonical, artwork_dir).replace(os.sep, "/")
+                METRICS.count("artwork_deduplicated")
+            else:
+                with open(path, "wb") as f:
+                    f.write(data)
+                METRICS.count("bytes_written", len(data))
+                if hash_index is not None:
+                    hash_index.add(path, hashes, HASH_SPACE, {"path": path})
+
+            entry = {
+                "file": filename,
+                "pages": image["pages"],
+                "bbox": image["bbox"],
+                "width": image["width"],
+                "height": image["height"],
+                "bytes": len(data),
+                "sha256": digest,
+                "converted": converted,
+                "same_as": bool(canonical)
+            }
+            entries.append(entry)
+            by_digest[digest] = entry
+            METRICS.progress(f"  ✓ {filename}: {image['width']}x{image['height']} "
+                             f"({len(data) / 1024:.0f}KB{', PNG 변환' if converted else ''}"
+                             f"{', 중복' if canonical else ''})")
+
+    manifest_path = os.path.join(artwork_dir, MANIFEST_FILENAME)
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump({"pdf": os.path.basename(pdf_path), "pages": list(page_range),
+                   "min_side": min_side, "images": entries}, f, ensure_ascii=False, indent=2)
+
+    # 이전 개정판에서 저장했지만 이번 매니페스트에 없는 이미지 삭제
+    current = {entry["file"] for entry in entries if not entry["same_as"]}
+    for filename in os.listdir(artwork_dir):
+        if filename.startswith("art_") and filename not in current:
+            os.remove(os.path.join(artwork_dir, filename))
+            METRICS.progress(f"  - 옛 이미지 삭제: {filename}")
+
+    if hash_index is not None:
+        hash_index.save()
+    return ([os.path.normpath(os.path.join(artwork_dir, entry["file"])) for entry in entries]
+            + [manifest_path])
+
+
+def main():
+    from catalog_config import cache_path, load_config, project_dir
+    from extract_pdf_content import slugify
+    from image_hash import HASH_INDEX_FILENAME, HashIndex
+    from parse_mapping import parse_artbook_mapping
+
+    min_side = int(sys.argv[sys.argv.index("--min-side") + 1]) if "--min-side" in sys.argv \
+        else MIN_SIDE
+
+    config = load_config()
+    mapping = parse_artbook_mapping(config["mapping"], config["assets_dir"])
+    hash_index = HashIndex(cache_path(config, HASH_INDEX_FILENAME))
+    for year in config["years"]:
+        for project in mapping.get(year, []):
+            if not os.path.exists(project["pdf"]):
+                print(f"  경고: PDF 파일이 없습니다: {project['pdf']}")
+                continue
+
+            output_dir = project_dir(config, year, slugify(project["title"]))
+            outputs = extract_artwork(project["pdf"], project["pages"], output_dir, min_side,
+                                      hash_index)
+            total = sum(os.path.getsize(path) for path in outputs[:-1]
+                        if os.path.dirname(path) == os.path.dirname(outputs[-1]))
+            print(f"✓ [{year}] {project['title']}: 이미지 {len(outputs) - 1}개 "
+                  f"({total / 1024 / 1024:.1f}MB) → {os.path.dirname(outputs[-1])}")
+
+
+if __name__ == "__main__":
+    # UTF-8 인코딩 강제 설정 (Windows cp949 문제 해결)
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+    sys.stderr.reconfigure(encoding='utf-8', errors='replace')
+
+    main()
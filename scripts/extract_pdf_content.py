@@ -2,26 +2,75 @@
 PDF에서 페이지 이미지 추출 및 OCR 텍스트 추출 스크립트
 """
 import sys
-import io
 
 # UTF-8 인코딩 강제 설정 (Windows cp949 문제 해결)
-sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
-sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+# 새 TextIOWrapper로 감싸지 않고 기존 스트림 설정만 바꿔서 출력 버퍼링을 그대로 유지
+sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+sys.stderr.reconfigure(encoding='utf-8', errors='replace')
 
-import fitz  # PyMuPDF
-import easyocr
-from PIL import Image
 import os
 import json
 import re
 from pathlib import Path
 from parse_mapping import parse_artbook_mapping
-
-# EasyOCR 초기화 (한국어, 영어)
-# 주의: EasyOCR은 일부 언어 조합이 호환되지 않음 (중국어는 영어와만 호환)
-print("EasyOCR 초기화 중... (최초 실행시 언어 모델 다운로드)")
-reader = easyocr.Reader(['ko', 'en'], gpu=False)
-print("EasyOCR 준비 완료!")
+from ocr_cache import OCRCache
+from build_manifest import BuildManifest
+from metrics import METRICS, configure_from_argv
+from catalog_config import cache_path, load_config
+
+# fitz/PIL/numpy와 렌더링·OCR 모듈은 실제로 쓰는 함수 안에서 import
+# (slugify 등만 쓰는 스크립트와 catalog.py --help가 빨리 시작하도록)
+# EasyOCR Reader는 첫 OCR 때 ocr_engine.get_reader()가 만든다
+
+# 경로 설정 (data/catalog_config.json)
+CONFIG = load_config()
+
+# 페이지 렌더링 워커 프로세스 수 (1이면 순차 렌더링)
+RENDER_WORKERS = os.cpu_count() or 1
+
+# OCR 배치 크기 및 Reader 프로세스 수 (1이면 현재 프로세스의 공유 Reader 사용)
+# 프로세스 풀을 쓰면 스트리밍 처리에서 OCR이 렌더링/인코딩과 겹쳐서 실행된다.
+# Reader마다 EasyOCR 모델을 따로 올리므로 (수백 MB) 코어 수보다 작게 잡음
+OCR_BATCH_SIZE = 8
+OCR_WORKERS = 2
+
+# OCR 결과 캐시 (페이지 픽셀 해시 + OCR 설정을 키로 사용)
+OCR_CACHE_PATH = cache_path(CONFIG, "ocr_cache.sqlite")
+OCR_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# 렌더링/이미지 최적화 설정 (바뀌면 증분 빌드에서 해당 프로젝트를 다시 생성)
+BUILD_SETTINGS = {
+    "dpi": 200,
+    "max_width": 1920,
+    "quality": 85,
+    # 목표 너비로 바로 렌더링하여 렌더링→재디코딩→축소→재인코딩 과정을 생략
+    "single_pass": True,
+    # 페이지 Pixmap이 이보다 크면 타일 단위로 렌더링 (렌더링 워커마다 최대 사용량, MB)
+    "render_memory_mb": 256,
+    # 웹용 인코딩 (srcset용 너비 단계, "avif" 추가 가능). 빈 리스트면 생략
+    "web_formats": ["webp"],
+    "web_widths": [480, 960, 1920],
+    # PDF 텍스트 레이어 우선 사용 (글자 수/텍스트 커버리지가 기준 미만인 페이지만 OCR)
+    "text_layer": True,
+    "min_text_chars": 20,
+    "min_text_coverage": 0.5,
+    # OCR이 필요한 페이지도 페이지 전체 대신 이미지 블록 영역만 OCR (text_layer 필요)
+    "ocr_regions": True,
+    # 다른 페이지(다른 프로젝트 포함)와 같은 이미지인 페이지는 웹 이미지를 공유하고 OCR 생략
+    # (image_hash 지각 해시, web_formats 필요)
+    "dedupe": True
+}
+
+# 페이지 단위 스트리밍 처리 (중단되면 체크포인트에서 이어서 처리)
+# False면 전체 렌더링 → 전체 최적화 → 전체 OCR 순서로 처리
+STREAM_PAGES = True
+
+# 중복 페이지 찾기용 이미지 해시 색인 (모든 프로젝트가 공유)
+HASH_INDEX_PATH = cache_path(CONFIG, "image_hashes.json")
+
+# 증분 빌드 매니페스트 (입력이 바뀌지 않은 프로젝트는 건너뜀)
+BUILD_MANIFEST_PATH = cache_path(CONFIG, "build_manifest.json")
+FORCE_REBUILD = False
 
 def slugify(text):
     """제목을 파일명으로 사용 가능한 형태로 변환"""
@@ -32,7 +81,8 @@ def slugify(text):
     text = re.sub(r'[-\s]+', '-', text)
     return text.strip('-').lower()
 
-def extract_pages_as_images(pdf_path, start_page, end_page, output_dir, dpi=200):
+def extract_pages_as_images(pdf_path, start_page, end_page, output_dir, dpi=200, workers=1,
+                            max_width=None, only_pages=None, memory_budget=None):
     """
     PDF에서 지정된 페이지 범위를 이미지로 추출
 
@@ -42,35 +92,52 @@ def extract_pages_as_images(pdf_path, start_page, end_page, output_dir, dpi=200)
         end_page: 끝 페이지 (1-based, inclusive)
         output_dir: 저장할 디렉토리
         dpi: 해상도 (기본 200)
+        workers: 렌더링 프로세스 수 (2 이상이면 페이지 구간을 나누어 병렬 렌더링)
+        max_width: 지정하면 이 너비로 바로 렌더링하고 한 번만 인코딩 (단일 패스)
+        only_pages: 지정하면 이 페이지만 렌더링 (나머지는 기존 이미지를 그대로 사용)
+        memory_budget: 페이지 하나의 렌더링 메모리 상한 (바이트, 넘으면 타일 렌더링)
 
     Returns:
         추출된 이미지 파일 경로 리스트
     """
+    import fitz  # PyMuPDF
+    from pdf_render import contiguous_runs, page_filename, render_page, render_pages_parallel
+
+    if only_pages is not None:
+        # 바뀐 페이지만 연속 구간별로 렌더링하고, 범위 전체의 이미지 경로를 반환
+        for run_start, run_end in contiguous_runs(only_pages):
+            extract_pages_as_images(pdf_path, run_start, run_end, output_dir, dpi=dpi,
+                                    workers=min(workers, run_end - run_start + 1),
+                                    max_width=max_width, memory_budget=memory_budget)
+        paths = [os.path.join(output_dir, page_filename(n)) for n in range(start_page, end_page + 1)]
+        return [path for path in paths if os.path.exists(path)]
+
+    if workers > 1:
+        return render_pages_parallel(pdf_path, start_page, end_page, output_dir,
+                                     dpi=dpi, workers=workers, max_width=max_width,
+                                     memory_budget=memory_budget)
+
     doc = fitz.open(pdf_path)
     image_paths = []
 
     # 디렉토리 생성
     os.makedirs(output_dir, exist_ok=True)
 
-    # 줌 factor 계산 (dpi / 72)
-    zoom = dpi / 72
-    mat = fitz.Matrix(zoom, zoom)
-
     for page_num in range(start_page - 1, end_page):
         if page_num >= len(doc):
             print(f"  경고: 페이지 {page_num + 1}은 존재하지 않습니다.")
             break
 
-        page = doc[page_num]
-        pix = page.get_pixmap(matrix=mat)
-
         # 파일명: page_001.png 형식
-        filename = f"page_{page_num + 1:03d}.png"
+        filename = page_filename(page_num + 1)
         filepath = os.path.join(output_dir, filename)
 
-        pix.save(filepath)
+        with METRICS.stage("render", page=page_num + 1):
+            render_page(doc[page_num], filepath, dpi=dpi, max_width=max_width,
+                        memory_budget=memory_budget)
         image_paths.append(filepath)
-        print(f"  ✓ 페이지 {page_num + 1} 추출 완료: {filename}")
+        METRICS.count("bytes_written", os.path.getsize(filepath))
+        METRICS.progress(f"  ✓ 페이지 {page_num + 1} 추출 완료: {filename}")
 
     doc.close()
     return image_paths
@@ -84,6 +151,8 @@ def optimize_image(image_path, max_width=1920, quality=85):
         max_width: 최대 너비 (기본 1920px)
         quality: JPEG 품질 (기본 85)
     """
+    from PIL import Image
+
     img = Image.open(image_path)
 
     # 이미 최적 크기 이하면 스킵
@@ -97,64 +166,195 @@ def optimize_image(image_path, max_width=1920, quality=85):
 
     # PNG로 저장 (웹 최적화)
     img.save(image_path, 'PNG', optimize=True)
-    print(f"  ✓ 이미지 최적화: {os.path.basename(image_path)}")
+    METRICS.progress(f"  ✓ 이미지 최적화: {os.path.basename(image_path)}")
 
-def extract_text_from_image(image_path):
+def extract_text_from_image(image_path, cache=None):
     """
     이미지에서 OCR로 텍스트 추출
 
     Args:
         image_path: 이미지 파일 경로
+        cache: OCRCache (있으면 같은 픽셀의 이전 결과를 재사용)
 
     Returns:
         추출된 텍스트 딕셔너리 {full_text: str, details: list}
     """
+    from ocr_engine import (OCR_LANGUAGES, format_ocr_result, get_reader, load_image_array,
+                            ocr_settings)
+
+    image = load_image_array(image_path)
+
+    key = None
+    if cache is not None:
+        key = cache.make_key(image, ocr_settings(OCR_LANGUAGES))
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
     print(f"  OCR 처리 중: {os.path.basename(image_path)}...")
 
     # EasyOCR로 텍스트 추출 (paragraph=False로 안정성 확보)
-    results = reader.readtext(image_path, detail=1, paragraph=False)
-
-    # 결과 정리
-    full_text = []
-    details = []
-
-    for result in results:
-        # EasyOCR returns [[bbox_points], text, confidence]
-        # 안전하게 처리
-        if len(result) >= 3:
-            bbox, text, confidence = result[0], result[1], result[2]
-            full_text.append(text)
-            # bbox를 JSON 직렬화 가능하도록 변환
-            bbox_list = [[int(x), int(y)] for x, y in bbox]
-            details.append({
-                "text": text,
-                "confidence": float(confidence),
-                "bbox": bbox_list
-            })
-        elif len(result) == 2:
-            # detail=0인 경우 (bbox, text)
-            bbox, text = result[0], result[1]
-            full_text.append(text)
-            bbox_list = [[int(x), int(y)] for x, y in bbox]
-            details.append({
-                "text": text,
-                "confidence": 1.0,
-                "bbox": bbox_list
-            })
-
-    return {
-        "full_text": "\n".join(full_text),
-        "details": details
-    }
-
-def process_project(project_info, year):
+    results = get_reader().readtext(image, detail=1, paragraph=False)
+    text_data = format_ocr_result(results)
+
+    if cache is not None:
+        cache.put(key, text_data)
+    return text_data
+
+def render_project(project_info, output_dir, settings=None, project_id=None, hash_index=None):
+    """
+    프로젝트 페이지 렌더링 + (필요하면) 최적화 + 웹 인코딩
+
+    Args:
+        project_info: 프로젝트 정보 딕셔너리
+        output_dir: 출력 디렉토리
+        settings: 렌더링/이미지 설정 (기본 BUILD_SETTINGS)
+        project_id: 계측 라벨용 프로젝트 ID
+        hash_index: image_hash.HashIndex (있으면 중복 페이지는 웹 인코딩 생략)
+
+    Returns:
+        (페이지 이미지 경로 리스트, 웹 인코딩 출력 경로 리스트)
+    """
+    from image_encode import encode_pages
+    from page_fingerprint import index_settings, save_index, unchanged_pages
+    from pdf_render import page_filename, render_memory_budget
+
+    settings = settings or BUILD_SETTINGS
+    pages = project_info['pages']
+    os.makedirs(output_dir, exist_ok=True)
+
+    # 새 PDF 개정판이라도 지문이 같은 페이지는 이전 이미지를 그대로 사용
+    page_numbers = list(range(pages[0], pages[1] + 1))
+    render_settings = index_settings(settings)
+    fingerprints, same = unchanged_pages(project_info['pdf'], page_numbers, output_dir,
+                                         render_settings)
+    if hash_index is not None and same:
+        # 원본 페이지가 바뀐 중복 페이지는 다시 인코딩하면서 중복 여부도 다시 확인
+        from image_encode import VARIANTS_FILENAME, stale_duplicates
+
+        sidecar_path = os.path.join(output_dir, VARIANTS_FILENAME)
+        if os.path.exists(sidecar_path):
+            with open(sidecar_path, 'r', encoding='utf-8') as f:
+                stale = stale_duplicates(output_dir, json.load(f), hash_index)
+            same = {n for n in same if page_filename(n) not in stale}
+    changed = [n for n in page_numbers if n not in same]
+    if same:
+        print(f"  - 바뀌지 않은 페이지 {len(same)}개 건너뜀, 렌더링: {len(changed)}페이지")
+
+    # 1. PDF에서 페이지 이미지 추출
+    print("\n[1/3] PDF 페이지 이미지 추출...")
+    with METRICS.stage("render_phase", project=project_id):
+        image_paths = extract_pages_as_images(
+            project_info['pdf'],
+            pages[0],
+            pages[1],
+            output_dir,
+            dpi=settings['dpi'],
+            workers=RENDER_WORKERS,
+            max_width=settings['max_width'] if settings.get('single_pass') else None,
+            only_pages=changed if same else None,
+            memory_budget=render_memory_budget(settings)
+        )
+    changed_names = {page_filename(n) for n in changed}
+    changed_paths = [p for p in image_paths if os.path.basename(p) in changed_names]
+
+    # 2. 이미지 최적화 (단일 패스 렌더링이면 이미 목표 크기로 인코딩됨)
+    print("\n[2/3] 이미지 최적화...")
+    if settings.get('single_pass'):
+        print("  - 단일 패스 렌더링으로 생략")
+    else:
+        for img_path in changed_paths:
+            with METRICS.stage("optimize", page=os.path.basename(img_path)):
+                optimize_image(img_path, max_width=settings['max_width'],
+                               quality=settings['quality'])
+
+    # WebP/AVIF 너비 단계 + 사이드카 JSON (바뀐 페이지만 인코딩, 사이드카는 합침)
+    web_outputs = []
+    if settings.get('web_formats'):
+        with METRICS.stage("encode_phase", project=project_id):
+            web_outputs = encode_pages(
+                changed_paths,
+                formats=settings['web_formats'],
+                widths=settings['web_widths'],
+                quality=settings['quality'],
+                workers=RENDER_WORKERS,
+                output_dir=output_dir,
+                update=bool(same),
+                hash_index=hash_index
+            )
+
+    save_index(output_dir, fingerprints, render_settings)
+    if hash_index is not None:
+        hash_index.save()
+    return image_paths, web_outputs
+
+def ocr_project(project_info, year, project_id, output_dir, image_paths, ocr_engine,
+                settings=None):
+    """
+    렌더링된 페이지 이미지에서 텍스트 추출 후 ocr_text.json 저장
+
+    Returns:
+        ocr_text.json 경로
+    """
+    from image_encode import VARIANTS_FILENAME
+    from page_pipeline import duplicate_pages, recognize_pages
+    from pdf_text import plan_text_extraction
+
+    settings = settings or BUILD_SETTINGS
+
+    # 3. OCR 텍스트 추출
+    print("\n[3/3] OCR 텍스트 추출...")
+
+    # 텍스트 레이어가 충분한 페이지는 OCR 없이 그대로 사용
+    plans = {}
+    if settings.get('text_layer'):
+        with METRICS.stage("text_phase", project=project_id):
+            plans = plan_text_extraction(
+                project_info['pdf'],
+                image_paths,
+                min_chars=settings['min_text_chars'],
+                min_coverage=settings['min_text_coverage']
+            )
+
+    # 웹 인코딩에서 중복으로 판정된 페이지는 원본 페이지의 결과를 복사
+    duplicates = {}
+    sidecar_path = os.path.join(output_dir, VARIANTS_FILENAME)
+    if os.path.exists(sidecar_path):
+        with open(sidecar_path, 'r', encoding='utf-8') as f:
+            duplicates = duplicate_pages(output_dir, json.load(f))
+    ocr_results = recognize_pages(ocr_engine, image_paths, plans, settings, duplicates)
+
+    # OCR 결과를 JSON으로 저장
+    json_path = os.path.join(output_dir, "ocr_text.json")
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            "project_id": project_id,
+            "title": project_info['title'],
+            "year": year,
+            "pages": project_info['pages'],
+            "ocr_results": ocr_results
+        }, f, ensure_ascii=False, indent=2)
+    return json_path
+
+def process_project(project_info, year, ocr_engine=None, settings=None, projects_dir=None,
+                    hash_index=None):
     """
     프로젝트 하나를 처리 (이미지 추출 + OCR)
 
     Args:
         project_info: 프로젝트 정보 딕셔너리
         year: 연도
+        ocr_engine: 재사용할 BatchOCREngine (없으면 공유 Reader로 생성)
+        settings: 렌더링/이미지 설정 (기본 BUILD_SETTINGS)
+        projects_dir: 출력 루트 (기본 설정 파일의 projects_dir)
+        hash_index: image_hash.HashIndex (있으면 중복 페이지는 웹 인코딩/OCR 생략)
+
+    Returns:
+        생성된 출력 파일 경로 리스트 (페이지 이미지 + ocr_text.json)
     """
+    from ocr_engine import BatchOCREngine
+
+    settings = settings or BUILD_SETTINGS
     title = project_info['title']
     pages = project_info['pages']
     pdf_path = project_info['pdf']
@@ -169,83 +369,135 @@ def process_project(project_info, year):
     project_id = slugify(title)
 
     # 출력 디렉토리
-    output_dir = f"public/assets/projects/{year}/{project_id}"
+    output_dir = os.path.join(projects_dir or CONFIG['projects_dir'], str(year), project_id)
     os.makedirs(output_dir, exist_ok=True)
 
-    # 1. PDF에서 페이지 이미지 추출
-    print("\n[1/3] PDF 페이지 이미지 추출...")
-    image_paths = extract_pages_as_images(
-        pdf_path,
-        pages[0],
-        pages[1],
-        output_dir,
-        dpi=200
-    )
+    if ocr_engine is None:
+        ocr_engine = BatchOCREngine(batch_size=OCR_BATCH_SIZE)
 
-    # 2. 이미지 최적화
-    print("\n[2/3] 이미지 최적화...")
-    for img_path in image_paths:
-        optimize_image(img_path, max_width=1920, quality=85)
+    if STREAM_PAGES:
+        return process_project_streaming(project_info, year, project_id, output_dir,
+                                         ocr_engine, settings, hash_index)
 
-    # 3. OCR 텍스트 추출
-    print("\n[3/3] OCR 텍스트 추출...")
-    ocr_results = {}
+    image_paths, web_outputs = render_project(project_info, output_dir, settings, project_id,
+                                              hash_index)
+    json_path = ocr_project(project_info, year, project_id, output_dir, image_paths,
+                            ocr_engine, settings)
 
-    for img_path in image_paths:
-        filename = os.path.basename(img_path)
-        page_num = filename.replace('page_', '').replace('.png', '')
+    print(f"\n✅ {title} 처리 완료!")
+    print(f"   - 이미지: {len(image_paths)}개")
+    print(f"   - 저장 위치: {output_dir}")
+    print(f"   - OCR 결과: {json_path}")
 
-        text_data = extract_text_from_image(img_path)
-        ocr_results[filename] = text_data
+    return image_paths + web_outputs + [json_path]
 
-        print(f"  ✓ {filename}: {len(text_data['full_text'])}자 추출")
+def process_project_streaming(project_info, year, project_id, output_dir, ocr_engine, settings,
+                              hash_index=None):
+    """
+    프로젝트 하나를 페이지 단위 스트리밍으로 처리
 
-    # OCR 결과를 JSON으로 저장
-    json_path = os.path.join(output_dir, "ocr_text.json")
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump({
-            "project_id": project_id,
-            "title": title,
-            "year": year,
-            "pages": pages,
-            "ocr_results": ocr_results
-        }, f, ensure_ascii=False, indent=2)
+    페이지마다 렌더링 → 웹 인코딩 → 텍스트 추출이 이어서 진행되고 결과가 체크포인트에
+    바로 기록되므로, 중단 후 다시 실행하면 끝난 페이지는 건너뛴다.
 
-    print(f"\n✅ {title} 처리 완료!")
-    print(f"   - 이미지: {len(image_paths)}개")
+    Returns:
+        생성된 출력 파일 경로 리스트 (process_project와 같음)
+    """
+    from page_pipeline import finalize, stream_pages
+
+    print("\n[스트리밍] 렌더링 → 인코딩 → 텍스트 추출 (페이지 단위)...")
+    checkpoint, filenames = stream_pages(project_info['pdf'], project_info['pages'], output_dir,
+                                         ocr_engine, settings, hash_index=hash_index)
+    if hash_index is not None:
+        hash_index.save()
+
+    outputs = finalize(checkpoint, filenames, output_dir, {
+        "project_id": project_id,
+        "title": project_info['title'],
+        "year": year,
+        "pages": project_info['pages']
+    }, settings)
+
+    print(f"\n✅ {project_info['title']} 처리 완료!")
+    print(f"   - 이미지: {len(filenames)}개")
     print(f"   - 저장 위치: {output_dir}")
-    print(f"   - OCR 결과: {json_path}")
+    return outputs
 
 def main():
     """메인 실행 함수"""
+    from image_encode import duplicate_sources
+    from ocr_engine import BatchOCREngine
+
     print("\n" + "="*60)
     print("PDF 콘텐츠 추출 및 OCR 스크립트")
     print("="*60)
 
     # artbook_mapping.md 파싱
     print("\n[단계 1] artbook_mapping.md 파싱 중...")
-    mapping = parse_artbook_mapping("data/artbook_mapping.md")
-
-    # 2023, 2024만 처리
-    target_years = ['2023', '2024']
-
-    for year in target_years:
-        if year not in mapping:
-            print(f"경고: {year}년 데이터가 없습니다.")
-            continue
-
-        projects = mapping[year]
-        print(f"\n{'='*60}")
-        print(f"{year}년: {len(projects)}개 프로젝트 발견")
-        print(f"{'='*60}")
-
-        for i, project in enumerate(projects, 1):
-            print(f"\n\n진행: {i}/{len(projects)}")
-            process_project(project, year)
+    mapping = parse_artbook_mapping(CONFIG['mapping'], CONFIG['assets_dir'])
+
+    # 설정 파일의 연도만 처리 (기본 2023, 2024)
+    target_years = CONFIG['years']
+
+    # 모든 프로젝트에서 같은 OCR 엔진(Reader/워커 프로세스)을 재사용
+    # 픽셀이 바뀌지 않은 페이지는 캐시된 OCR 결과를 사용
+    ocr_cache = OCRCache(OCR_CACHE_PATH, max_bytes=OCR_CACHE_MAX_BYTES)
+    ocr_engine = BatchOCREngine(
+        batch_size=OCR_BATCH_SIZE,
+        workers=OCR_WORKERS,
+        cache=ocr_cache
+    )
 
-    print("\n" + "="*60)
-    print("✅ 모든 작업 완료!")
-    print("="*60)
+    hash_index = None
+    if BUILD_SETTINGS.get('dedupe') and BUILD_SETTINGS.get('web_formats'):
+        from image_hash import HashIndex
+        hash_index = HashIndex(HASH_INDEX_PATH)
+
+    manifest = BuildManifest(BUILD_MANIFEST_PATH)
+    build_settings = {**BUILD_SETTINGS, "ocr": ocr_engine.settings}
+    skipped = 0
+
+    with ocr_cache, ocr_engine:
+        for year in target_years:
+            if year not in mapping:
+                print(f"경고: {year}년 데이터가 없습니다.")
+                continue
+
+            projects = mapping[year]
+            print(f"\n{'='*60}")
+            print(f"{year}년: {len(projects)}개 프로젝트 발견")
+            print(f"{'='*60}")
+
+            for i, project in enumerate(projects, 1):
+                print(f"\n\n진행: {i}/{len(projects)}")
+
+                key = f"{year}/{slugify(project['title'])}"
+                output_dir = os.path.join(CONFIG['projects_dir'], str(year),
+                                          slugify(project['title']))
+
+                # 다른 프로젝트에 있는 원본 페이지가 바뀌면 중복 페이지도 다시 처리
+                def project_inputs():
+                    return {**manifest.project_inputs(project, build_settings),
+                            "duplicates": duplicate_sources(output_dir)}
+
+                if not FORCE_REBUILD and manifest.is_up_to_date(key, project_inputs()):
+                    print(f"  - 변경 없음, 건너뜀: {project['title']}")
+                    skipped += 1
+                    continue
+
+                outputs = process_project(project, year, ocr_engine=ocr_engine,
+                                          hash_index=hash_index)
+                # 처리 중에 새로 판정된 중복 페이지까지 반영해서 기록
+                manifest.record(key, project_inputs(), outputs)
+                manifest.save()
+
+        print("\n" + "="*60)
+        print("✅ 모든 작업 완료!")
+        print(f"변경 없어 건너뛴 프로젝트: {skipped}개")
+        ocr_cache.print_stats()
+        METRICS.print_summary()
+        print("="*60)
 
 if __name__ == "__main__":
+    # --metrics PATH, --profile, --trace-memory, --quiet (metrics.configure_from_argv 참고)
+    configure_from_argv()
     main()
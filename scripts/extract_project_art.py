@@ -1,9 +1,12 @@
 import fitz  # PyMuPDF
 import os
+import sys
 
-def render_project_pages(pdf_path, project_name, year, start_page, end_page):
+from catalog_config import load_config, project_dir
+
+def render_project_pages(pdf_path, project_name, year, start_page, end_page, config=None):
     print(f"Propcessing {project_name} ({year})...")
-    output_dir = f"d:/Antigravity/DSU_Graduation_Catalog/public/assets/projects/{year}/{project_name}"
+    output_dir = project_dir(config or load_config(), year, project_name)
     os.makedirs(output_dir, exist_ok=True)
     
     doc = fitz.open(pdf_path)
@@ -24,7 +27,9 @@ def render_project_pages(pdf_path, project_name, year, start_page, end_page):
     doc.close()
 
 if __name__ == "__main__":
-    assets_dir = "d:/Antigravity/DSU_Graduation_Catalog/assets"
+    # 경로는 data/catalog_config.json (assets_dir, projects_dir)
+    config = load_config()
+    assets_dir = config["assets_dir"]
     
     tasks = [
         # 2024
@@ -42,5 +47,15 @@ if __name__ == "__main__":
         ("2023_Artbook_Ebook.pdf", "time_machine", 2023, 101, 109),
     ]
     
+    # --images: 페이지를 다시 렌더링하지 않고 삽입된 원본 이미지만 추출 (artwork/)
+    images_only = "--images" in sys.argv
+    if images_only:
+        from extract_artwork import extract_artwork
+
     for pdf, name, year, start, end in tasks:
-        render_project_pages(os.path.join(assets_dir, pdf), name, year, start, end)
+        if images_only:
+            outputs = extract_artwork(os.path.join(assets_dir, pdf), (start, end),
+                                      project_dir(config, year, name))
+            print(f"  {name} ({year}): {len(outputs) - 1} images -> {os.path.dirname(outputs[-1])}")
+            continue
+        render_project_pages(os.path.join(assets_dir, pdf), name, year, start, end, config)
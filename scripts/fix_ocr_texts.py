@@ -2,116 +2,61 @@
 OCR 텍스트 오타 수정 및 문장 교정 스크립트
 """
 import sys
-import io
 import os
 import json
 import re
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
-# UTF-8 인코딩 강제 설정
-sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
-sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+# UTF-8 인코딩 강제 설정 (새 래퍼 대신 기존 스트림 설정 변경)
+sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+sys.stderr.reconfigure(encoding='utf-8', errors='replace')
 
-def fix_common_ocr_errors(text):
+from metrics import METRICS, configure_from_argv
+from ocr_rules import RuleStore
+from ocr_store import load_ocr_data
+
+# 교정 규칙은 data/ocr_rules/*.json 에서 읽음 (공통 → 연도 → 프로젝트 순으로 덮어씀)
+rule_store = RuleStore()
+
+# 공통 치환 규칙 (적용 순서대로)
+OCR_REPLACEMENTS = rule_store.get().replacements
+
+# 파일 단위 병렬 처리 프로세스 수 (1이면 순차 처리)
+CLEAN_WORKERS = os.cpu_count() or 1
+
+def fix_common_ocr_errors(text, rules=None):
     """
     OCR에서 자주 발생하는 오타 패턴 수정
+
+    Args:
+        text: 원본 텍스트
+        rules: 적용할 RuleSet (기본: 공통 규칙)
     """
     if not text:
         return text
 
-    # 일반적인 OCR 오류 패턴 수정
-    replacements = {
-        # 특수문자 오류
-        'ࢎ': '사',
-        'ۈ': '용',
-        '੉': '이',
-        'ݫ': '눈',
-        'ܻ': '무',
-        '੄': '의',
-        'ࣗ': '자',
-        'ݎ': '기',
-        '׮': '다',
-        'ܳ': '을',
-        'ࠁ': '보',
-        'Ҋ': '고',
-        '਷': '리',
-        'झ': '주',
-        '֢': '인',
-        'ః': '공',
-        'ய': '하',
-        '੉': '이',
-        'ࢲ': '서',
-        '۽': '로',
-        'ী': '에',
-        'ੌ': '우',
-        'ਸ': '를',
-        'ೞ': '하',
-        'ѱ': '고',
-        'ػ': '는',
-        'ח': '한',
-        'ب': '며',
-        '੗': '도',
-        'פ': '나',
-        '݅': '니',
-        'о': '어',
-        'ߡ': '요',
-        'ܽ': '으',
-        'দ': '던',
-        'ই': '트',
-        'স': '스',
-        '੘': '테',
-        'ಿ': '치',
-        '౟': '와',
-        '࠘': '드',
-
-        # 영문자 오류
-        'QPSU': 'POPU',
-        'NVSO': 'TURN',
-
-        # 한글 오류 (자주 발생하는 패턴)
-        '떼서': '테서',
-        '엄1': '엄',
-        '곳곳에': '곳곳에',
-
-        # 공백 오류
-        '  ': ' ',
-
-        # 특수기호 정리
-        '\x01': '',
-        '\x10': '',
-        '\x11': '',
-        '\u0a0d': '',
-        '\u0a44': '',
-        '\u0a49': '',
-        '\u0a89': '',
-        '\u0ad8': '',
-        '\u0bfc': '',
-        '\u0c5f': '',
-        '\u0c74': '',
-        '\u0cd0': '',
-    }
-
-    fixed = text
-    for wrong, correct in replacements.items():
-        fixed = fixed.replace(wrong, correct)
-
-    # 연속된 공백 정리
-    fixed = re.sub(r'\s+', ' ', fixed)
-
-    # 앞뒤 공백 제거
-    fixed = fixed.strip()
-
-    return fixed
-
-def clean_text(text):
+    rules = rules or rule_store.get()
+    fixed = rules.apply(text)
+
+    # 연속된 공백 정리 + 앞뒤 공백 제거 (re.sub(r'\s+', ' ', ...).strip()과 같은 결과)
+    return ' '.join(fixed.split())
+
+def clean_text(text, rules=None):
     """
     텍스트 정리 및 자연스럽게 만들기
+
+    Args:
+        text: 원본 텍스트
+        rules: 적용할 RuleSet (기본: 공통 규칙)
     """
     if not text:
         return text
 
     # 기본 OCR 오류 수정
-    text = fix_common_ocr_errors(text)
+    text = fix_common_ocr_errors(text, rules)
 
     # 문장 부호 앞뒤 공백 정리
     text = re.sub(r'\s+([.,!?;:])', r'\1', text)
@@ -126,108 +71,234 @@ def clean_text(text):
 
     return text
 
-def process_ocr_file(json_path):
+def page_texts(page_data):
+    """페이지의 full_text와 details[].text 목록"""
+    texts = [page_data.get('full_text', '')]
+    texts.extend(detail.get('text', '') for detail in page_data.get('details', []))
+    return texts
+
+def clean_page(raw_page, rules, page_name):
+    """
+    원본 페이지 데이터를 규칙으로 정리한 새 페이지 데이터 반환
+
+    재작성 텍스트가 있는 페이지는 full_text를 재작성 텍스트로 교체한다.
+    """
+    page = dict(raw_page)
+    if 'full_text' in page:
+        page['full_text'] = clean_text(page['full_text'], rules)
+
+    # details 내의 text도 수정
+    if 'details' in page:
+        page['details'] = [
+            {**detail, 'text': clean_text(detail['text'], rules)} if 'text' in detail else detail
+            for detail in page['details']
+        ]
+
+    if page_name in rules.pages:
+        page['full_text'] = rules.pages[page_name]
+    return page
+
+def write_json_atomic(path, data):
+    """
+    JSON을 임시 파일에 쓴 뒤 교체 (중간에 중단되어도 기존 파일이 깨지지 않음)
+
+    들여쓰기 없이 파일로 바로 직렬화하여 큰 문자열을 메모리에 만들지 않는다.
+    """
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def process_ocr_file(json_path, year=None, project_id=None, raise_errors=False):
     """
     OCR JSON 파일을 읽어서 텍스트를 수정하고 다시 저장
+
+    처음 정리할 때 추출 직후의 원본을 *.backup.json 으로 보관하고, 이후에는
+    관련 규칙(또는 재작성 텍스트)이 바뀐 페이지만 원본에서 다시 정리한다.
+    페이지별로 적용한 규칙의 지문은 ocr_text.json 의 applied_rules 에 기록한다.
+
+    Args:
+        json_path: ocr_text.json 경로
+        year: 연도 (기본: 경로에서 추론)
+        project_id: 프로젝트 ID (기본: 경로에서 추론)
+        raise_errors: True면 오류를 출력하고 넘어가지 않고 그대로 올림
+            (빌드 대상에서 실패로 기록되어 다음 빌드에서 다시 실행되도록)
+
+    Returns:
+        다시 정리한 페이지 수 (0이면 수정 사항 없음)
     """
+    json_path = Path(json_path)
+    year = year or json_path.parent.parent.name
+    project_id = project_id or json_path.parent.name
+    backup_path = json_path.with_name(json_path.stem + '.backup.json')
+
     try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = load_ocr_data(json_path)
+        if data is None:
+            raise FileNotFoundError(f"OCR 파일이 없습니다: {json_path}")
 
         if 'ocr_results' not in data:
+            if raise_errors:
+                raise ValueError(f"ocr_results 없음: {json_path}")
             print(f"  ⚠️ ocr_results 없음: {json_path}")
-            return False
-
-        modified = False
-        for page_name, page_data in data['ocr_results'].items():
-            if 'full_text' in page_data:
-                original = page_data['full_text']
-                cleaned = clean_text(original)
-
-                if original != cleaned:
-                    page_data['full_text'] = cleaned
-                    modified = True
-
-            # details 내의 text도 수정
-            if 'details' in page_data:
-                for detail in page_data['details']:
-                    if 'text' in detail:
-                        original = detail['text']
-                        cleaned = clean_text(original)
-                        if original != cleaned:
-                            detail['text'] = cleaned
-                            modified = True
-
-        if modified:
-            # 백업 생성
-            backup_path = str(json_path).replace('.json', '.backup.json')
-            with open(backup_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-
-            # 원본 파일 업데이트
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-
-            return True
-
-        return False
-
-    except Exception as e:
-        print(f"  ❌ 오류: {json_path} - {e}")
-        return False
+            return 0
+
+        applied = data.get('applied_rules')
+        if applied is None:
+            # 추출 직후의 원본 → 수정 전에 한 번만 백업으로 보관
+            # (이후 규칙이 바뀌면 여기서 다시 정리)
+            raw = data
+            write_json_atomic(backup_path, raw)
+            applied = {}
+        else:
+            # 백업은 JSON 또는 연도별 저장소(ocr_text.backup.bin)에서 읽음
+            raw = load_ocr_data(backup_path) or data
+
+        rules = rule_store.get(year, project_id)
+        cleaned = {}
+        for page_name, raw_page in raw['ocr_results'].items():
+            digest = rules.page_digest(page_name, page_texts(raw_page))
+            if applied.get(page_name) == digest and page_name in data['ocr_results']:
+                continue
+            cleaned[page_name] = (clean_page(raw_page, rules, page_name), digest)
 
-def main():
-    """메인 실행 함수"""
-    print("\n" + "="*70)
-    print("OCR 텍스트 오타 수정 스크립트")
-    print("="*70)
+        if not cleaned:
+            return 0
 
-    base_dir = Path("public/assets/projects")
+        data = {**data, 'ocr_results': dict(data['ocr_results']), 'applied_rules': dict(applied)}
+        for page_name, (page, digest) in cleaned.items():
+            data['ocr_results'][page_name] = page
+            data['applied_rules'][page_name] = digest
 
-    if not base_dir.exists():
-        print(f"❌ 디렉토리를 찾을 수 없습니다: {base_dir}")
-        return
+        # 원본 파일 업데이트
+        write_json_atomic(json_path, data)
+        return len(cleaned)
 
-    total_files = 0
-    modified_files = 0
+    except Exception as e:
+        if raise_errors:
+            raise
+        print(f"  ❌ 오류: {json_path} - {e}")
+        return 0
 
-    # 2023, 2024 연도별로 처리
-    for year in ['2023', '2024']:
+def find_ocr_files(base_dir, years):
+    """정리할 (연도, 프로젝트 ID, ocr_text.json 경로) 목록 (설정 파일의 연도만)"""
+    jobs = []
+    for year in years:
         year_dir = base_dir / year
         if not year_dir.exists():
             continue
 
-        print(f"\n{'='*70}")
-        print(f"{year}년 프로젝트 처리 중...")
-        print(f"{'='*70}")
-
         # 각 프로젝트 폴더 순회
         for project_dir in sorted(year_dir.iterdir()):
-            if not project_dir.is_dir():
-                continue
-
             json_path = project_dir / "ocr_text.json"
-            if not json_path.exists():
-                continue
+            if project_dir.is_dir() and json_path.exists():
+                jobs.append((year, project_dir.name, json_path))
+    return jobs
+
+def _clean_job(job):
+    """파일 하나 정리 후 (작업, 정리한 페이지 수, 소요 시간) 반환"""
+    year, project_name, json_path = job
+    start = time.perf_counter()
+    pages = process_ocr_file(json_path, year, project_name)
+    return job, pages, time.perf_counter() - start
+
+def clean_all(base_dir, years, workers=CLEAN_WORKERS):
+    """
+    모든 연도/프로젝트의 ocr_text.json 정리 (파일 단위 프로세스 풀)
 
-            total_files += 1
-            project_name = project_dir.name
+    Args:
+        base_dir: 프로젝트 출력 폴더 (설정 파일의 projects_dir)
+        years: 정리할 연도 목록 (설정 파일의 years)
+        workers: 프로세스 수 (1이면 순차 처리)
 
-            print(f"\n처리 중: {year}/{project_name}")
+    Returns:
+        (총 파일 수, 수정된 파일 수)
+    """
+    jobs = find_ocr_files(base_dir, years)
+    print(f"\n정리할 파일: {len(jobs)}개 (프로세스 {min(workers, len(jobs)) or 1}개)")
 
-            if process_ocr_file(json_path):
-                modified_files += 1
-                print(f"  ✓ 수정 완료 및 저장")
-            else:
-                print(f"  - 수정 사항 없음")
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            futures = [pool.submit(_clean_job, job) for job in jobs]
+            results = [future.result() for future in as_completed(futures)]
+    else:
+        results = [_clean_job(job) for job in jobs]
+
+    modified_files = 0
+    for (year, project_name, _), pages, elapsed in sorted(results, key=lambda r: r[0][:2]):
+        # 워커 프로세스에서 잰 시간을 부모 프로세스의 METRICS에 기록
+        METRICS.record("clean", elapsed, project=f"{year}/{project_name}", pages=pages)
+        METRICS.count("pages_cleaned", pages)
+        if pages:
+            modified_files += 1
+            METRICS.progress(f"  ✓ {year}/{project_name}: {pages}개 페이지 수정 "
+                             f"({elapsed * 1000:.0f}ms)")
+        else:
+            METRICS.progress(f"  - {year}/{project_name}: 수정 사항 없음 ({elapsed * 1000:.0f}ms)")
+
+    if results:
+        slowest = max(results, key=lambda r: r[2])
+        total_time = sum(r[2] for r in results)
+        print(f"\n파일별 처리 시간 합계: {total_time:.2f}초, "
+              f"가장 느린 파일: {slowest[0][0]}/{slowest[0][1]} ({slowest[2]:.2f}초)")
+
+    return len(jobs), modified_files
+
+def main(watch=False):
+    """
+    메인 실행 함수
+
+    Args:
+        watch: True면 규칙 파일(data/ocr_rules)이 바뀔 때마다 바뀐 페이지만 다시 정리
+    """
+    print("\n" + "="*70)
+    print("OCR 텍스트 오타 수정 스크립트")
+    print("="*70)
+
+    from catalog_config import load_config
+
+    config = load_config()
+    base_dir = Path(config["projects_dir"])
+
+    if not base_dir.exists():
+        print(f"❌ 디렉토리를 찾을 수 없습니다: {base_dir}")
+        return
+
+    total_files, modified_files = clean_all(base_dir, config["years"])
 
     print(f"\n{'='*70}")
     print(f"✅ 작업 완료!")
     print(f"{'='*70}")
     print(f"총 파일: {total_files}개")
     print(f"수정된 파일: {modified_files}개")
-    print(f"백업 파일: 각 프로젝트 폴더의 *.backup.json")
+    print(f"백업 파일: 각 프로젝트 폴더의 *.backup.json (추출 직후 원본)")
+    METRICS.print_summary()
     print(f"{'='*70}\n")
 
+    if not watch:
+        return
+
+    print(f"규칙 파일 변경 감시 중: {rule_store.rules_dir} (Ctrl+C로 종료)")
+    signature = rule_store.signature()
+    try:
+        while True:
+            time.sleep(2)
+            current = rule_store.signature()
+            if current != signature:
+                signature = current
+                print("\n규칙 변경 감지 → 바뀐 페이지만 다시 정리")
+                _, modified_files = clean_all(base_dir, config["years"])
+                print(f"수정된 파일: {modified_files}개")
+    except KeyboardInterrupt:
+        pass
+
 if __name__ == "__main__":
-    main()
+    configure_from_argv()
+    main(watch='--watch' in sys.argv)
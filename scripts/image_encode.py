@@ -0,0 +1,301 @@
+"""
+웹용 이미지 인코딩 (WebP/AVIF + 반응형 너비 단계)
+
+렌더링된 페이지 PNG를 여러 너비의 WebP/AVIF로 인코딩하고, 프론트엔드 srcset에서
+쓸 수 있도록 크기와 용량을 JSON 사이드카로 남긴다. 해시 색인(image_hash)을 주면
+이미 인코딩된 다른 페이지와 같은 페이지는 인코딩하지 않고 그 웹 이미지를 가리킨다.
+"""
+import json
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from PIL import Image
+
+from metrics import METRICS
+
+DEFAULT_FORMATS = ("webp",)
+DEFAULT_WIDTHS = (480, 960, 1920)
+VARIANTS_FILENAME = "image_variants.json"
+
+# 포맷별 PIL 저장 옵션
+SAVE_OPTIONS = {
+    "webp": {"format": "WEBP", "method": 4},
+    "avif": {"format": "AVIF", "speed": 6},
+}
+
+
+def avif_supported():
+    """AVIF 인코더 사용 가능 여부 (Pillow 11.3+ 내장 또는 pillow-avif-plugin)"""
+    from PIL import features
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        if features.check("avif"):
+            return True
+    try:
+        import pillow_avif  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def supported_formats(formats):
+    """사용 가능한 포맷만 남기기 (AVIF 인코더가 없으면 경고 후 제외)"""
+    result = []
+    for fmt in formats:
+        if fmt == "avif" and not avif_supported():
+            print("  ⚠️ AVIF 인코더가 없어 건너뜁니다 (pillow-avif-plugin 설치 필요)")
+            continue
+        result.append(fmt)
+    return result
+
+
+def variant_filename(stem, width, fmt):
+    """변형 파일명 (예: page_001-960.webp)"""
+    return f"{stem}-{width}.{fmt}"
+
+
+def encode_web_variants(image, output_dir, stem, formats=DEFAULT_FORMATS,
+                        widths=DEFAULT_WIDTHS, quality=85):
+    """
+    이미지 하나를 너비 단계별 WebP/AVIF로 인코딩
+
+    원본보다 큰 너비는 만들지 않으며, 원본이 가장 큰 단계보다 작으면
+    원본 너비 그대로 한 단계를 추가한다.
+
+    Args:
+        image: PIL 이미지
+        output_dir: 저장할 디렉토리
+        stem: 파일명 앞부분 (예: page_001)
+        formats: 출력 포맷 리스트 ("webp", "avif")
+        widths: 너비 단계
+        quality: 손실 압축 품질
+
+    Returns:
+        {width, height, variants: [{path, format, width, height, bytes}, ...]}
+    """
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGB")
+
+    ladder = sorted({w for w in widths if w < image.width} | {min(max(widths), image.width)},
+                    reverse=True)
+
+    variants = []
+    current = image
+    # 큰 단계부터 차례로 줄여 나가 매번 원본 전체를 리샘플링하지 않도록 함
+    for width in ladder:
+        if current.width != width:
+            height = max(1, round(image.height * width / image.width))
+            current = current.resize((width, height), Image.Resampling.LANCZOS)
+
+        for fmt in formats:
+            filename = variant_filename(stem, width, fmt)
+            path = os.path.join(output_dir, filename)
+            options = dict(SAVE_OPTIONS[fmt])
+            current.save(path, options.pop("format"), quality=quality, **options)
+            variants.append({
+                "path": filename,
+                "format": fmt,
+                "width": current.width,
+                "height": current.height,
+                "bytes": os.path.getsize(path)
+            })
+
+    return {"width": image.width, "height": image.height, "variants": variants}
+
+
+def _encode_file(image_path, formats, widths, quality):
+    stem = os.path.splitext(os.path.basename(image_path))[0]
+    with Image.open(image_path) as img:
+        img.load()
+        return encode_web_variants(img, os.path.dirname(image_path), stem,
+                                   formats=formats, widths=widths, quality=quality)
+
+
+def encode_space(formats, widths, quality):
+    """해시 색인에서 같은 인코딩 설정으로 만든 웹 이미지끼리만 공유하도록 나누는 이름"""
+    return f"web:{','.join(formats)}:{','.join(str(w) for w in widths)}:q{quality}"
+
+
+def index_variants(info, image_path):
+    """변형 정보의 경로를 현재 디렉토리 기준으로 바꿔 해시 색인에 기록할 형태로"""
+    directory = os.path.dirname(image_path)
+    return {**info, "variants": [{**v, "path": os.path.join(directory, v["path"])}
+                                 for v in info["variants"]]}
+
+
+def shared_variants(hash_index, canonical, output_dir):
+    """
+    원본 페이지의 웹 이미지를 가리키는 사이드카 항목 (중복 페이지용)
+
+    Returns:
+        {width, height, variants: [{path: output_dir 기준 상대 경로, ...}], same_as, phash,
+        source} (phash: 원본 페이지의 해시, source: 원본 PNG의 SHA-256. 원본이 바뀌었는지
+        확인용)
+    """
+    def relative(path):
+        return os.path.relpath(path, output_dir).replace(os.sep, "/")
+
+    entry = hash_index.get(canonical)
+    info = entry["variants"]
+    return {**info, "variants": [{**v, "path": relative(v["path"])} for v in info["variants"]],
+            "same_as": relative(canonical), "phash": entry["phash"],
+            "source": _source_digest(canonical)}
+
+
+def _source_digest(path):
+    from build_manifest import file_sha256
+
+    return file_sha256(path) if os.path.exists(path) else None
+
+
+def load_variants(output_dir):
+    """프로젝트의 image_variants.json (없으면 빈 딕셔너리)"""
+    sidecar_path = os.path.join(output_dir, VARIANTS_FILENAME)
+    if not os.path.exists(sidecar_path):
+        return {}
+    with open(sidecar_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def duplicate_sources(output_dir):
+    """
+    중복 페이지가 가리키는 원본 PNG의 현재 SHA-256 (빌드 입력용)
+
+    원본 페이지는 다른 프로젝트에 있을 수 있어서, 원본 프로젝트가 다시 빌드되면 이 값이
+    바뀌어 중복 페이지가 있는 프로젝트도 다시 빌드된다.
+
+    Returns:
+        {파일명: SHA-256 (원본 PNG가 없으면 None)}
+    """
+    return {filename: _source_digest(os.path.join(output_dir, info["same_as"]))
+            for filename, info in sorted(load_variants(output_dir).items())
+            if info and info.get("same_as")}
+
+
+def stale_duplicates(output_dir, variants, hash_index):
+    """
+    원본 페이지가 바뀌었거나 없어져서 다시 인코딩해야 하는 중복 페이지
+
+    Args:
+        variants: {파일명: 사이드카 항목} (image_variants.json)
+
+    Returns:
+        파일명 집합
+    """
+    stale = set()
+    for filename, info in variants.items():
+        if not info or not info.get("same_as"):
+            continue
+        canonical = os.path.join(output_dir, info["same_as"])
+        entry = hash_index.get(canonical)
+        # phash가 같아도 캡션, 쪽 번호 같은 작은 변경이 있을 수 있어서 원본 내용도 비교
+        if (entry is None or entry["phash"] != info.get("phash")
+                or info.get("source") != _source_digest(canonical)
+                or not all(os.path.exists(os.path.join(output_dir, v["path"]))
+                           for v in info["variants"])):
+            stale.add(filename)
+    return stale
+
+
+def dedupe_pages(image_paths, hash_index, space, pending=False):
+    """
+    해시 색인에서 이미 인코딩된 페이지와 같은 페이지 찾기
+
+    원본으로 쓸 수 있는 페이지(중복이 아닌 페이지)는 인코딩 전에 색인에 등록한다.
+
+    Args:
+        pending: True면 같은 호출에서 등록한 (아직 인코딩 전인) 페이지도 원본으로 봄.
+            호출한 쪽이 모든 원본을 인코딩한 뒤에 중복 페이지를 처리해야 한다.
+
+    Returns:
+        {중복 페이지 경로: 원본 페이지 경로}
+    """
+    from image_hash import image_hashes
+
+    duplicates = {}
+    registered = set()
+    with METRICS.stage("phash", pages=len(image_paths)):
+        hashes = image_hashes(image_paths)
+    for image_path, page_hashes in zip(image_paths, hashes):
+        canonical = hash_index.find(image_path, page_hashes, space,
+                                    pending=registered if pending else ())
+        if canonical:
+            duplicates[image_path] = canonical
+            METRICS.count("pages_deduplicated")
+        else:
+            hash_index.add(image_path, page_hashes, space)
+            registered.add(os.path.normpath(image_path))
+    return duplicates
+
+
+def encode_pages(image_paths, formats=DEFAULT_FORMATS, widths=DEFAULT_WIDTHS, quality=85,
+                 workers=1, output_dir=None, update=False, hash_index=None):
+    """
+    페이지 이미지들을 웹 포맷으로 인코딩하고 사이드카 JSON 저장
+
+    Args:
+        image_paths: 페이지 PNG 경로 리스트 (같은 디렉토리)
+        formats: 출력 포맷 리스트
+        widths: 너비 단계
+        quality: 손실 압축 품질
+        workers: 인코딩 프로세스 수
+        output_dir: 사이드카 디렉토리 (기본: 첫 이미지의 디렉토리)
+        update: True면 기존 사이드카에 인코딩한 페이지만 덮어씀 (바뀐 페이지만 다시 인코딩)
+        hash_index: image_hash.HashIndex (있으면 다른 페이지와 같은 페이지는 인코딩하지 않고
+            사이드카에서 원본 페이지의 웹 이미지를 가리킴, "same_as"에 원본 페이지)
+
+    Returns:
+        생성된 파일 경로 리스트 (변형 이미지들 + 마지막에 사이드카 JSON).
+        update=True면 사이드카에 기록된 모든 페이지의 변형 이미지 경로
+    """
+    if not image_paths and not update:
+        return []
+
+    formats = supported_formats(formats)
+    output_dir = output_dir or os.path.dirname(image_paths[0])
+    sidecar_path = os.path.join(output_dir, VARIANTS_FILENAME)
+
+    duplicates = {}
+    if hash_index is not None:
+        duplicates = dedupe_pages(image_paths, hash_index,
+                                  encode_space(formats, widths, quality), pending=True)
+    to_encode = [path for path in image_paths if path not in duplicates]
+
+    encode = partial(_encode_file, formats=formats, widths=widths, quality=quality)
+    if workers > 1 and len(to_encode) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            encoded = dict(zip(to_encode, pool.map(encode, to_encode)))
+    else:
+        encoded = {path: encode(path) for path in to_encode}
+
+    sidecar = {}
+    if update and os.path.exists(sidecar_path):
+        with open(sidecar_path, 'r', encoding='utf-8') as f:
+            sidecar = json.load(f)
+
+    for image_path, info in encoded.items():
+        if hash_index is not None:
+            hash_index.set_variants(image_path, index_variants(info, image_path))
+        sidecar[os.path.basename(image_path)] = info
+        total = sum(v["bytes"] for v in info["variants"])
+        METRICS.count("bytes_written", total)
+        METRICS.progress(f"  ✓ 웹 이미지 인코딩: {os.path.basename(image_path)} "
+                         f"({len(info['variants'])}개, {total / 1024:.0f}KB)")
+
+    for image_path, canonical in duplicates.items():
+        info = shared_variants(hash_index, canonical, output_dir)
+        encoded[image_path] = info
+        sidecar[os.path.basename(image_path)] = info
+        METRICS.progress(f"  ✓ 중복 페이지: {os.path.basename(image_path)} = {info['same_as']}")
+    encoded = [encoded[path] for path in image_paths]
+
+    if not sidecar:
+        return []
+    with open(sidecar_path, 'w', encoding='utf-8') as f:
+        json.dump(dict(sorted(sidecar.items())), f, ensure_ascii=False, indent=2)
+
+    written = [os.path.normpath(os.path.join(output_dir, v["path"]))
+               for info in (sidecar.values() if update else encoded) for v in info["variants"]]
+    return written + [sidecar_path]
@@ -0,0 +1,419 @@
+"""
+지각 해시(perceptual hash)로 프로젝트 사이의 (거의) 같은 이미지 찾기
+
+아트북에는 같은 간지 페이지, 크레딧 템플릿, 여러 작품에 실린 같은 포스터가 반복된다.
+이미지를 작게 줄인 흑백 NumPy 배열에서 pHash(DCT 저주파 부호)와 dHash(이웃 픽셀
+밝기 차이)를 여러 장 한꺼번에 계산하고, 해밍 거리용 BK-트리로 이전에 저장한 이미지 중
+가까운 것을 찾는다. 두 해시가 모두 기준 거리 안에 있는 후보만 거의 원본 크기(긴 변
+1400px 이하가 될 때까지 반씩 줄임)의 흑백 이미지를 픽셀 단위로 비교해 확인한다 (배치가
+같고 이름/쪽 번호만 다른 페이지는 해시로 구분되지 않음). 중복으로 본 페이지는 OCR 결과까지 복사하므로 글자 하나라도 다르면 다른
+이미지로 본다.
+
+색인은 .cache/image_hashes.json에 저장되며, 처음 저장된 이미지가 원본이 된다.
+중복 이미지는 따로 인코딩/저장하지 않고 원본의 웹 이미지를 참조하며 (image_encode),
+OCR 단계는 원본 페이지의 결과를 복사한다 (page_pipeline.recognize_pages).
+
+    {"version": 1, "images": {"public/.../2023/alpha/page_003.png":
+        {"phash": "c3a1...", "dhash": "...", "space": "...", "variants": {...}}}}
+
+사용법:
+    python scripts/image_hash.py a.png b.png ...   # 이미지 사이의 해시 거리 출력
+    python scripts/image_hash.py --self-test       # 쪽 번호/캡션만 다른 합성 페이지로 확인
+"""
+import io
+import json
+import os
+import sys
+import threading
+
+import numpy as np
+from PIL import Image
+
+HASH_INDEX_FILENAME = "image_hashes.json"
+HASH_INDEX_VERSION = 1
+
+# pHash: 32x32로 줄인 뒤 DCT 왼쪽 위 8x8 (64비트), dHash: 17x16 → 가로 이웃 비교 (256비트)
+PHASH_SIZE = 32
+PHASH_BITS = 8
+DHASH_SIZE = 16
+
+# 후보로 보는 최대 해밍 거리 (pHash 64비트, dHash 256비트)
+PHASH_DISTANCE = 8
+DHASH_DISTANCE = 24
+
+# 후보 확인: 작은 쪽 이미지 크기를 긴 변이 1400px 이하가 될 때까지 반씩 줄인 흑백 이미지에서
+# 모든 픽셀이 상대 이미지의 3x3 이웃 밝기 범위 ±32 안에 있어야 중복. 1920px 페이지(→ 960px)의
+# 재압축(JPEG q70, WebP q60)은 벗어나는 픽셀이 0개, 9pt 쪽 번호 한 자리만 다른 페이지는
+# 10개 안팎 (128x128로 비교하면 둘 다 통과했음)
+VERIFY_MAX_SIDE = 1400
+VERIFY_TOLERANCE = 32
+# 가로세로 비율이 이보다 다르면 비교하지 않고 다른 이미지로 봄
+VERIFY_ASPECT = 0.01
+
+
+def _dct_matrix(n):
+    # 직교 DCT-II 행렬 (scipy 없이 배치 행렬곱으로 계산)
+    k = np.arange(n)[:, None]
+    x = np.arange(n)[None, :]
+    matrix = np.cos(np.pi * (2 * x + 1) * k / (2 * n)) * np.sqrt(2 / n)
+    matrix[0] /= np.sqrt(2)
+    return matrix
+
+
+_DCT = _dct_matrix(PHASH_SIZE)
+
+
+def _pack(bits):
+    """(N, 비트 수) bool 배열 → 정수 리스트"""
+    return [int.from_bytes(row.tobytes(), "big") for row in np.packbits(bits, axis=1)]
+
+
+def load_gray(source):
+    """
+    해시용 흑백 축소 배열 두 개 (pHash용 32x32, dHash용 16x17)
+
+    Args:
+        source: 이미지 경로, 파일 객체 또는 바이트
+    """
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    with Image.open(source) as img:
+        # JPEG는 디코딩 단계에서 바로 줄임
+        img.draft("L", (PHASH_SIZE * 4, PHASH_SIZE * 4))
+        if img.mode in ("RGBA", "LA", "P"):
+            img = img.convert("RGBA")
+            background = Image.new("RGBA", img.size, "white")
+            img = Image.alpha_composite(background, img)
+        gray = img.convert("L")
+        gray.thumbnail((PHASH_SIZE * 4, PHASH_SIZE * 4), Image.Resampling.BOX)
+        small = np.asarray(gray.resize((PHASH_SIZE, PHASH_SIZE), Image.Resampling.BOX),
+                           dtype=np.float32)
+        wide = np.asarray(gray.resize((DHASH_SIZE + 1, DHASH_SIZE), Image.Resampling.BOX),
+                          dtype=np.float32)
+    return small, wide
+
+
+def _open(source):
+    return Image.open(io.BytesIO(source) if isinstance(source, bytes) else source)
+
+
+def _verify_array(source, size):
+    # JPEG draft(DCT 단계 축소)는 PNG와 다르게 리샘플링되어 경계가 어긋나므로 쓰지 않음
+    with _open(source) as img:
+        gray = img.convert("L")
+        if gray.size != size:
+            gray = gray.resize(size, Image.Resampling.BOX)
+        return np.asarray(gray, dtype=np.int16)
+
+
+def _outside(a, b):
+    """a의 픽셀 중 b의 같은 위치 3x3 이웃 밝기 범위 ±VERIFY_TOLERANCE를 벗어나는 것"""
+    padded = np.pad(b, 1, mode="edge")
+    height, width = b.shape
+    shifted = [padded[y:y + height, x:x + width] for y in range(3) for x in range(3)]
+    low = np.minimum.reduce(shifted) - VERIFY_TOLERANCE
+    high = np.maximum.reduce(shifted) + VERIFY_TOLERANCE
+    return (a < low) | (a > high)
+
+
+def same_image(a, b):
+    """
+    두 이미지가 같은 이미지인지 (해시 후보 확인용)
+
+    작은 쪽 크기(긴 변이 VERIFY_MAX_SIDE 이하가 될 때까지 1/2씩)로 줄인 흑백 이미지에서
+    양쪽 모든 픽셀이 상대 이미지의 3x3 이웃 밝기 범위 안에 있어야 한다. 재압축 잡음과
+    경계의 1픽셀 어긋남은 허용하고, 쪽 번호나 캡션 한 단어처럼 작은 영역이라도 글자가
+    바뀌면 다르다고 본다. 크기가 다른 사본은 정수배로 줄인 경우(BOX)에만 대개 통과하고,
+    LANCZOS처럼 경계를 날카롭게 하는 리샘플링은 다른 이미지로 본다 (중복을 놓치는 쪽이 안전).
+    """
+    with _open(a) as img_a, _open(b) as img_b:
+        size_a, size_b = img_a.size, img_b.size
+    if abs(size_a[0] / size_a[1] - size_b[0] / size_b[1]) > VERIFY_ASPECT * size_a[0] / size_a[1]:
+        return False
+
+    # 정수배로 줄여야 두 이미지의 BOX 축소가 같은 픽셀 구간을 평균함
+    width, height = min(size_a, size_b)
+    factor = 1
+    while max(width, height) / factor > VERIFY_MAX_SIDE:
+        factor *= 2
+    size = (max(1, round(width / factor)), max(1, round(height / factor)))
+    array_a, array_b = _verify_array(a, size), _verify_array(b, size)
+    return not (_outside(array_a, array_b).any() or _outside(array_b, array_a).any())
+
+
+def phash_batch(arrays):
+    """(N, 32, 32) 배열 → pHash 정수 리스트 (DC 성분을 뺀 저주파 계수가 중앙값보다 큰지)"""
+    coeffs = _DCT @ arrays @ _DCT.T
+    low = coeffs[:, :PHASH_BITS, :PHASH_BITS].reshape(len(arrays), -1)
+    median = np.median(low[:, 1:], axis=1, keepdims=True)
+    return _pack(low > median)
+
+
+def dhash_batch(arrays):
+    """(N, 16, 17) 배열 → dHash 정수 리스트 (오른쪽 픽셀이 더 밝은지)"""
+    return _pack((arrays[:, :, 1:] > arrays[:, :, :-1]).reshape(len(arrays), -1))
+
+
+def image_hashes(sources):
+    """
+    이미지 여러 장의 (pHash, dHash) 리스트
+
+    Args:
+        sources: 이미지 경로/파일 객체/바이트 리스트
+    """
+    if not sources:
+        return []
+    small, wide = zip(*(load_gray(source) for source in sources))
+    return list(zip(phash_batch(np.stack(small)), dhash_batch(np.stack(wide))))
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+class BKTree:
+    """
+    해밍 거리 BK-트리 (기준 거리 안의 키를 전체 비교 없이 찾기)
+
+    노드마다 자식을 부모와의 거리로 나눠 두면, 삼각 부등식으로
+    |d - r| <= 거리 <= d + r 범위의 자식만 내려가면 된다.
+    """
+
+    def __init__(self, distance=hamming):
+        self.distance = distance
+        self.root = None
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def add(self, key, value):
+        self.size += 1
+        if self.root is None:
+            self.root = (key, value, {})
+            return
+        node = self.root
+        while True:
+            d = self.distance(key, node[0])
+            child = node[2].get(d)
+            if child is None:
+                node[2][d] = (key, value, {})
+                return
+            node = child
+
+    def search(self, key, max_distance):
+        """기준 거리 안의 [(거리, 키, 값)] (가까운 순)"""
+        if self.root is None:
+            return []
+        found = []
+        stack = [self.root]
+        while stack:
+            node_key, value, children = stack.pop()
+            d = self.distance(key, node_key)
+            if d <= max_distance:
+                found.append((d, node_key, value))
+            for child_distance, child in children.items():
+                if d - max_distance <= child_distance <= d + max_distance:
+                    stack.append(child)
+        return sorted(found, key=lambda item: item[0])
+
+
+class HashIndex:
+    """
+    프로젝트 사이에 공유하는 이미지 해시 색인
+
+    Args:
+        path: 색인 JSON 경로 (예: .cache/image_hashes.json)
+
+    항목마다 space(같은 space끼리만 비교, 예: 웹 인코딩 설정)와 원본의 저장 정보
+    (variants)를 함께 기록한다. 여러 스레드에서 함께 써도 된다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.images = {}
+        self._trees = {}
+        self._lock = threading.Lock()
+
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == HASH_INDEX_VERSION:
+                self.images = data.get("images", {})
+        for image_path, entry in self.images.items():
+            self._tree(entry["space"]).add(int(entry["phash"], 16), image_path)
+
+    def _tree(self, space):
+        if space not in self._trees:
+            self._trees[space] = BKTree()
+        return self._trees[space]
+
+    def find(self, path, hashes, space, source=None, pending=()):
+        """
+        path와 (거의) 같은 원본 이미지 경로 (없으면 None)
+
+        자기 자신, 해시가 바뀐 옛 항목, 원본이나 저장 파일이 없어진 항목은 제외한다.
+
+        Args:
+            path: 찾는 이미지의 경로 (색인 키)
+            hashes: image_hashes()의 (pHash, dHash)
+            space: 비교할 색인 공간
+            source: 픽셀 확인에 쓸 이미지 (기본 path, 아직 저장하지 않았으면 바이트)
+            pending: 저장 정보(variants)가 아직 없어도 원본 후보로 볼 경로들
+                (같은 호출에서 등록하고 곧 인코딩할 이미지)
+        """
+        phash, dhash = hashes
+        with self._lock:
+            candidates = []
+            for _, key, candidate in self._tree(space).search(phash, PHASH_DISTANCE):
+                entry = self.images.get(candidate)
+                if (candidate == os.path.normpath(path) or entry is None
+                        or int(entry["phash"], 16) != key or entry["space"] != space):
+                    continue
+                if hamming(int(entry["dhash"], 16), dhash) > DHASH_DISTANCE:
+                    continue
+                stored = stored_paths(entry["variants"]) if entry.get("variants") else []
+                if entry.get("variants") is None and candidate not in pending:
+                    continue
+                if not all(os.path.exists(p) for p in [candidate, *stored]):
+                    continue
+                candidates.append(candidate)
+
+        # 픽셀 확인은 파일을 읽으므로 잠금 밖에서
+        for candidate in candidates:
+            if same_image(source or path, candidate):
+                return candidate
+        return None
+
+    def add(self, path, hashes, space, variants=None):
+        """
+        원본 이미지 등록 (이미 있으면 덮어씀)
+
+        Args:
+            variants: 저장한 파일 정보 (경로는 현재 디렉토리 기준).
+                인코딩 전에 등록해 두고 set_variants()로 나중에 채울 수 있다.
+        """
+        path = os.path.normpath(path)
+        phash, dhash = hashes
+        with self._lock:
+            self.images[path] = {"phash": f"{phash:016x}", "dhash": f"{dhash:064x}",
+                                 "space": space, "variants": variants}
+            self._tree(space).add(phash, path)
+
+    def set_variants(self, path, variants):
+        with self._lock:
+            entry = self.images.get(os.path.normpath(path))
+            if entry is not None:
+                entry["variants"] = variants
+
+    def get(self, path):
+        """색인 항목 (없으면 None)"""
+        return self.images.get(os.path.normpath(path))
+
+    def variants(self, path):
+        entry = self.get(path)
+        return entry and entry.get("variants")
+
+    def save(self):
+        """색인 저장 (임시 파일 후 교체)"""
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": HASH_INDEX_VERSION, "images": self.images},
+                          f, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, self.path)
+
+
+def stored_paths(variants):
+    """색인 항목의 저장 파일 경로들 ({"variants": [{path}...]} 또는 {"path"})"""
+    if "variants" in variants:
+        return [v["path"] for v in variants["variants"]]
+    return [variants["path"]]
+
+
+def _synthetic_page(page_number, caption):
+    """자체 확인용 1920px 페이지 (그림 + 제목 + 본문 + 캡션 + 쪽 번호)"""
+    from PIL import ImageDraw, ImageFont
+
+    rng = np.random.default_rng(0)
+    page = Image.new("RGB", (1920, 2716), "white")
+    gradient = np.linspace(60, 200, 1660, dtype=np.float32)[None, :, None]
+    noise = rng.normal(0, 12, size=(1400, 1660, 3))
+    page.paste(Image.fromarray(np.clip(gradient + noise, 0, 255).astype(np.uint8)), (130, 390))
+
+    draw = ImageDraw.Draw(page)
+    draw.text((160, 170), "Project Title", fill="black", font=ImageFont.load_default(90))
+    body = ImageFont.load_default(29)
+    for line in range(12):
+        draw.text((160, 1940 + line * 45), f"Body text about the concept art and storyboard {line}",
+                  fill="black", font=body)
+    draw.text((160, 2520), caption, fill="black", font=ImageFont.load_default(26))
+    draw.text((1740, 2620), str(page_number), fill="black", font=body)
+    return page
+
+
+def self_test():
+    """
+    쪽 번호 한 자리 또는 캡션 한 단어만 다른 페이지는 중복이 아니고,
+    재압축하거나 정수배로 줄인 같은 페이지는 중복인지 확인
+
+    Returns:
+        실패한 경우 수
+    """
+    page = _synthetic_page(12, "Character design by Kim")
+
+    def encoded(img, fmt, **options):
+        buffer = io.BytesIO()
+        img.save(buffer, fmt, **options)
+        return buffer.getvalue()
+
+    original = encoded(page, "PNG")
+    cases = [
+        ("쪽 번호만 다름 (12 → 13)", encoded(_synthetic_page(13, "Character design by Kim"), "PNG"),
+         False),
+        ("캡션 한 단어만 다름 (Kim → Lee)",
+         encoded(_synthetic_page(12, "Character design by Lee"), "PNG"), False),
+        ("JPEG 재압축 (q70)", encoded(page, "JPEG", quality=70), True),
+        ("WebP 재압축 (q60)", encoded(page, "WEBP", quality=60), True),
+        ("절반 크기 (BOX 축소)", encoded(page.reduce(2), "PNG"), True),
+    ]
+
+    failures = 0
+    for label, other, expected in cases:
+        hashes = image_hashes([original, other])
+        candidate = (hamming(hashes[0][0], hashes[1][0]) <= PHASH_DISTANCE
+                     and hamming(hashes[0][1], hashes[1][1]) <= DHASH_DISTANCE)
+        duplicate = candidate and same_image(original, other)
+        ok = duplicate == expected
+        failures += not ok
+        print(f"{'✓' if ok else '❌'} {label}: {'중복' if duplicate else '다름'} "
+              f"(해시 후보 {'예' if candidate else '아니오'})")
+    return failures
+
+
+def main():
+    if "--self-test" in sys.argv:
+        return 1 if self_test() else 0
+
+    paths = sys.argv[1:]
+    if len(paths) < 2:
+        print("사용법: python scripts/image_hash.py a.png b.png ...")
+        return 1
+
+    hashes = image_hashes(paths)
+    for i, (path_a, (pa, da)) in enumerate(zip(paths, hashes)):
+        for path_b, (pb, db) in zip(paths[i + 1:], hashes[i + 1:]):
+            duplicate = (hamming(pa, pb) <= PHASH_DISTANCE and hamming(da, db) <= DHASH_DISTANCE
+                         and same_image(path_a, path_b))
+            print(f"{'=' if duplicate else ' '} pHash {hamming(pa, pb):2d}  "
+                  f"dHash {hamming(da, db):3d}  {path_a}  {path_b}")
+    return 0
+
+
+if __name__ == "__main__":
+    # UTF-8 인코딩 강제 설정 (Windows cp949 문제 해결)
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+    sys.stderr.reconfigure(encoding='utf-8', errors='replace')
+
+    sys.exit(main())
@@ -0,0 +1,223 @@
+"""
+단계별 계측 (타이머, 카운터, 선택적 cProfile/tracemalloc)
+
+렌더링/인코딩/OCR/정리 단계를 페이지마다 시간 재고, 쓴 바이트 수나 검출한
+박스 수 같은 카운터를 모아서 JSON-lines 파일로 남기고 실행이 끝나면 요약 표를
+출력한다. 기본 상태에서는 메모리에 모으기만 하므로 비용이 거의 없다.
+
+    from metrics import METRICS
+
+    with METRICS.stage("render", page="page_001.png"):
+        ...
+    METRICS.count("bytes_written", os.path.getsize(path))
+
+JSON-lines 한 줄 형식:
+    {"ts": 1700000000.0, "event": "stage", "stage": "render", "seconds": 0.12, "labels": {...}}
+    {"ts": ..., "event": "summary", "stages": {...}, "counters": {...}}
+"""
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+
+class Metrics:
+    """
+    실행 하나의 계측값 모음 (스레드 안전)
+
+    Args:
+        path: JSON-lines 출력 경로 (None이면 파일로 쓰지 않음)
+        profile: True면 단계별 cProfile 수집 (가장 바깥 단계만)
+        trace_memory: True면 단계별 tracemalloc 최대 할당량 기록. tracemalloc의 최대값은
+            프로세스 전체 값이므로, 다른 스레드의 단계와 겹치지 않고 혼자 실행된 가장 바깥
+            단계만 기록한다 (스트리밍 파이프라인처럼 단계가 스레드에서 겹치면 기록되지 않음)
+        quiet: True면 progress() 출력 생략 (페이지별 출력이 느린 환경용)
+    """
+
+    def __init__(self, path=None, profile=False, trace_memory=False, quiet=False):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # 메모리 측정 중인 가장 바깥 단계 수 (모든 스레드 합계)와 단계 시작 횟수
+        self._active = 0
+        self._started_stages = 0
+        self.configure(path, profile, trace_memory, quiet)
+
+    def configure(self, path=None, profile=False, trace_memory=False, quiet=False):
+        """설정을 바꾸고 모은 값을 초기화 (모듈 전역 METRICS를 그대로 재사용하기 위함)"""
+        self.close()
+        self.path = path
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.quiet = quiet
+        self.timings = defaultdict(list)
+        self.memory = defaultdict(int)
+        self.counters = defaultdict(float)
+        self.profiles = {}
+        self._file = None
+        self._started = time.time()
+
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._file = open(path, "a", encoding="utf-8")
+        if trace_memory:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+
+    def _emit(self, record):
+        if self._file is None:
+            return
+        line = json.dumps({"ts": round(time.time(), 3), **record}, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+
+    @contextmanager
+    def stage(self, name, **labels):
+        """단계 하나의 시간(+선택적으로 프로파일/메모리) 측정"""
+        depth = getattr(self._local, "depth", 0)
+        self._local.depth = depth + 1
+
+        profiler = None
+        # cProfile은 스레드마다 하나만 켤 수 있으므로 메인 스레드의 가장 바깥 단계만 프로파일
+        if self.profile and depth == 0 and threading.current_thread() is threading.main_thread():
+            import cProfile
+            profiler = cProfile.Profile()
+            profiler.enable()
+        # 다른 단계가 실행 중이거나 도중에 시작되면 최대값이 섞이므로 기록하지 않음
+        alone = None
+        if self.trace_memory and depth == 0:
+            import tracemalloc
+            with self._lock:
+                alone = self._active == 0
+                self._active += 1
+                self._started_stages += 1
+                started = self._started_stages
+                if alone:
+                    tracemalloc.reset_peak()
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self._local.depth = depth
+
+            if profiler is not None:
+                profiler.disable()
+                with self._lock:
+                    if name in self.profiles:
+                        self.profiles[name].add(profiler)
+                    else:
+                        import pstats
+                        self.profiles[name] = pstats.Stats(profiler)
+
+            peak = None
+            if alone is not None:
+                import tracemalloc
+                with self._lock:
+                    self._active -= 1
+                    if alone and self._started_stages == started:
+                        peak = tracemalloc.get_traced_memory()[1]
+            self.record(name, seconds, peak, **labels)
+
+    def record(self, name, seconds, memory_peak=None, **labels):
+        """
+        이미 잰 시간 기록 (프로세스 풀 워커에서 잰 시간을 부모 프로세스에 남길 때)
+        """
+        with self._lock:
+            self.timings[name].append(seconds)
+            if memory_peak is not None:
+                self.memory[name] = max(self.memory[name], memory_peak)
+
+        record = {"event": "stage", "stage": name, "seconds": round(seconds, 6)}
+        if labels:
+            record["labels"] = labels
+        if memory_peak is not None:
+            record["memory_peak_bytes"] = memory_peak
+        self._emit(record)
+
+    def count(self, name, value=1):
+        """카운터 증가 (예: bytes_written, boxes_detected)"""
+        with self._lock:
+            self.counters[name] += value
+
+    def progress(self, message):
+        """진행 상황 출력 (quiet 모드면 생략)"""
+        if not self.quiet:
+            print(message)
+
+    def summary(self):
+        """단계별 요약 {단계: {count, total_s, mean_ms, p50_ms, p95_ms, max_ms[, memory_peak_mb]}}"""
+        import numpy as np
+
+        stages = {}
+        with self._lock:
+            for name, values in self.timings.items():
+                ms = np.asarray(values) * 1000
+                stages[name] = {
+                    "count": len(values),
+                    "total_s": round(float(ms.sum()) / 1000, 3),
+                    "mean_ms": round(float(ms.mean()), 2),
+                    "p50_ms": round(float(np.percentile(ms, 50)), 2),
+                    "p95_ms": round(float(np.percentile(ms, 95)), 2),
+                    "max_ms": round(float(ms.max()), 2)
+                }
+                if name in self.memory:
+                    stages[name]["memory_peak_mb"] = round(self.memory[name] / 1024 / 1024, 2)
+            counters = dict(self.counters)
+        return stages, counters
+
+    def print_summary(self, profile_dir=".cache/profiles"):
+        """요약 표 출력 + JSON-lines에 summary 줄 추가 + 프로파일 저장"""
+        stages, counters = self.summary()
+        wall = time.time() - self._started
+
+        if stages:
+            print(f"\n{'단계':<12}{'횟수':>7}{'합계(s)':>10}{'평균ms':>10}{'p50ms':>10}"
+                  f"{'p95ms':>10}{'최대ms':>10}{'메모리MB':>10}")
+            for name, stage in sorted(stages.items(), key=lambda item: -item[1]["total_s"]):
+                memory = stage.get("memory_peak_mb")
+                print(f"{name:<12}{stage['count']:>7}{stage['total_s']:>10.2f}"
+                      f"{stage['mean_ms']:>10.1f}{stage['p50_ms']:>10.1f}{stage['p95_ms']:>10.1f}"
+                      f"{stage['max_ms']:>10.1f}{memory if memory is not None else '-':>10}")
+        for name, value in sorted(counters.items()):
+            print(f"  {name}: {value:,.0f}")
+        print(f"  전체 경과 시간: {wall:.1f}초")
+
+        self._emit({"event": "summary", "wall_s": round(wall, 3), "stages": stages,
+                    "counters": counters})
+
+        if self.profiles:
+            os.makedirs(profile_dir, exist_ok=True)
+            for name, stats in self.profiles.items():
+                path = os.path.join(profile_dir, f"{name}.prof")
+                stats.dump_stats(path)
+                print(f"  프로파일 저장: {path}")
+
+    def close(self):
+        if getattr(self, "_file", None) is not None:
+            self._file.close()
+            self._file = None
+
+
+# 모든 스크립트가 공유하는 계측 객체 (configure()로 설정)
+METRICS = Metrics()
+
+
+def configure_from_argv(argv=None):
+    """
+    공통 명령행 옵션으로 METRICS 설정
+
+        --metrics PATH   JSON-lines 출력
+        --profile        단계별 cProfile (.cache/profiles/{단계}.prof)
+        --trace-memory   단계별 tracemalloc 최대 할당량 (다른 스레드와 겹치지 않은 단계만)
+        --quiet          페이지별 진행 출력 생략
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    path = argv[argv.index("--metrics") + 1] if "--metrics" in argv else None
+    METRICS.configure(path=path, profile="--profile" in argv,
+                      trace_memory="--trace-memory" in argv, quiet="--quiet" in argv)
+    return METRICS
@@ -0,0 +1,134 @@
+"""
+OCR 결과 캐시 (SQLite, 페이지 픽셀 해시 기반)
+
+같은 픽셀과 같은 OCR 설정이면 결과도 같으므로, 렌더링된 이미지 바이트와
+설정을 해시한 값을 키로 결과 JSON을 저장한다. 전체 크기가 한도를 넘으면
+가장 오래 사용하지 않은 항목부터 삭제한다 (LRU).
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+DEFAULT_CACHE_PATH = ".cache/ocr_cache.sqlite"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# 결과 형식이 바뀌면 올려서 기존 캐시를 무효화
+CACHE_VERSION = 1
+
+
+class OCRCache:
+    """
+    OCR 결과 온디스크 캐시
+
+    Args:
+        path: SQLite 파일 경로
+        max_bytes: 저장할 결과의 최대 총 크기 (초과 시 LRU 삭제)
+
+    만든 스레드가 아닌 스레드에서도 쓸 수 있지만 (catalog build의 OCR 대상),
+    동시에 여러 스레드에서 쓰면 안 된다.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS ocr_cache ("
+            " key TEXT PRIMARY KEY,"
+            " result TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_last_access ON ocr_cache(last_access)"
+        )
+        row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM ocr_cache").fetchone()
+        self._total_bytes = row[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @staticmethod
+    def make_key(array, settings):
+        """
+        이미지 픽셀과 OCR 설정으로 캐시 키 생성
+
+        Args:
+            array: 이미지 NumPy 배열
+            settings: OCR 설정 딕셔너리 (언어, 옵션 등)
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(json.dumps([CACHE_VERSION, settings], sort_keys=True).encode('utf-8'))
+        digest.update(str(array.shape).encode('ascii'))
+        digest.update(array.tobytes())
+        return digest.hexdigest()
+
+    def get(self, key):
+        """캐시된 결과 반환 (없으면 None)"""
+        row = self._conn.execute(
+            "SELECT result FROM ocr_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._conn.execute(
+            "UPDATE ocr_cache SET last_access = ? WHERE key = ?", (time.time(), key)
+        )
+        return json.loads(row[0])
+
+    def put(self, key, result):
+        """결과 저장 후 한도를 넘으면 LRU 삭제"""
+        payload = json.dumps(result, ensure_ascii=False)
+        size = len(payload.encode('utf-8'))
+
+        old = self._conn.execute(
+            "SELECT size FROM ocr_cache WHERE key = ?", (key,)
+        ).fetchone()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO ocr_cache (key, result, size, last_access) VALUES (?, ?, ?, ?)",
+            (key, payload, size, time.time())
+        )
+        self._total_bytes += size - (old[0] if old else 0)
+
+        if self._total_bytes > self.max_bytes:
+            self._evict()
+
+    def _evict(self):
+        """오래 사용하지 않은 항목부터 한도의 90%까지 삭제"""
+        target = int(self.max_bytes * 0.9)
+        rows = self._conn.execute(
+            "SELECT key, size FROM ocr_cache ORDER BY last_access"
+        ).fetchall()
+
+        doomed = []
+        for key, size in rows:
+            if self._total_bytes <= target:
+                break
+            doomed.append((key,))
+            self._total_bytes -= size
+
+        self._conn.executemany("DELETE FROM ocr_cache WHERE key = ?", doomed)
+        self.evictions += len(doomed)
+
+    def print_stats(self):
+        """적중/미스 통계 출력"""
+        total = self.hits + self.misses
+        rate = (self.hits / total * 100) if total else 0.0
+        print(f"OCR 캐시: 적중 {self.hits} / 미스 {self.misses} ({rate:.1f}%), "
+              f"삭제 {self.evictions}, 크기 {self._total_bytes / 1024 / 1024:.1f}MB")
+
+    def close(self):
+        self._conn.close()
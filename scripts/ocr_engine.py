@@ -0,0 +1,297 @@
+"""
+배치 OCR 엔진
+
+EasyOCR Reader를 한 번만 만들어 재사용하고, 여러 페이지 이미지를 배치로 묶어
+한 번에 검출/인식한다. 필요하면 Reader를 가진 프로세스를 여러 개 띄워 병렬 처리한다.
+"""
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# EasyOCR 언어 설정 (중국어는 영어와만 호환되므로 한국어+영어 조합 사용)
+OCR_LANGUAGES = ['ko', 'en']
+
+# 워커 프로세스마다 한 번만 만드는 Reader
+_worker_reader = None
+
+# get_reader()가 (언어, GPU) 조합별로 한 번만 만드는 Reader
+_shared_readers = {}
+
+
+def ocr_settings(languages=None):
+    """결과에 영향을 주는 OCR 설정 (캐시 키에 사용)"""
+    return {
+        "languages": list(languages or OCR_LANGUAGES),
+        "detail": 1,
+        "paragraph": False
+    }
+
+
+def create_reader(languages=None, gpu=False):
+    """EasyOCR Reader 생성 (모델 로딩에 수 초가 걸리므로 재사용할 것)"""
+    import easyocr
+    return easyocr.Reader(list(languages or OCR_LANGUAGES), gpu=gpu)
+
+
+def get_reader(languages=None, gpu=False):
+    """
+    프로세스에서 공유하는 Reader (처음 호출할 때 easyocr/torch를 불러와 생성)
+
+    모듈을 import만 하는 스크립트(slugify, 페이지 렌더링 등)는 모델 로딩 비용을 내지 않는다.
+    """
+    key = (tuple(languages or OCR_LANGUAGES), gpu)
+    if key not in _shared_readers:
+        print("EasyOCR 초기화 중... (최초 실행시 언어 모델 다운로드)")
+        _shared_readers[key] = create_reader(key[0], gpu)
+        print("EasyOCR 준비 완료!")
+    return _shared_readers[key]
+
+
+def format_ocr_result(results):
+    """
+    EasyOCR readtext 결과를 JSON 직렬화 가능한 형태로 변환
+
+    Args:
+        results: [[bbox_points], text, confidence] 리스트
+
+    Returns:
+        {full_text: str, details: list}
+    """
+    full_text = []
+    details = []
+
+    for result in results:
+        # EasyOCR returns [[bbox_points], text, confidence]
+        # 안전하게 처리
+        if len(result) >= 3:
+            bbox, text, confidence = result[0], result[1], float(result[2])
+        elif len(result) == 2:
+            # detail=0인 경우 (bbox, text)
+            bbox, text = result[0], result[1]
+            confidence = 1.0
+        else:
+            continue
+
+        full_text.append(text)
+        # bbox를 JSON 직렬화 가능하도록 변환
+        details.append({
+            "text": text,
+            "confidence": confidence,
+            "bbox": [[int(x), int(y)] for x, y in bbox]
+        })
+
+    return {
+        "full_text": "\n".join(full_text),
+        "details": details
+    }
+
+
+def load_image_array(image):
+    """
+    파일 경로 또는 배열을 RGB uint8 NumPy 배열로 변환 (디스크에서 한 번만 디코딩)
+
+    (경로, (x0, y0, x1, y1)) 튜플이면 해당 픽셀 영역만 잘라서 반환한다.
+    """
+    if isinstance(image, np.ndarray):
+        return image
+    if isinstance(image, tuple):
+        return crop_region(load_image_array(image[0]), image[1])
+
+    from PIL import Image
+    with Image.open(image) as img:
+        return np.asarray(img.convert('RGB'))
+
+
+def load_image_arrays(images):
+    """load_image_array 여러 번 (같은 파일의 여러 영역은 파일을 한 번만 디코딩)"""
+    decoded = {}
+    arrays = []
+    for image in images:
+        if isinstance(image, tuple):
+            path, box = image
+            if path not in decoded:
+                decoded[path] = load_image_array(path)
+            arrays.append(crop_region(decoded[path], box))
+        else:
+            arrays.append(load_image_array(image))
+    return arrays
+
+
+def crop_region(array, box):
+    """픽셀 영역 (x0, y0, x1, y1) 잘라내기 (EasyOCR/캐시 키를 위해 연속 배열로 복사)"""
+    x0, y0, x1, y1 = box
+    return np.ascontiguousarray(array[y0:y1, x0:x1])
+
+
+def offset_result(result, dx, dy):
+    """잘라낸 영역의 OCR 결과 bbox를 원래 페이지 좌표로 이동"""
+    return {
+        "full_text": result["full_text"],
+        "details": [
+            {**detail, "bbox": [[x + dx, y + dy] for x, y in detail["bbox"]]}
+            for detail in result["details"]
+        ]
+    }
+
+
+def combine_results(results):
+    """여러 영역의 OCR 결과를 페이지 하나로 합치기 (위→아래, 왼쪽→오른쪽 순서)"""
+    details = sorted((d for result in results for d in result["details"]),
+                     key=lambda d: (d["bbox"][0][1], d["bbox"][0][0]))
+    return {
+        "full_text": "\n".join(d["text"] for d in details),
+        "details": details
+    }
+
+
+def readtext_batch(reader, images, batch_size=8):
+    """
+    여러 이미지를 한 Reader로 배치 OCR
+
+    readtext_batched는 같은 크기의 이미지만 묶을 수 있으므로 크기별로 그룹을 나눈다.
+    bbox 좌표가 원본과 달라지지 않도록 리사이즈는 하지 않는다.
+
+    Returns:
+        입력 순서와 같은 {full_text, details} 리스트
+    """
+    arrays = load_image_arrays(images)
+    results = [None] * len(arrays)
+
+    groups = defaultdict(list)
+    for index, array in enumerate(arrays):
+        groups[array.shape].append(index)
+
+    for indices in groups.values():
+        if len(indices) == 1:
+            raw = [reader.readtext(arrays[indices[0]], detail=1, paragraph=False,
+                                   batch_size=batch_size)]
+        else:
+            raw = reader.readtext_batched([arrays[i] for i in indices], detail=1,
+                                          paragraph=False, batch_size=batch_size)
+        for index, page_result in zip(indices, raw):
+            results[index] = format_ocr_result(page_result)
+
+    return results
+
+
+def _init_worker(languages, gpu, workers):
+    """워커 프로세스 초기화: 프로세스 전용 Reader 생성"""
+    global _worker_reader
+    try:
+        import torch
+        # 프로세스끼리 코어를 나눠 쓰도록 스레드 수 제한
+        torch.set_num_threads(max(1, (os.cpu_count() or 1) // workers))
+    except ImportError:
+        pass
+    _worker_reader = create_reader(languages, gpu)
+
+
+def _recognize_in_worker(images, batch_size):
+    return readtext_batch(_worker_reader, images, batch_size)
+
+
+class BatchOCREngine:
+    """
+    여러 페이지를 배치로 OCR하는 영속 엔진
+
+    Args:
+        languages: EasyOCR 언어 리스트 (기본 ['ko', 'en'])
+        batch_size: 인식 단계 배치 크기
+        workers: Reader 프로세스 수 (1이면 현재 프로세스에서 처리)
+        gpu: GPU 사용 여부
+        reader: 이미 만들어 둔 Reader (workers=1일 때 재사용, 없으면 첫 OCR 때 get_reader())
+        cache: OCRCache (있으면 캐시에 없는 페이지만 OCR)
+    """
+
+    def __init__(self, languages=None, batch_size=8, workers=1, gpu=False, reader=None,
+                 cache=None):
+        self.languages = list(languages or OCR_LANGUAGES)
+        self.batch_size = batch_size
+        self.workers = max(1, workers)
+        self.gpu = gpu
+        self.cache = cache
+        self.settings = ocr_settings(self.languages)
+        self._reader = reader
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _get_reader(self):
+        if self._reader is None:
+            self._reader = get_reader(self.languages, self.gpu)
+        return self._reader
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.languages, self.gpu, self.workers)
+            )
+        return self._pool
+
+    def recognize(self, images):
+        """
+        이미지(경로, NumPy 배열 또는 (경로, 픽셀 영역)) 리스트를 OCR
+
+        Returns:
+            입력 순서와 같은 {full_text, details} 리스트
+        """
+        if self.cache is None:
+            return self._recognize_uncached(list(images))
+
+        arrays = load_image_arrays(images)
+        keys = [self.cache.make_key(array, self.settings) for array in arrays]
+        results = [self.cache.get(key) for key in keys]
+
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            fresh = self._recognize_uncached([arrays[i] for i in missing])
+            for index, result in zip(missing, fresh):
+                results[index] = result
+                self.cache.put(keys[index], result)
+
+        return results
+
+    def _recognize_uncached(self, images):
+        if not images:
+            return []
+        if self.workers == 1:
+            return readtext_batch(self._get_reader(), images, self.batch_size)
+
+        # batch_size 단위로 나누어 워커 프로세스에 분배
+        pool = self._get_pool()
+        futures = [
+            pool.submit(_recognize_in_worker, images[i:i + self.batch_size], self.batch_size)
+            for i in range(0, len(images), self.batch_size)
+        ]
+        results = []
+        for future in futures:
+            results.extend(future.result())
+        return results
+
+    def iter_recognize(self, images):
+        """
+        큰 이미지 리스트를 메모리에 모두 올리지 않도록 나누어 OCR
+
+        Yields:
+            (입력 인덱스, {full_text, details})
+        """
+        images = list(images)
+        step = self.batch_size * self.workers
+        for start in range(0, len(images), step):
+            chunk_results = self.recognize(images[start:start + step])
+            for offset, result in enumerate(chunk_results):
+                yield start + offset, result
+
+    def close(self):
+        """워커 프로세스 종료"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
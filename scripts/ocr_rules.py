@@ -0,0 +1,222 @@
+"""
+OCR 교정 규칙 로더
+
+교정 규칙과 수동 재작성 텍스트를 data/ocr_rules 아래 JSON 파일에서 읽는다.
+
+    data/ocr_rules/common.json            공통 치환 규칙
+    data/ocr_rules/{year}.json            연도별 규칙 (선택)
+    data/ocr_rules/{year}/{project}.json  프로젝트별 규칙 + 페이지 재작성 텍스트 (선택)
+
+뒤 단계의 같은 키는 앞 단계의 값을 덮어쓴다 (적용 순서는 처음 등장한 위치 유지).
+파일이 바뀌면 다음 조회 때 다시 읽어 컴파일한다.
+"""
+import hashlib
+import json
+import re
+from pathlib import Path
+
+RULES_DIR = Path(__file__).resolve().parent.parent / "data" / "ocr_rules"
+
+# 정리 과정(clean_text) 자체가 바뀌면 올려서 모든 페이지를 다시 정리
+CLEAN_VERSION = 1
+
+
+def _overlaps(a, b):
+    """두 문자열이 텍스트 안에서 겹쳐서 나타날 수 있는지 (포함 또는 접두/접미 공유)"""
+    if not a or not b:
+        return False
+    if a in b or b in a:
+        return True
+    return any(a.endswith(b[:i]) or b.endswith(a[:i]) for i in range(1, min(len(a), len(b))))
+
+
+def _char_step(group):
+    # 한국어 텍스트에서는 str.translate(문자마다 dict 조회)보다 문자 클래스 검색이 빠름
+    pattern = re.compile('[' + ''.join(re.escape(wrong) for wrong in group) + ']')
+    return lambda text: pattern.sub(lambda m: group[m.group(0)], text)
+
+
+def _string_step(group):
+    pattern = re.compile('|'.join(re.escape(wrong) for wrong in group))
+    return lambda text: pattern.sub(lambda m: group[m.group(0)], text)
+
+
+def compile_replacements(replacements):
+    """
+    순서 있는 치환 표를 단일 패스 치환 함수로 컴파일
+
+    한 글자 항목은 문자 클래스로, 여러 글자 항목은 정규식 alternation으로 묶어
+    묶음마다 텍스트를 한 번만 훑는다. 앞 항목의 치환 결과가 뒤 항목과 맞물릴 수
+    있으면(연쇄 치환, 겹치는 키, 삭제로 인해 붙는 문자열) 새 묶음으로 나누어
+    차례로 str.replace 한 것과 같은 결과를 보장한다.
+
+    Args:
+        replacements: {잘못된 문자열: 올바른 문자열} (순서대로 적용)
+
+    Returns:
+        텍스트를 받아 치환 결과를 반환하는 함수
+    """
+    steps = []
+    group = {}
+    group_kind = None
+
+    def flush():
+        if group:
+            make_step = _char_step if group_kind == 'char' else _string_step
+            steps.append(make_step(dict(group)))
+            group.clear()
+
+    for wrong, correct in replacements.items():
+        if wrong == correct:
+            continue
+
+        kind = 'char' if len(wrong) == 1 else 'string'
+        if kind == 'char':
+            # 앞 항목의 결과에 이 키가 들어 있으면 연쇄 치환이 일어남
+            conflict = any(wrong in value for value in group.values())
+        else:
+            conflict = any(
+                _overlaps(wrong, key) or _overlaps(wrong, value) or value == ''
+                for key, value in group.items()
+            )
+
+        if kind != group_kind or conflict:
+            flush()
+            group_kind = kind
+        group[wrong] = correct
+
+    flush()
+
+    keys = sorted((w for w, c in replacements.items() if w != c), key=len, reverse=True)
+    if not keys:
+        return lambda text: text
+    # 대부분의 텍스트에는 고칠 패턴이 없으므로 한 번 검색해 보고 없으면 바로 반환
+    any_key = re.compile('|'.join(re.escape(wrong) for wrong in keys))
+
+    def apply(text):
+        if any_key.search(text) is None:
+            return text
+        for step in steps:
+            text = step(text)
+        return text
+
+    return apply
+
+
+def _digest(obj):
+    return hashlib.sha256(json.dumps(obj, ensure_ascii=False).encode('utf-8')).hexdigest()[:16]
+
+
+def _read_layer(path):
+    """규칙 파일 하나 읽기 → (치환 쌍 리스트, 페이지 재작성 딕셔너리)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    pairs = list(data.get("replacements", []))
+    for group in data.get("groups", []):
+        pairs.extend(group.get("replacements", []))
+    return pairs, data.get("pages", {})
+
+
+# 치환 표가 같은 규칙 세트끼리 컴파일 결과를 공유
+_compiled = {}
+
+
+class RuleSet:
+    """
+    한 프로젝트에 적용되는 교정 규칙
+
+    Attributes:
+        replacements: {잘못된 문자열: 올바른 문자열} (적용 순서대로)
+        pages: {페이지 파일명: 재작성된 full_text}
+    """
+
+    def __init__(self, replacements, pages=None):
+        self.replacements = dict(replacements)
+        self.pages = dict(pages or {})
+
+        key = _digest(list(self.replacements.items()))
+        if key not in _compiled:
+            _compiled[key] = compile_replacements(self.replacements)
+        self.apply = _compiled[key]
+
+        # 치환 결과로 새로 생길 수 있는 문자 (페이지별 관련 규칙 판정에 사용)
+        self._value_chars = set(''.join(self.replacements.values()))
+        self._rule_chars = [(wrong, correct, set(wrong))
+                            for wrong, correct in self.replacements.items()]
+
+    def relevant_rules(self, texts):
+        """
+        텍스트들에 적용될 수 있는 규칙만 골라내기
+
+        키의 모든 문자가 원본 텍스트나 다른 규칙의 결과에 나타날 수 있어야
+        규칙이 적용될 수 있으므로, 그렇지 않은 규칙은 결과에 영향을 주지 않는다.
+        """
+        available = set(''.join(texts)) | self._value_chars
+        return [[wrong, correct] for wrong, correct, chars in self._rule_chars
+                if chars <= available]
+
+    def page_digest(self, page_name, texts):
+        """
+        페이지에 영향을 주는 규칙의 지문
+
+        관련 규칙이나 재작성 텍스트가 바뀐 페이지만 지문이 달라진다.
+        """
+        return _digest([CLEAN_VERSION, self.relevant_rules(texts), self.pages.get(page_name)])
+
+
+class RuleStore:
+    """
+    규칙 파일을 읽어 프로젝트별 RuleSet을 만들고, 파일이 바뀌면 다시 읽는 저장소
+
+    Args:
+        rules_dir: 규칙 디렉토리 (기본 data/ocr_rules)
+    """
+
+    def __init__(self, rules_dir=RULES_DIR):
+        self.rules_dir = Path(rules_dir)
+        self._cache = {}
+
+    def layer_paths(self, year=None, project_id=None):
+        """적용 순서대로 존재하는 규칙 파일 경로"""
+        paths = [self.rules_dir / "common.json"]
+        if year:
+            paths.append(self.rules_dir / f"{year}.json")
+            if project_id:
+                paths.append(self.rules_dir / str(year) / f"{project_id}.json")
+        return [path for path in paths if path.exists()]
+
+    def signature(self):
+        """규칙 디렉토리 전체의 (경로, 수정 시각) 목록 (변경 감지용)"""
+        return sorted((str(path), path.stat().st_mtime)
+                      for path in self.rules_dir.rglob("*.json"))
+
+    def get(self, year=None, project_id=None):
+        """프로젝트에 적용할 RuleSet (규칙 파일이 바뀌었으면 다시 읽음)"""
+        paths = self.layer_paths(year, project_id)
+        stamp = [(str(path), path.stat().st_mtime) for path in paths]
+
+        cached = self._cache.get((year, project_id))
+        if cached and cached[0] == stamp:
+            return cached[1]
+
+        replacements = {}
+        pages = {}
+        for path in paths:
+            pairs, layer_pages = _read_layer(path)
+            for wrong, correct in pairs:
+                replacements[wrong] = correct
+            pages.update(layer_pages)
+
+        rule_set = RuleSet(replacements, pages)
+        self._cache[(year, project_id)] = (stamp, rule_set)
+        return rule_set
+
+    def projects_with_pages(self):
+        """페이지 재작성 텍스트가 있는 (연도, 프로젝트 ID) 목록"""
+        result = []
+        for path in sorted(self.rules_dir.glob("*/*.json")):
+            _, pages = _read_layer(path)
+            if pages:
+                result.append((path.parent.name, path.stem))
+        return result
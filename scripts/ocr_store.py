@@ -0,0 +1,307 @@
+"""
+연도별 컬럼형 OCR 저장소
+
+프로젝트마다 들여쓰기된 ocr_text.json 대신, 한 연도의 모든 프로젝트를 하나의
+바이너리 파일(public/assets/projects/{year}/ocr_text.bin)에 컬럼 단위로 저장한다.
+
+    bbox        int16   (박스 수, 4, 2)
+    confidence  float64 (박스 수,)       JSON 값과 정확히 같게 (float32는 0.9를 바꿈)
+    box_text    int32   (박스 수,)       문자열 표 인덱스
+    page_text   int32   (페이지 수,)     full_text 문자열 표 인덱스
+    page_boxes  int64   (페이지 수 + 1,) 페이지별 박스 시작 위치
+    str_offsets int64   (문자열 수 + 1,) 문자열 표 (UTF-8, 중복 제거)
+    str_data    uint8
+
+파일 구조: b"OCRS" + 버전(u32) + 헤더 길이(u64) + 헤더 JSON + 8바이트 정렬된 배열들.
+배열은 mmap으로 바로 읽으므로 페이지를 요청할 때만 해당 부분이 디코딩된다.
+
+사용법 (변환):
+    python scripts/ocr_store.py            # ocr_text.json → ocr_text.bin
+    python scripts/ocr_store.py --backup   # ocr_text.backup.json → ocr_text.backup.bin
+"""
+import json
+import mmap
+import struct
+import sys
+from pathlib import Path
+
+MAGIC = b"OCRS"
+STORE_VERSION = 2
+_PREFIX = struct.Struct("<4sIQ")
+
+# 배열 이름 → NumPy dtype
+ARRAY_DTYPES = {
+    "bbox": "<i2",
+    "confidence": "<f8",
+    "box_text": "<i4",
+    "page_text": "<i4",
+    "page_boxes": "<i8",
+    "str_offsets": "<i8",
+    "str_data": "u1",
+}
+
+
+# 컬럼으로 저장되는 페이지 키 (나머지는 헤더의 page_meta에 보관)
+PAGE_COLUMNS = ("full_text", "details")
+
+
+def _align8(n):
+    return (n + 7) & ~7
+
+
+def store_path_for(json_path):
+    """ocr_text.json 경로에 대응하는 연도 저장소 경로 (예: 2023/ocr_text.bin)"""
+    json_path = Path(json_path)
+    return json_path.parent.parent / (json_path.stem + ".bin")
+
+
+def write_store(path, documents):
+    """
+    여러 프로젝트의 OCR 데이터를 하나의 컬럼형 파일로 저장
+
+    Args:
+        path: 저장할 .bin 경로
+        documents: [(프로젝트 ID, ocr_text.json 딕셔너리), ...]
+    """
+    import numpy as np
+
+    strings = {}
+
+    def intern(text):
+        if text not in strings:
+            strings[text] = len(strings)
+        return strings[text]
+
+    projects = []
+    page_text = []
+    page_boxes = [0]
+    bbox = []
+    confidence = []
+    box_text = []
+
+    for project_id, doc in documents:
+        results = doc.get("ocr_results", {})
+        projects.append({
+            "project_id": project_id,
+            "meta": {k: v for k, v in doc.items() if k != "ocr_results"},
+            "first_page": len(page_text),
+            "page_names": list(results),
+            # full_text/details 외의 페이지 키 (예: source)
+            "page_meta": {
+                name: extra for name, extra in (
+                    (name, {k: v for k, v in page.items() if k not in PAGE_COLUMNS})
+                    for name, page in results.items()
+                ) if extra
+            },
+        })
+        for page in results.values():
+            page_text.append(intern(page.get("full_text", "")))
+            for detail in page.get("details", []):
+                bbox.append(detail["bbox"])
+                confidence.append(detail.get("confidence", 1.0))
+                box_text.append(intern(detail.get("text", "")))
+            page_boxes.append(len(confidence))
+
+    bbox_array = np.array(bbox, dtype=np.int32).reshape(-1, 4, 2)
+    if bbox_array.size and (bbox_array.min() < -32768 or bbox_array.max() > 32767):
+        raise ValueError("bbox 좌표가 int16 범위를 벗어났습니다")
+
+    encoded = [text.encode("utf-8") for text in strings]
+    str_offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=str_offsets[1:])
+
+    arrays = {
+        "bbox": bbox_array,
+        "confidence": np.array(confidence),
+        "box_text": np.array(box_text),
+        "page_text": np.array(page_text),
+        "page_boxes": np.array(page_boxes),
+        "str_offsets": str_offsets,
+        "str_data": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+    }
+
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        arrays[name] = np.ascontiguousarray(array, dtype=ARRAY_DTYPES[name])
+        layout[name] = {"offset": offset, "shape": list(arrays[name].shape)}
+        offset = _align8(offset + arrays[name].nbytes)
+
+    header = json.dumps({"projects": projects, "arrays": layout},
+                        ensure_ascii=False).encode("utf-8")
+    data_start = _align8(_PREFIX.size + len(header))
+
+    tmp_path = Path(str(path) + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(_PREFIX.pack(MAGIC, STORE_VERSION, len(header)))
+        f.write(header)
+        for name, array in arrays.items():
+            f.seek(data_start + layout[name]["offset"])
+            f.write(array.tobytes())
+        # 끝에 있는 빈 배열도 파일 범위 안에 있도록 전체 크기를 맞춤
+        f.truncate(data_start + offset)
+    tmp_path.replace(path)
+
+
+class OCRStore:
+    """
+    연도별 OCR 저장소 읽기 (mmap)
+
+    Args:
+        path: ocr_text.bin 경로
+    """
+
+    def __init__(self, path):
+        import numpy as np
+
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, header_len = _PREFIX.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != STORE_VERSION:
+            self._mm.close()
+            raise ValueError(f"OCR 저장소 형식이 아닙니다: {self.path}")
+
+        header = json.loads(self._mm[_PREFIX.size:_PREFIX.size + header_len].decode("utf-8"))
+        data_start = _align8(_PREFIX.size + header_len)
+
+        self._arrays = {}
+        for name, info in header["arrays"].items():
+            dtype = np.dtype(ARRAY_DTYPES[name])
+            count = int(np.prod(info["shape"]))
+            self._arrays[name] = np.frombuffer(
+                self._mm, dtype=dtype, count=count, offset=data_start + info["offset"]
+            ).reshape(info["shape"])
+
+        self._projects = {p["project_id"]: p for p in header["projects"]}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def project_ids(self):
+        return list(self._projects)
+
+    def _string(self, index):
+        offsets = self._arrays["str_offsets"]
+        start, end = int(offsets[index]), int(offsets[index + 1])
+        return self._arrays["str_data"][start:end].tobytes().decode("utf-8")
+
+    def page_names(self, project_id):
+        return list(self._projects[project_id]["page_names"])
+
+    def _page_index(self, project_id, page_name):
+        project = self._projects[project_id]
+        return project["first_page"] + project["page_names"].index(page_name)
+
+    def full_text(self, project_id, page_name):
+        """페이지 full_text만 읽기 (박스는 디코딩하지 않음)"""
+        index = self._page_index(project_id, page_name)
+        return self._string(int(self._arrays["page_text"][index]))
+
+    def page(self, project_id, page_name):
+        """페이지 하나를 ocr_text.json 과 같은 {full_text, details} 형태로 읽기"""
+        index = self._page_index(project_id, page_name)
+        start, end = self._arrays["page_boxes"][index:index + 2]
+
+        details = [
+            {"text": self._string(text_index), "confidence": confidence, "bbox": bbox}
+            for text_index, confidence, bbox in zip(
+                self._arrays["box_text"][start:end].tolist(),
+                self._arrays["confidence"][start:end].tolist(),
+                self._arrays["bbox"][start:end].tolist(),
+            )
+        ]
+        return {
+            "full_text": self._string(int(self._arrays["page_text"][index])),
+            "details": details,
+            **self._projects[project_id].get("page_meta", {}).get(page_name, {})
+        }
+
+    def document(self, project_id):
+        """프로젝트 전체를 ocr_text.json 과 같은 딕셔너리로 읽기"""
+        project = self._projects[project_id]
+        return {
+            **project["meta"],
+            "ocr_results": {name: self.page(project_id, name) for name in project["page_names"]}
+        }
+
+    def close(self):
+        self._arrays = {}
+        self._mm.close()
+
+
+def load_ocr_data(json_path):
+    """
+    OCR 데이터 읽기 (모든 스크립트 공용)
+
+    같은 연도의 컬럼형 저장소가 있고 JSON보다 최신이면 저장소에서 읽고,
+    아니면 json_path(ocr_text.json 또는 ocr_text.backup.json)를 그대로 읽는다.
+    저장소 형식이 예전 버전이면 JSON을 읽는다 (export를 다시 실행하면 새 형식으로 저장).
+
+    Returns:
+        ocr_text.json 과 같은 구조의 딕셔너리 (어디에도 없으면 None)
+    """
+    json_path = Path(json_path)
+    store_path = store_path_for(json_path)
+    json_exists = json_path.exists()
+
+    if store_path.exists() and (not json_exists
+                                or store_path.stat().st_mtime >= json_path.stat().st_mtime):
+        try:
+            store = OCRStore(store_path)
+        except ValueError:
+            store = None
+        if store is not None:
+            with store:
+                project_id = json_path.parent.name
+                if project_id in store.project_ids:
+                    return store.document(project_id)
+
+    if not json_exists:
+        return None
+    with open(json_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def convert_year(year_dir, filename="ocr_text.json"):
+    """
+    연도 디렉토리의 프로젝트별 JSON을 하나의 저장소로 변환
+
+    Returns:
+        (저장소 경로, 원본 JSON 총 크기, 저장소 크기) 또는 변환할 파일이 없으면 None
+    """
+    year_dir = Path(year_dir)
+    json_paths = sorted(year_dir.glob(f"*/{filename}"))
+    if not json_paths:
+        return None
+
+    documents = []
+    for json_path in json_paths:
+        with open(json_path, "r", encoding="utf-8") as f:
+            documents.append((json_path.parent.name, json.load(f)))
+
+    store_path = store_path_for(json_paths[0])
+    write_store(store_path, documents)
+    json_size = sum(p.stat().st_size for p in json_paths)
+    return store_path, json_size, store_path.stat().st_size
+
+
+if __name__ == "__main__":
+    from catalog_config import load_config
+
+    config = load_config()
+    filename = "ocr_text.backup.json" if "--backup" in sys.argv else "ocr_text.json"
+    base_dir = Path(config["projects_dir"])
+
+    for year_dir in (base_dir / year for year in config["years"]):
+        if not year_dir.is_dir():
+            continue
+        converted = convert_year(year_dir, filename)
+        if converted:
+            store_path, json_size, store_size = converted
+            print(f"✓ {store_path}: {json_size / 1024:.0f}KB → {store_size / 1024:.0f}KB")
@@ -0,0 +1,208 @@
+"""
+페이지 지문 (PDF 개정판 사이의 페이지 단위 변경 감지)
+
+인쇄소에서 수정된 PDF가 오면 대부분의 페이지는 그대로이므로, 페이지를 렌더링하지 않고
+PDF 구조만 읽어서 페이지마다 지문을 만든다.
+
+    콘텐츠 스트림 (압축 해제한 그리기 명령)
+    삽입된 이미지 (이름, 크기, 원본 스트림 바이트의 해시)
+    폼 XObject (압축 해제한 스트림)
+    글꼴 (서브셋 접두어를 뺀 이름, 종류, 인코딩)
+    페이지 크기/회전, 주석
+
+xref 번호는 저장할 때마다 바뀔 수 있으므로 지문에 넣지 않는다. 글꼴 프로그램은 해시하지
+않는다: 서브셋 글꼴은 책 전체가 공유하므로 한 페이지에 글자가 추가되면 모든 페이지가
+바뀐 것으로 보이기 때문이다. 글자가 바뀌면 콘텐츠 스트림이 바뀌므로 감지된다.
+
+페이지 이미지 옆에 page_fingerprints.json으로 렌더링 설정과 함께 저장하고, 다음 실행에서
+지문과 설정이 같고 이미지가 남아 있는 페이지는 렌더링/인코딩을 건너뛴다.
+
+사용법:
+    python scripts/page_fingerprint.py old.pdf new.pdf   # 개정판 사이의 바뀐 페이지 출력
+"""
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+
+import fitz  # PyMuPDF
+
+from metrics import METRICS
+from pdf_render import page_filename
+
+FINGERPRINT_FILENAME = "page_fingerprints.json"
+
+# 페이지 이미지와 웹 이미지에 영향을 주는 BUILD_SETTINGS 키 (바뀌면 모든 페이지를 다시 렌더링)
+RENDER_SETTING_KEYS = ("dpi", "max_width", "quality", "single_pass", "web_formats", "web_widths",
+                       "dedupe")
+
+# 서브셋 글꼴 접두어 (예: "ABCDEF+NanumGothic")
+_SUBSET_PREFIX = re.compile(r'^[A-Z]{6}\+')
+
+
+def _stream_digest(doc, xref, memo, raw=True):
+    """xref 스트림 해시 (여러 페이지가 공유하는 이미지는 문서당 한 번만 읽음)"""
+    key = (xref, raw)
+    if key not in memo:
+        data = doc.xref_stream_raw(xref) if raw else doc.xref_stream(xref)
+        memo[key] = hashlib.sha256(data or b"").hexdigest()
+    return memo[key]
+
+
+def page_fingerprint(doc, page, memo=None):
+    """
+    렌더링 없이 계산한 페이지 지문 (SHA-256 16진수)
+
+    Args:
+        doc: fitz.Document
+        page: doc의 fitz.Page
+        memo: 문서 안에서 공유하는 {xref: 해시} 딕셔너리
+    """
+    memo = {} if memo is None else memo
+    digest = hashlib.sha256()
+    digest.update(repr((tuple(page.rect), page.rotation)).encode())
+    digest.update(page.read_contents())
+
+    for image in page.get_images(full=True):
+        xref, smask, width, height, bpc, colorspace, _, name = image[:8]
+        digest.update(repr((name, width, height, bpc, colorspace)).encode())
+        digest.update(_stream_digest(doc, xref, memo).encode())
+        if smask:
+            digest.update(_stream_digest(doc, smask, memo).encode())
+
+    for xref, name, _, bbox in page.get_xobjects():
+        digest.update(repr((name, tuple(bbox))).encode())
+        digest.update(_stream_digest(doc, xref, memo, raw=False).encode())
+
+    for _, _, font_type, basefont, name, encoding, *_ in page.get_fonts(full=True):
+        digest.update(repr((_SUBSET_PREFIX.sub("", basefont), font_type, name, encoding)).encode())
+
+    for annot in page.annots() or []:
+        digest.update(repr((annot.type[1], tuple(annot.rect), annot.info.get("content"))).encode())
+
+    return digest.hexdigest()
+
+
+def fingerprint_pages(pdf_path, page_numbers=None):
+    """
+    페이지별 지문
+
+    Args:
+        pdf_path: PDF 파일 경로
+        page_numbers: 1-based 페이지 번호 목록 (기본: 전체, 없는 페이지는 제외)
+
+    Returns:
+        {페이지 번호: 지문}
+    """
+    memo = {}
+    with fitz.open(pdf_path) as doc:
+        if page_numbers is None:
+            page_numbers = range(1, len(doc) + 1)
+        return {n: page_fingerprint(doc, doc[n - 1], memo)
+                for n in page_numbers if 1 <= n <= len(doc)}
+
+
+def index_settings(settings):
+    """지문 색인에 함께 기록하는 렌더링 설정"""
+    return {key: settings.get(key) for key in RENDER_SETTING_KEYS}
+
+
+def load_index(output_dir):
+    """page_fingerprints.json 읽기 → {"settings": {...}, "pages": {파일명: 지문}} (없으면 빈 값)"""
+    path = os.path.join(output_dir, FINGERPRINT_FILENAME)
+    if not os.path.exists(path):
+        return {"settings": None, "pages": {}}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_index(output_dir, fingerprints, settings):
+    """
+    페이지 지문 저장 (렌더링이 끝난 뒤에 호출)
+
+    Args:
+        output_dir: 페이지 이미지 디렉토리
+        fingerprints: {파일명: 지문}
+        settings: 페이지 이미지에 영향을 주는 설정 (바뀌면 모든 페이지를 다시 렌더링)
+    """
+    path = os.path.join(output_dir, FINGERPRINT_FILENAME)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"settings": settings, "pages": fingerprints}, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+
+def unchanged_pages(pdf_path, page_numbers, output_dir, settings):
+    """
+    이전 렌더링 결과를 그대로 쓸 수 있는 페이지 찾기
+
+    Args:
+        pdf_path: PDF 파일 경로
+        page_numbers: 확인할 1-based 페이지 번호 목록
+        output_dir: 페이지 이미지와 page_fingerprints.json이 있는 디렉토리
+        settings: 렌더링/인코딩 설정 (이전 기록과 다르면 모든 페이지가 바뀐 것으로 봄)
+
+    Returns:
+        ({파일명: 새 지문}, 지문이 같고 이미지가 남아 있는 페이지 번호 집합)
+    """
+    with METRICS.stage("fingerprint", pages=len(page_numbers)):
+        current = {page_filename(n): digest
+                   for n, digest in fingerprint_pages(pdf_path, page_numbers).items()}
+
+    index = load_index(output_dir)
+    if index.get("settings") != settings:
+        return current, set()
+
+    previous = index.get("pages", {})
+    same = set()
+    for n in page_numbers:
+        filename = page_filename(n)
+        if (filename in current and previous.get(filename) == current[filename]
+                and os.path.exists(os.path.join(output_dir, filename))):
+            same.add(n)
+    return current, same
+
+
+def diff_pdfs(old_path, new_path):
+    """
+    두 개정판의 페이지별 지문 비교
+
+    Returns:
+        (바뀐 페이지 번호 리스트, 새 판에만 있는 페이지, 옛 판에만 있는 페이지)
+    """
+    old = fingerprint_pages(old_path)
+    new = fingerprint_pages(new_path)
+    changed = [n for n in sorted(new) if n in old and old[n] != new[n]]
+    added = sorted(set(new) - set(old))
+    removed = sorted(set(old) - set(new))
+    return changed, added, removed
+
+
+def main():
+    if len(sys.argv) < 3:
+        print("사용법: python scripts/page_fingerprint.py old.pdf new.pdf")
+        return 1
+
+    start = time.perf_counter()
+    changed, added, removed = diff_pdfs(sys.argv[1], sys.argv[2])
+    elapsed = time.perf_counter() - start
+
+    print(f"바뀐 페이지: {len(changed)}개 ({elapsed:.2f}초)")
+    if changed:
+        print("  " + ", ".join(str(n) for n in changed))
+    if added:
+        print(f"추가된 페이지: {', '.join(str(n) for n in added)}")
+    if removed:
+        print(f"없어진 페이지: {', '.join(str(n) for n in removed)}")
+    return 0
+
+
+if __name__ == "__main__":
+    # UTF-8 인코딩 강제 설정 (Windows cp949 문제 해결)
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+    sys.stderr.reconfigure(encoding='utf-8', errors='replace')
+
+    sys.exit(main())
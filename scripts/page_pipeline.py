@@ -0,0 +1,641 @@
+"""
+페이지 단위 스트리밍 파이프라인 (체크포인트 + 이어서 처리)
+
+렌더링 → 웹 인코딩 → 텍스트 레이어/OCR 단계를 제너레이터로 잇고, 단계 사이에는
+크기가 정해진 큐를 두어 앞 단계가 너무 앞서 나가지 않게 한다. 페이지가 끝날
+때마다 결과를 체크포인트(ocr_text.partial.jsonl)에 한 줄씩 추가하므로, 중간에
+중단되어도 다시 실행하면 마지막으로 끝난 페이지 다음부터 이어서 처리한다.
+새 PDF 개정판에서 페이지 지문(page_fingerprint)이 같은 페이지는 렌더링/인코딩을 건너뛴다.
+다른 페이지와 같은 이미지(image_hash)인 페이지는 인코딩과 OCR 없이 원본 페이지의 결과를 쓴다.
+
+    {"checkpoint": 2, "settings": "<설정 지문>"}          첫 줄 (설정/PDF/페이지 범위가 바뀌면 새로 시작)
+    {"page": "page_003.png", "result": {...}, "variants": {...}, "fingerprint": "<페이지 지문>"}
+"""
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack
+from functools import partial
+from itertools import chain
+
+import fitz  # PyMuPDF
+
+from build_manifest import file_sha256
+from image_encode import (VARIANTS_FILENAME, _encode_file, dedupe_pages, encode_space,
+                          index_variants, shared_variants, stale_duplicates, supported_formats)
+from metrics import METRICS
+from ocr_engine import combine_results, offset_result
+from ocr_store import load_ocr_data
+from page_fingerprint import index_settings, save_index, unchanged_pages
+from pdf_render import (_init_worker, _render_chunk, page_filename, render_memory_budget,
+                        render_page)
+from pdf_text import merge_results, ocr_regions, page_number, plan_page
+
+CHECKPOINT_FILENAME = "ocr_text.partial.jsonl"
+CHECKPOINT_VERSION = 2
+
+# 단계 사이 큐 크기 (렌더링/인코딩이 OCR보다 이만큼까지만 앞서 나감)
+QUEUE_SIZE = 4
+
+# 단계별 동시 실행 수 (렌더링: 프로세스, 인코딩: 스레드). 1이면 스레드 하나에서 순서대로
+# MuPDF 렌더링은 GIL을 잡고 있으므로 프로세스로, PIL 인코딩/리사이즈는 GIL을 놓으므로 스레드로 돌린다.
+STAGE_WORKERS = {
+    "render": max(1, (os.cpu_count() or 1) // 2),
+    "encode": 2
+}
+
+_DONE = object()
+
+
+def duplicate_pages(output_dir, variants):
+    """
+    사이드카 항목에서 중복 페이지 찾기
+
+    Args:
+        variants: {파일명: 사이드카 항목} (image_variants.json 형식)
+
+    Returns:
+        {파일명: 원본 페이지 경로}
+    """
+    return {filename: os.path.normpath(os.path.join(output_dir, info["same_as"]))
+            for filename, info in variants.items() if info and info.get("same_as")}
+
+
+def _saved_result(canonical, memo):
+    # 원본 페이지가 속한 프로젝트의 추출 직후 결과 (프로젝트마다 한 번만 읽음)
+    # 정리(fix_ocr_texts)된 ocr_text.json이면 추출 직후 원본은 ocr_text.backup.json에 있음.
+    # 중복 페이지는 자기 프로젝트의 규칙으로 다시 정리되므로 정리 전 결과를 복사한다
+    project_dir = os.path.dirname(canonical)
+    if project_dir not in memo:
+        data = load_ocr_data(os.path.join(project_dir, "ocr_text.json"))
+        if data is not None and data.get("applied_rules") is not None:
+            data = load_ocr_data(os.path.join(project_dir, "ocr_text.backup.json"))
+        memo[project_dir] = (data or {}).get("ocr_results", {})
+    return memo[project_dir].get(os.path.basename(canonical))
+
+
+def duplicate_results(output_dir, variants):
+    """
+    중복 페이지가 복사해 올 원본 OCR 결과의 지문 (빌드 입력용)
+
+    정리/재작성 전 결과로 계산하므로, 원본 프로젝트가 다시 추출될 때만 바뀌고
+    원본 프로젝트의 clean/rewrite로는 바뀌지 않는다.
+
+    Returns:
+        {파일명: 결과 SHA-256 (원본 결과가 없으면 None)}
+    """
+    memo = {}
+    digests = {}
+    for filename, canonical in sorted(duplicate_pages(output_dir, variants).items()):
+        result = _saved_result(canonical, memo)
+        digests[filename] = None if result is None else hashlib.sha256(
+            json.dumps(result, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+    return digests
+
+
+def recognize_pages(ocr_engine, image_paths, plans, settings, duplicates=None, known=None):
+    """
+    페이지들의 텍스트 추출 (텍스트 레이어 페이지는 그대로, 나머지는 OCR)
+
+    Args:
+        ocr_engine: BatchOCREngine
+        image_paths: 페이지 PNG 경로 리스트
+        plans: {파일명: plan_page() 결과} (비어 있으면 모든 페이지를 전체 OCR)
+        settings: BUILD_SETTINGS 형식의 설정
+        duplicates: {파일명: 원본 페이지 경로} (duplicate_pages() 결과). OCR이 필요한
+            중복 페이지는 원본 페이지의 결과를 복사한다 (원본 결과를 찾지 못하면 OCR)
+        known: 원본 결과를 먼저 찾아볼 {페이지 경로: 결과} (예: 체크포인트)
+
+    Returns:
+        {파일명: {full_text, details[, source]}} (입력 순서)
+    """
+    duplicates = duplicates or {}
+    known = known or {}
+    memo = {}
+    # 같은 호출 안에서 결과가 나올 원본 페이지 (중복 페이지가 아닌 페이지)
+    originals = {os.path.normpath(p) for p in image_paths
+                 if os.path.basename(p) not in duplicates}
+
+    results = {}
+    copied = {}
+    ocr_paths = []
+    for img_path in image_paths:
+        filename = os.path.basename(img_path)
+        plan = plans.get(filename)
+        canonical = duplicates.get(filename)
+        if plan and plan['mode'] == 'text':
+            results[filename] = {**plan['native'], "source": "text"}
+            METRICS.count("pages_text_layer")
+            METRICS.progress(f"  ✓ {filename}: {len(plan['native']['full_text'])}자 (텍스트 레이어)")
+        elif canonical and (canonical in originals or canonical in known
+                            or _saved_result(canonical, memo)):
+            copied[filename] = canonical
+        else:
+            ocr_paths.append(img_path)
+    if plans:
+        METRICS.progress(f"  - 텍스트 레이어 사용: {len(image_paths) - len(ocr_paths) - len(copied)}"
+                         f"페이지, OCR 필요: {len(ocr_paths)}페이지"
+                         + (f", 중복 페이지: {len(copied)}페이지" if copied else ""))
+
+    # OCR 작업 목록: (파일명, 이미지 또는 (이미지, 픽셀 영역), 영역 왼쪽 위 좌표)
+    # 이미지 블록 위치를 알면 페이지 전체 대신 이미지 블록만 잘라서 OCR
+    jobs = []
+    page_pixels = region_pixels = 0
+    for img_path in ocr_paths:
+        filename = os.path.basename(img_path)
+        plan = plans.get(filename)
+        regions = None
+        if plan and settings.get('ocr_regions'):
+            regions = ocr_regions(plan['image_boxes'], plan['scale'], plan['image_size'])
+            # 텍스트 레이어가 거의 없는데 이미지 블록도 없으면 (윤곽선 글자 등) 페이지 전체 OCR
+            if plan['mode'] == 'ocr' and not regions:
+                regions = None
+
+        if regions is None:
+            jobs.append((filename, img_path, (0, 0)))
+        else:
+            jobs.extend((filename, (img_path, box), box[:2]) for box in regions)
+            width, height = plan['image_size']
+            page_pixels += width * height
+            region_pixels += sum((x1 - x0) * (y1 - y0) for x0, y0, x1, y1 in regions)
+
+    if page_pixels:
+        METRICS.progress(f"  - 영역 OCR: 페이지 픽셀의 {region_pixels / page_pixels:.0%}만 처리")
+    METRICS.count("ocr_inputs", len(jobs))
+
+    page_parts = {os.path.basename(p): [] for p in ocr_paths}
+    if jobs:
+        with METRICS.stage("ocr", pages=len(ocr_paths), regions=len(jobs)):
+            for index, region_data in ocr_engine.iter_recognize([job[1] for job in jobs]):
+                filename, _, (dx, dy) = jobs[index]
+                page_parts[filename].append(offset_result(region_data, dx, dy) if dx or dy
+                                            else region_data)
+
+    for filename, parts in page_parts.items():
+        text_data = parts[0] if len(parts) == 1 else combine_results(parts)
+        plan = plans.get(filename)
+        if plan and plan['mode'] == 'hybrid':
+            text_data = {**merge_results(plan['native'], text_data), "source": "hybrid"}
+        elif plan:
+            text_data = {**text_data, "source": "ocr"}
+        results[filename] = text_data
+
+        METRICS.count("pages_ocr")
+        METRICS.count("boxes_detected", len(text_data['details']))
+        METRICS.progress(f"  ✓ {filename}: {len(text_data['full_text'])}자 추출")
+
+    # 다른 페이지와 같은 이미지인 페이지는 원본 페이지의 결과를 복사
+    for filename, canonical in copied.items():
+        if canonical in originals:
+            result = results[os.path.basename(canonical)]
+        else:
+            result = known.get(canonical) or _saved_result(canonical, memo)
+        results[filename] = {**result, "source": "duplicate"}
+        METRICS.count("pages_duplicate")
+        METRICS.progress(f"  ✓ {filename}: 중복 페이지, OCR 생략 "
+                         f"(= {os.path.relpath(duplicates[filename])})")
+
+    return {os.path.basename(p): results[os.path.basename(p)] for p in image_paths}
+
+
+def threaded(iterable, maxsize=QUEUE_SIZE):
+    """
+    제너레이터를 백그라운드 스레드에서 돌리고 크기가 정해진 큐로 받아오기
+
+    큐가 차면 생산자가 기다리므로 (역압) 앞 단계가 maxsize개 이상 앞서지 않는다.
+    생산자 쪽 예외는 소비자 쪽에서 다시 발생한다. 제너레이터를 여러 번 감싸서
+    단계를 이어 붙일 수 있다.
+    """
+    items = queue.Queue(maxsize)
+    stop = threading.Event()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+            put((_DONE, None))
+        except BaseException as exc:
+            put((_DONE, exc))
+        finally:
+            # 소비자가 먼저 멈췄으면 앞 단계(제너레이터)도 이 스레드에서 정리
+            close = getattr(iterable, 'close', None)
+            if close is not None:
+                close()
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, exc = items.get()
+            if item is _DONE:
+                if exc is not None:
+                    raise exc
+                return
+            yield item
+    finally:
+        stop.set()
+
+
+def pipelined_map(func, iterable, executor, limit):
+    """
+    executor에서 func를 병렬로 실행하되 입력 순서대로 결과 내보내기
+
+    동시에 제출된 작업은 limit개를 넘지 않으므로, 다음 단계가 결과를 가져가지
+    않으면 더 제출하지 않는다 (역압).
+    """
+    pending = deque()
+    try:
+        for item in iterable:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= limit:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def batched(iterable, size):
+    """size개씩 묶어서 리스트로 (마지막 묶음은 더 작을 수 있음)"""
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def settings_digest(settings, ocr_settings=None, pdf_digest=None, page_range=None):
+    """
+    체크포인트를 재사용해도 되는지 판단하는 지문
+
+    Args:
+        settings: BUILD_SETTINGS 형식의 설정
+        ocr_settings: OCR 엔진 설정
+        pdf_digest: 원본 PDF의 SHA-256 (수정된 PDF로 다시 실행하면 처음부터)
+        page_range: (시작, 끝) (매핑의 페이지 범위가 바뀌면 처음부터)
+    """
+    data = json.dumps([settings, ocr_settings, pdf_digest, list(page_range or ())],
+                      sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()[:16]
+
+
+class Checkpoint:
+    """
+    페이지별 결과를 한 줄씩 추가하는 체크포인트 파일
+
+    Args:
+        path: 체크포인트 경로
+        digest: settings_digest() 값 (기존 파일과 다르면 처음부터 다시 시작)
+    """
+
+    def __init__(self, path, digest):
+        self.path = path
+        self.digest = digest
+        self.pages = {}
+        self._file = None
+
+        if os.path.exists(path):
+            self._load()
+
+    def _load(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            lines = f.read().split('\n')
+
+        try:
+            header = json.loads(lines[0])
+        except (json.JSONDecodeError, IndexError):
+            header = {}
+        if header.get("checkpoint") != CHECKPOINT_VERSION or header.get("settings") != self.digest:
+            METRICS.progress("  - 설정이나 PDF가 바뀌어 체크포인트를 버리고 처음부터 처리")
+            os.remove(self.path)
+            return
+
+        for line in lines[1:]:
+            # 마지막 줄은 쓰는 도중 중단되어 잘렸을 수 있음
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                break
+            self.pages[entry["page"]] = entry
+
+        # 잘린 줄 뒤에 이어 쓰지 않도록 온전한 줄만 남김
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(lines[0] + '\n')
+            for entry in self.pages.values():
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+    def done(self, filename, output_dir, fingerprint=None):
+        """
+        이미 끝난 페이지인지 (이미지 파일도 남아 있어야 함)
+
+        fingerprint를 주면 기록된 페이지 지문도 같아야 한다. 다르면 그 페이지의 기록을
+        버린다 (옛 개정판으로 렌더링/OCR한 결과).
+        """
+        entry = self.pages.get(filename)
+        if entry is None or not os.path.exists(os.path.join(output_dir, filename)):
+            return False
+        if fingerprint is not None and entry.get("fingerprint") != fingerprint:
+            del self.pages[filename]
+            return False
+        return True
+
+    def append(self, filename, result, variants=None, fingerprint=None):
+        """페이지 결과 추가 (디스크에 바로 반영)"""
+        if self._file is None:
+            new_file = not os.path.exists(self.path)
+            self._file = open(self.path, 'a', encoding='utf-8')
+            if new_file:
+                self._file.write(json.dumps({"checkpoint": CHECKPOINT_VERSION,
+                                             "settings": self.digest}) + '\n')
+
+        entry = {"page": filename, "result": result, "variants": variants,
+                 "fingerprint": fingerprint}
+        self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.pages[filename] = entry
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def remove(self):
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def render_options(settings):
+    """
+    렌더링 단계 옵션 (extract_pages_as_images와 같은 기준)
+
+    Returns:
+        (렌더링 너비, 렌더링 후 optimize_image에 넘길 (max_width, quality) 또는 None).
+        단일 패스면 목표 너비로 바로 렌더링하고, 아니면 DPI 그대로 렌더링한 뒤 줄인다.
+    """
+    if settings.get('single_pass'):
+        return settings['max_width'], None
+    return None, (settings['max_width'], settings['quality'])
+
+
+def _optimize(filepath, optimize):
+    if optimize:
+        from extract_pdf_content import optimize_image
+
+        optimize_image(filepath, max_width=optimize[0], quality=optimize[1])
+
+
+def render_stream(pdf_path, page_numbers, output_dir, settings):
+    """
+    렌더링 단계: 페이지를 하나씩 PNG로 렌더링하며 경로를 내보냄
+
+    단일 패스 설정이면 목표 너비로 한 번에 렌더링하고, 아니면 렌더링 후 바로 줄인다.
+    """
+    max_width, optimize = render_options(settings)
+    with fitz.open(pdf_path) as doc:
+        for page_num in page_numbers:
+            filepath = os.path.join(output_dir, page_filename(page_num))
+            with METRICS.stage("render", page=page_num):
+                render_page(doc[page_num - 1], filepath, dpi=settings['dpi'],
+                            max_width=max_width, memory_budget=render_memory_budget(settings))
+                _optimize(filepath, optimize)
+            METRICS.count("bytes_written", os.path.getsize(filepath))
+            yield filepath
+
+
+def encode_stream(image_paths, settings, hash_index=None):
+    """웹 인코딩 단계: (경로, 변형 정보) 내보냄 (웹 포맷이 없으면 변형 정보는 None)"""
+    formats = supported_formats(settings.get('web_formats') or [])
+    for image_path in image_paths:
+        yield _encode_one(image_path, formats, settings, hash_index)
+
+
+def _render_one(page_num, output_dir, dpi, max_width, memory_budget=None, optimize=None):
+    # 워커 프로세스에서 잰 시간을 돌려주어 부모 프로세스의 METRICS에 기록
+    start = time.perf_counter()
+    filepath = _render_chunk(page_num, page_num, output_dir, dpi, max_width,
+                             memory_budget)[0][1]
+    _optimize(filepath, optimize)
+    return page_num, filepath, time.perf_counter() - start
+
+
+def _recorded_renders(results):
+    for page_num, filepath, seconds in results:
+        METRICS.record("render", seconds, page=page_num)
+        METRICS.count("bytes_written", os.path.getsize(filepath))
+        yield filepath
+
+
+def _encode_one(image_path, formats, settings, hash_index=None):
+    variants = None
+    if formats and hash_index is not None:
+        space = encode_space(formats, settings['web_widths'], settings['quality'])
+        canonical = dedupe_pages([image_path], hash_index, space).get(image_path)
+        if canonical:
+            variants = shared_variants(hash_index, canonical, os.path.dirname(image_path))
+            METRICS.progress(f"  ✓ 중복 페이지: {os.path.basename(image_path)} = "
+                             f"{variants['same_as']}")
+            return image_path, variants
+    if formats:
+        with METRICS.stage("encode", page=os.path.basename(image_path)):
+            variants = _encode_file(image_path, formats, settings['web_widths'],
+                                    settings['quality'])
+        METRICS.count("bytes_written", sum(v["bytes"] for v in variants["variants"]))
+        if hash_index is not None:
+            hash_index.set_variants(image_path, index_variants(variants, image_path))
+    return image_path, variants
+
+
+def schedule_stages(stack, pdf_path, page_numbers, output_dir, settings, workers=None,
+                    hash_index=None, backlog=QUEUE_SIZE):
+    """
+    렌더링/인코딩 단계를 단계별 풀에서 겹쳐 실행하는 스트림 만들기
+
+    렌더링은 문서 핸들을 가진 프로세스 풀, 인코딩은 스레드 풀에서 실행하고,
+    단계마다 동시 실행 수(STAGE_WORKERS)와 큐 크기로 역압을 건다. OCR은 받는 쪽에서
+    BatchOCREngine의 Reader 프로세스 풀로 실행하므로, 전체 시간은 세 단계의 합이 아니라
+    가장 느린 단계에 가까워진다.
+
+    Args:
+        stack: 풀 정리를 맡길 ExitStack
+        workers: {"render": n, "encode": n} (기본 STAGE_WORKERS)
+        hash_index: image_hash.HashIndex (있으면 중복 페이지는 인코딩하지 않음)
+        backlog: 인코딩이 끝나 다음 단계를 기다릴 수 있는 페이지 수. OCR 한 배치만큼
+            잡으면 OCR이 배치를 처리하는 동안에도 다음 배치를 렌더링/인코딩한다
+
+    Returns:
+        (이미지 경로, 변형 정보) 제너레이터
+    """
+    workers = {**STAGE_WORKERS, **(workers or {})}
+
+    if workers["render"] > 1 and len(page_numbers) > 1:
+        render_pool = stack.enter_context(ProcessPoolExecutor(
+            max_workers=workers["render"], initializer=_init_worker, initargs=(pdf_path,)))
+        max_width, optimize = render_options(settings)
+        render = partial(_render_one, output_dir=output_dir, dpi=settings['dpi'],
+                         max_width=max_width, memory_budget=render_memory_budget(settings),
+                         optimize=optimize)
+        rendered = threaded(_recorded_renders(
+            pipelined_map(render, page_numbers, render_pool, workers["render"] * 2)))
+    else:
+        rendered = threaded(render_stream(pdf_path, page_numbers, output_dir, settings))
+
+    if workers["encode"] > 1:
+        encode_pool = stack.enter_context(ThreadPoolExecutor(max_workers=workers["encode"]))
+        encode = partial(_encode_one, formats=supported_formats(settings.get('web_formats') or []),
+                         settings=settings, hash_index=hash_index)
+        encoded = threaded(pipelined_map(encode, rendered, encode_pool, workers["encode"] * 2),
+                           backlog)
+    else:
+        encoded = threaded(encode_stream(rendered, settings, hash_index), backlog)
+
+    # 풀을 닫기 전에 스트림을 멈춤 (앞 단계는 각 스레드가 차례로 정리)
+    stack.callback(encoded.close)
+    return encoded
+
+
+def stream_pages(pdf_path, page_range, output_dir, ocr_engine, settings, workers=None,
+                 hash_index=None):
+    """
+    페이지 범위를 스트리밍으로 처리하며 체크포인트에 기록
+
+    Args:
+        pdf_path: PDF 파일 경로
+        page_range: (시작, 끝) 1-based, 끝 포함
+        output_dir: 출력 디렉토리
+        ocr_engine: BatchOCREngine (batch_size × workers 페이지씩 모아서 OCR)
+        settings: BUILD_SETTINGS 형식의 설정
+        workers: 단계별 동시 실행 수 (schedule_stages 참고)
+        hash_index: image_hash.HashIndex (있으면 중복 페이지는 인코딩/OCR 생략)
+
+    Returns:
+        (체크포인트, 처리 대상 페이지 파일명 리스트)
+    """
+    with fitz.open(pdf_path) as doc:
+        last_page = min(page_range[1], len(doc))
+    if last_page < page_range[1]:
+        print(f"  경고: 페이지 {last_page + 1}부터는 존재하지 않습니다.")
+
+    page_numbers = list(range(page_range[0], last_page + 1))
+    checkpoint = Checkpoint(os.path.join(output_dir, CHECKPOINT_FILENAME),
+                            settings_digest(settings, ocr_engine.settings,
+                                            file_sha256(pdf_path), page_range))
+
+    # 지문이 같은 페이지는 렌더링/인코딩 없이 기존 이미지와 웹 이미지를 그대로 텍스트 단계로
+    # 넘긴다 (픽셀이 같으므로 OCR은 OCR 캐시에서 바로 나옴)
+    render_settings = index_settings(settings)
+    fingerprints, same = unchanged_pages(pdf_path, page_numbers, output_dir, render_settings)
+
+    # 체크포인트에 기록된 페이지도 지문이 바뀌었으면 다시 처리
+    todo = [n for n in page_numbers
+            if not checkpoint.done(page_filename(n), output_dir, fingerprints.get(page_filename(n)))]
+    if len(todo) < len(page_numbers):
+        METRICS.progress(f"  - 체크포인트에서 이어서 처리: "
+                         f"{len(page_numbers) - len(todo)}페이지 완료됨")
+    previous_variants = {}
+    if settings.get('web_formats'):
+        sidecar_path = os.path.join(output_dir, VARIANTS_FILENAME)
+        if os.path.exists(sidecar_path):
+            with open(sidecar_path, 'r', encoding='utf-8') as f:
+                previous_variants = json.load(f)
+        same = {n for n in same if page_filename(n) in previous_variants}
+        if hash_index is not None:
+            stale = stale_duplicates(output_dir, previous_variants, hash_index)
+            same = {n for n in same if page_filename(n) not in stale}
+    reused = [(os.path.join(output_dir, page_filename(n)), previous_variants.get(page_filename(n)))
+              for n in todo if n in same]
+    if reused:
+        METRICS.progress(f"  - 바뀌지 않은 페이지 {len(reused)}개는 렌더링/인코딩 생략")
+
+    # OCR 워커가 여러 개면 워커마다 한 배치씩 돌아가도록 묶음 크기를 키움
+    ocr_batch = ocr_engine.batch_size * getattr(ocr_engine, 'workers', 1)
+
+    try:
+        with ExitStack() as stack, fitz.open(pdf_path) as doc:
+            encoded = schedule_stages(stack, pdf_path, [n for n in todo if n not in same],
+                                      output_dir, settings, workers, hash_index,
+                                      backlog=ocr_batch)
+            for batch in batched(chain(reused, encoded), ocr_batch):
+                image_paths = [image_path for image_path, _ in batch]
+                plans = {}
+                if settings.get('text_layer'):
+                    for p in image_paths:
+                        with METRICS.stage("text", page=os.path.basename(p)):
+                            plans[os.path.basename(p)] = plan_page(
+                                doc[page_number(p) - 1], p,
+                                settings['min_text_chars'], settings['min_text_coverage'])
+                known = {os.path.normpath(os.path.join(output_dir, filename)): page["result"]
+                         for filename, page in checkpoint.pages.items()}
+                duplicates = duplicate_pages(output_dir, {os.path.basename(p): variants
+                                                          for p, variants in batch})
+                results = recognize_pages(ocr_engine, image_paths, plans, settings,
+                                          duplicates, known)
+                for image_path, variants in batch:
+                    filename = os.path.basename(image_path)
+                    checkpoint.append(filename, results[filename], variants,
+                                      fingerprints.get(filename))
+    finally:
+        checkpoint.close()
+
+    # 모든 페이지가 끝난 뒤에만 지문 기록 (중간에 중단되면 다음 실행에서 다시 비교).
+    # 이번 지문으로 렌더링했거나 그대로 쓴 페이지만 기록
+    save_index(output_dir, {filename: digest for filename, digest in fingerprints.items()
+                            if checkpoint.pages.get(filename, {}).get("fingerprint") == digest},
+               render_settings)
+    return checkpoint, [page_filename(n) for n in page_numbers]
+
+
+def finalize(checkpoint, filenames, output_dir, metadata, settings):
+    """
+    체크포인트를 최종 출력(ocr_text.json, image_variants.json)으로 정리하고 삭제
+
+    Returns:
+        생성된 출력 파일 경로 리스트 (페이지 이미지 + 웹 이미지 + 사이드카 + ocr_text.json)
+    """
+    outputs = [os.path.join(output_dir, filename) for filename in filenames]
+
+    sidecar = {}
+    for filename in filenames:
+        variants = checkpoint.pages[filename]["variants"]
+        if variants:
+            sidecar[filename] = variants
+            outputs.extend(os.path.normpath(os.path.join(output_dir, v["path"]))
+                           for v in variants["variants"])
+    if settings.get('web_formats') and sidecar:
+        sidecar_path = os.path.join(output_dir, VARIANTS_FILENAME)
+        with open(sidecar_path, 'w', encoding='utf-8') as f:
+            json.dump(sidecar, f, ensure_ascii=False, indent=2)
+        outputs.append(sidecar_path)
+
+    json_path = os.path.join(output_dir, "ocr_text.json")
+    tmp_path = json_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            **metadata,
+            "ocr_results": {filename: checkpoint.pages[filename]["result"] for filename in filenames}
+        }, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, json_path)
+    outputs.append(json_path)
+
+    checkpoint.remove()
+    return outputs
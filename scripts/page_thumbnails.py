@@ -0,0 +1,158 @@
+"""
+저해상도 페이지 썸네일 캐시 (책 전체 빠른 분석용)
+
+책의 모든 페이지를 24~36 DPI로 렌더링해 하나의 NumPy 배열(페이지 × H × W × 3)로
+.cache/thumbnails 아래 .npy 파일에 저장한다. 다음부터는 PDF를 열지 않고 memmap으로
+바로 읽으므로 레이아웃 분석, 작품 경계 감지, 밀착 인화(contact sheet)를 몇 초 안에
+반복할 수 있다.
+
+페이지 크기가 서로 다르면 가장 큰 페이지 크기에 맞춰 왼쪽 위에 놓고 나머지는
+흰색으로 채운다. 페이지별 실제 썸네일 크기는 같은 이름의 .json 사이드카에 기록한다.
+
+사용법:
+    python scripts/page_thumbnails.py           # 매핑 파일의 PDF 썸네일 생성
+    python scripts/page_thumbnails.py --sheet   # 밀착 인화 PNG도 생성
+"""
+import hashlib
+import json
+import os
+import sys
+
+import fitz  # PyMuPDF
+import numpy as np
+
+THUMB_DPI = 30
+THUMB_DIR = ".cache/thumbnails"
+
+
+def thumbnail_cache_path(pdf_path, dpi=THUMB_DPI, cache_dir=THUMB_DIR):
+    """
+    썸네일 배열 경로 (PDF 크기/수정 시각이 바뀌면 다른 파일이 됨)
+
+    예: .cache/thumbnails/2024_Artbook_HQ-30dpi-1a2b3c4d.npy
+    """
+    stat = os.stat(pdf_path)
+    stamp = f"{os.path.abspath(pdf_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+    digest = hashlib.sha256(stamp.encode("utf-8")).hexdigest()[:8]
+    stem = os.path.splitext(os.path.basename(pdf_path))[0]
+    return os.path.join(cache_dir, f"{stem}-{dpi}dpi-{digest}.npy")
+
+
+def render_thumbnails(pdf_path, output_path, dpi=THUMB_DPI):
+    """
+    모든 페이지를 저해상도로 렌더링해 .npy memmap으로 저장
+
+    Returns:
+        페이지별 (너비, 높이) 리스트
+    """
+    zoom = dpi / 72
+    with fitz.open(pdf_path) as doc:
+        # 배열 크기를 먼저 정하기 위해 렌더링 없이 페이지 크기만 계산
+        sizes = [(fitz.Rect(page.rect) * fitz.Matrix(zoom, zoom)).irect for page in doc]
+        sizes = [(rect.width, rect.height) for rect in sizes]
+        width = max(w for w, _ in sizes)
+        height = max(h for _, h in sizes)
+
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        tmp_path = output_path + ".tmp.npy"
+        array = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.uint8,
+                                          shape=(len(doc), height, width, 3))
+        array[:] = 255
+
+        for index, page in enumerate(doc):
+            pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), colorspace=fitz.csRGB,
+                                  alpha=False)
+            pixels = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.stride)
+            pixels = pixels[:, :pix.width * 3].reshape(pix.height, pix.width, 3)
+            h, w = min(pix.height, height), min(pix.width, width)
+            array[index, :h, :w] = pixels[:h, :w]
+            sizes[index] = (w, h)
+
+        array.flush()
+        del array
+
+    with open(os.path.splitext(output_path)[0] + ".json", "w", encoding="utf-8") as f:
+        json.dump({"pdf": pdf_path, "dpi": dpi, "sizes": sizes}, f)
+    os.replace(tmp_path, output_path)
+    return sizes
+
+
+def load_thumbnails(pdf_path, dpi=THUMB_DPI, cache_dir=THUMB_DIR):
+    """
+    썸네일 배열 읽기 (캐시가 없거나 PDF가 바뀌었으면 새로 만듦)
+
+    Returns:
+        (읽기 전용 memmap (페이지, H, W, 3), 페이지별 (너비, 높이) 리스트)
+    """
+    path = thumbnail_cache_path(pdf_path, dpi, cache_dir)
+    sidecar = os.path.splitext(path)[0] + ".json"
+
+    if os.path.exists(path) and os.path.exists(sidecar):
+        with open(sidecar, "r", encoding="utf-8") as f:
+            sizes = [tuple(size) for size in json.load(f)["sizes"]]
+    else:
+        sizes = render_thumbnails(pdf_path, path, dpi)
+
+    return np.load(path, mmap_mode="r"), sizes
+
+
+def page_pixels(thumbnails, sizes, index):
+    """패딩을 뺀 페이지 하나의 썸네일 (H, W, 3)"""
+    width, height = sizes[index]
+    return thumbnails[index, :height, :width]
+
+
+def contact_sheet(thumbnails, output_path, columns=10, gap=4):
+    """
+    모든 썸네일을 격자로 배치한 밀착 인화 PNG 저장
+
+    Args:
+        thumbnails: (페이지, H, W, 3) 배열
+        output_path: 저장할 PNG 경로
+        columns: 한 줄의 페이지 수
+        gap: 페이지 사이 간격 (픽셀)
+    """
+    from PIL import Image
+
+    count, height, width, _ = thumbnails.shape
+    rows = (count + columns - 1) // columns
+    sheet = np.full((rows * (height + gap) + gap, columns * (width + gap) + gap, 3), 64,
+                    dtype=np.uint8)
+    for index in range(count):
+        row, col = divmod(index, columns)
+        y = gap + row * (height + gap)
+        x = gap + col * (width + gap)
+        sheet[y:y + height, x:x + width] = thumbnails[index]
+
+    Image.fromarray(sheet).save(output_path, optimize=True)
+    return output_path
+
+
+def main():
+    from parse_mapping import parse_artbook_mapping
+
+    mapping = parse_artbook_mapping("data/artbook_mapping.md")
+    pdf_paths = [projects[0]["pdf"] for projects in mapping.values() if projects]
+
+    for pdf_path in pdf_paths:
+        if not os.path.exists(pdf_path):
+            print(f"  경고: PDF 파일이 없습니다: {pdf_path}")
+            continue
+
+        thumbnails, sizes = load_thumbnails(pdf_path)
+        path = thumbnail_cache_path(pdf_path)
+        print(f"✓ {pdf_path}: {thumbnails.shape[0]}페이지 {thumbnails.shape[2]}x{thumbnails.shape[1]} "
+              f"({os.path.getsize(path) / 1024 / 1024:.1f}MB) → {path}")
+
+        if "--sheet" in sys.argv:
+            sheet_path = os.path.splitext(path)[0] + "-sheet.png"
+            contact_sheet(thumbnails, sheet_path)
+            print(f"  ✓ 밀착 인화: {sheet_path}")
+
+
+if __name__ == "__main__":
+    # UTF-8 인코딩 강제 설정 (Windows cp949 문제 해결)
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+    sys.stderr.reconfigure(encoding='utf-8', errors='replace')
+
+    main()
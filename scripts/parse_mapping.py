@@ -4,10 +4,14 @@ artbook_mapping.md를 파싱하여 프로젝트별 페이지 범위를 추출하
 import re
 from typing import Dict, List, Tuple
 
-def parse_artbook_mapping(mapping_file: str) -> Dict[str, List[Dict]]:
+def parse_artbook_mapping(mapping_file: str, assets_dir: str = "assets") -> Dict[str, List[Dict]]:
     """
     artbook_mapping.md 파일을 파싱하여 프로젝트 정보를 반환
 
+    Args:
+        mapping_file: 매핑 파일 경로
+        assets_dir: PDF 파일이 있는 폴더 (catalog_config의 assets_dir)
+
     Returns:
         {
             "2023": [
@@ -39,7 +43,7 @@ def parse_artbook_mapping(mapping_file: str) -> Dict[str, List[Dict]]:
         if year_match:
             current_year = year_match.group(1)
             pdf_filename = year_match.group(2)
-            current_pdf = f"assets/{pdf_filename}"
+            current_pdf = f"{assets_dir}/{pdf_filename}"
             if current_year not in result:
                 result[current_year] = []
             continue
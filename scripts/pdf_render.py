@@ -0,0 +1,194 @@
+"""
+PDF 페이지 렌더링 헬퍼 (프로세스 풀 병렬 렌더링)
+
+워커 프로세스가 이 모듈만 import 하도록 fitz, PIL(+ 계측용 metrics) 이외의 무거운 의존성은 두지 않는다.
+페이지 Pixmap이 메모리 상한을 넘는 고해상도 렌더링만 tiled_render(NumPy)로 넘긴다.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import fitz  # PyMuPDF
+from PIL import Image
+
+from metrics import METRICS
+
+# 워커 프로세스마다 한 번만 여는 문서 핸들
+_worker_doc = None
+
+
+def page_filename(page_num):
+    """1-based 페이지 번호를 출력 파일명(page_001.png)으로 변환"""
+    return f"page_{page_num:03d}.png"
+
+
+def target_matrix(page_rect, dpi, max_width=None):
+    """
+    렌더링 행렬 계산
+
+    DPI 기준 너비가 max_width를 넘으면 렌더링 후 축소하는 대신
+    처음부터 max_width 너비로 렌더링하도록 줌을 낮춘다.
+    """
+    zoom = dpi / 72
+    if max_width and page_rect.width * zoom > max_width:
+        zoom = max_width / page_rect.width
+    return fitz.Matrix(zoom, zoom)
+
+
+def render_memory_budget(settings):
+    """BUILD_SETTINGS의 render_memory_mb → 바이트 (없으면 None = 제한 없음)"""
+    megabytes = settings.get('render_memory_mb')
+    return megabytes * 1024 * 1024 if megabytes else None
+
+
+def pixmap_to_image(pix):
+    """
+    Pixmap 샘플을 복사 없이 PIL 이미지로 감싸기
+
+    반환된 이미지는 pix의 메모리를 공유하므로 pix가 살아 있는 동안만 사용해야 한다.
+    """
+    mode = "RGBA" if pix.alpha else "RGB"
+    # samples_mv는 복사 없는 memoryview (구버전 PyMuPDF는 samples로 대체)
+    samples = getattr(pix, "samples_mv", None) or pix.samples
+    return Image.frombuffer(mode, (pix.width, pix.height), samples, "raw", mode, pix.stride, 1)
+
+
+def render_page(page, filepath, dpi=200, max_width=None, memory_budget=None):
+    """
+    페이지 하나를 렌더링하여 PNG로 저장
+
+    Args:
+        page: fitz.Page
+        filepath: 저장 경로
+        dpi: 해상도 (기본 200)
+        max_width: 최종 너비 상한. 지정하면 목표 크기로 바로 렌더링하고
+            PIL로 한 번만 인코딩한다 (optimize_image 단계가 필요 없음)
+        memory_budget: 페이지 전체 Pixmap이 이 바이트를 넘으면 타일 단위로 렌더링
+            (tiled_render, 워커 프로세스마다 이 정도만 사용)
+    """
+    matrix = target_matrix(page.rect, dpi, max_width)
+    if memory_budget and (page.rect * matrix).irect.get_area() * 3 > memory_budget:
+        from tiled_render import render_page_tiled
+
+        with METRICS.stage("render_tiled", page=page.number + 1):
+            render_page_tiled(page, filepath, memory_budget=memory_budget, matrix=matrix)
+        return
+
+    if not max_width:
+        page.get_pixmap(matrix=matrix).save(filepath)
+        return
+
+    pix = page.get_pixmap(matrix=matrix, alpha=False)
+    pixmap_to_image(pix).save(filepath, 'PNG', optimize=True)
+
+
+def split_page_range(start_page, end_page, chunks):
+    """
+    페이지 범위를 연속된 구간으로 균등 분할
+
+    Args:
+        start_page: 시작 페이지 (1-based)
+        end_page: 끝 페이지 (1-based, inclusive)
+        chunks: 나눌 구간 수
+
+    Returns:
+        [(start, end), ...] 형태의 구간 리스트 (1-based, inclusive)
+    """
+    total = end_page - start_page + 1
+    if total <= 0:
+        return []
+
+    chunks = max(1, min(chunks, total))
+    size, extra = divmod(total, chunks)
+
+    ranges = []
+    current = start_page
+    for i in range(chunks):
+        count = size + (1 if i < extra else 0)
+        ranges.append((current, current + count - 1))
+        current += count
+    return ranges
+
+
+def contiguous_runs(page_numbers):
+    """
+    페이지 번호들을 연속 구간으로 묶기
+
+    예: [3, 4, 5, 9, 11, 12] → [(3, 5), (9, 9), (11, 12)]
+    """
+    runs = []
+    for n in sorted(set(page_numbers)):
+        if runs and runs[-1][1] == n - 1:
+            runs[-1] = (runs[-1][0], n)
+        else:
+            runs.append((n, n))
+    return runs
+
+
+def _init_worker(pdf_path):
+    """워커 프로세스 초기화: 프로세스 전용 fitz.Document 핸들 열기"""
+    global _worker_doc
+    _worker_doc = fitz.open(pdf_path)
+
+
+def _render_chunk(start_page, end_page, output_dir, dpi, max_width, memory_budget=None):
+    """워커에서 페이지 구간 하나를 렌더링하여 (페이지 번호, 경로) 리스트 반환"""
+    rendered = []
+    for page_num in range(start_page, end_page + 1):
+        filepath = os.path.join(output_dir, page_filename(page_num))
+        render_page(_worker_doc[page_num - 1], filepath, dpi=dpi, max_width=max_width,
+                    memory_budget=memory_budget)
+        rendered.append((page_num, filepath))
+    return rendered
+
+
+def render_pages_parallel(pdf_path, start_page, end_page, output_dir, dpi=200, workers=None,
+                          max_width=None, memory_budget=None):
+    """
+    페이지 범위를 여러 구간으로 나누어 프로세스 풀에서 병렬 렌더링
+
+    각 워커는 자신만의 fitz.Document 핸들을 유지하며, 출력 파일명은
+    워커 배정과 무관하게 페이지 번호로 결정된다.
+
+    Args:
+        pdf_path: PDF 파일 경로
+        start_page: 시작 페이지 (1-based)
+        end_page: 끝 페이지 (1-based, inclusive)
+        output_dir: 저장할 디렉토리
+        dpi: 해상도 (기본 200)
+        workers: 워커 프로세스 수 (기본: CPU 코어 수)
+        max_width: 지정하면 이 너비로 바로 렌더링 (render_page 참고)
+        memory_budget: 워커별 페이지 렌더링 메모리 상한 (바이트, render_page 참고).
+            최대 사용량은 대략 workers × memory_budget
+
+    Returns:
+        페이지 순서대로 정렬된 이미지 파일 경로 리스트
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    with fitz.open(pdf_path) as doc:
+        page_count = len(doc)
+    if end_page > page_count:
+        print(f"  경고: 페이지 {page_count + 1}부터는 존재하지 않습니다.")
+        end_page = page_count
+
+    workers = workers or os.cpu_count() or 1
+    # 페이지마다 렌더링 비용이 달라 워커 수보다 잘게 나누어 부하를 분산
+    chunks = split_page_range(start_page, end_page, workers * 4)
+    if not chunks:
+        return []
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks)),
+                             initializer=_init_worker,
+                             initargs=(pdf_path,)) as pool:
+        futures = [
+            pool.submit(_render_chunk, start, end, output_dir, dpi, max_width, memory_budget)
+            for start, end in chunks
+        ]
+        for future in as_completed(futures):
+            for page_num, filepath in future.result():
+                results[page_num] = filepath
+                METRICS.count("bytes_written", os.path.getsize(filepath))
+                METRICS.progress(f"  ✓ 페이지 {page_num} 추출 완료: {os.path.basename(filepath)}")
+
+    return [results[page_num] for page_num in sorted(results)]
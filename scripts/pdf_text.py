@@ -0,0 +1,226 @@
+"""
+PDF 텍스트 레이어 추출 (텍스트 레이어 우선 + 필요한 페이지만 OCR)
+
+많은 아트북 페이지는 page.get_text()로 실제 텍스트가 나오므로, 렌더링된 이미지를
+OCR하기 전에 텍스트 레이어를 먼저 읽고 페이지마다 OCR이 필요한지 판단한다.
+
+    text    텍스트 레이어만 사용
+    hybrid  텍스트 레이어 + 이미지 영역 OCR (텍스트 레이어와 겹치는 OCR 박스는 제외)
+    ocr     텍스트가 없거나 거의 없는 페이지 (전체 OCR)
+"""
+import os
+
+import fitz  # PyMuPDF
+from PIL import Image
+
+# 이미지 블록을 제외한 dict 추출 플래그 (이미지 바이너리를 읽지 않음)
+TEXT_FLAGS = fitz.TEXT_PRESERVE_LIGATURES | fitz.TEXT_PRESERVE_WHITESPACE | fitz.TEXT_MEDIABOX_CLIP
+
+
+def _rect_area(bbox):
+    x0, y0, x1, y1 = bbox
+    return max(0.0, x1 - x0) * max(0.0, y1 - y0)
+
+
+def page_layout(page):
+    """
+    페이지의 텍스트 줄과 이미지 영역 (PDF 좌표)
+
+    Returns:
+        (lines, image_boxes)
+        lines: [{"text": str, "bbox": (x0, y0, x1, y1), "size": 최대 폰트 크기}, ...]
+        image_boxes: [(x0, y0, x1, y1), ...]
+    """
+    lines = []
+    for block in page.get_text("dict", flags=TEXT_FLAGS)["blocks"]:
+        if block.get("type") != 0:
+            continue
+        for line in block.get("lines", []):
+            spans = line.get("spans", [])
+            text = "".join(span.get("text", "") for span in spans).strip()
+            if text:
+                lines.append({
+                    "text": text,
+                    "bbox": tuple(line["bbox"]),
+                    "size": max(span.get("size", 0) for span in spans)
+                })
+
+    page_rect = page.rect
+    image_boxes = []
+    for info in page.get_image_info():
+        rect = fitz.Rect(info["bbox"]) & page_rect
+        if not rect.is_empty:
+            image_boxes.append(tuple(rect))
+
+    return lines, image_boxes
+
+
+def classify_page(lines, image_boxes, min_chars=20, min_coverage=0.5):
+    """
+    페이지 처리 방식 결정
+
+    텍스트 커버리지 = 텍스트 줄 면적 / (텍스트 줄 면적 + 이미지 면적)
+
+    Args:
+        lines, image_boxes: page_layout()의 반환값
+        min_chars: 이보다 글자가 적으면 텍스트 레이어를 믿지 않고 전체 OCR
+        min_coverage: 커버리지가 이보다 낮으면 이미지 영역도 OCR
+
+    Returns:
+        "text", "hybrid", "ocr" 중 하나
+    """
+    chars = sum(len(line["text"]) for line in lines)
+    if chars < min_chars:
+        return "ocr"
+
+    text_area = sum(_rect_area(line["bbox"]) for line in lines)
+    image_area = sum(_rect_area(box) for box in image_boxes)
+    if image_area and text_area / (text_area + image_area) < min_coverage:
+        return "hybrid"
+    return "text"
+
+
+def _quad(bbox, scale):
+    """(x0, y0, x1, y1) PDF 좌표 → 이미지 픽셀 좌표의 네 점 bbox (EasyOCR 형식)"""
+    x0, y0, x1, y1 = (int(round(v * scale)) for v in bbox)
+    return [[x0, y0], [x1, y0], [x1, y1], [x0, y1]]
+
+
+def native_text_result(lines, scale):
+    """텍스트 줄을 OCR 결과와 같은 {full_text, details} 형식으로 변환"""
+    return {
+        "full_text": "\n".join(line["text"] for line in lines),
+        "details": [
+            {"text": line["text"], "confidence": 1.0, "bbox": _quad(line["bbox"], scale)}
+            for line in lines
+        ]
+    }
+
+
+def _center_inside(quad, boxes):
+    xs = [p[0] for p in quad]
+    ys = [p[1] for p in quad]
+    cx, cy = sum(xs) / len(xs), sum(ys) / len(ys)
+    return any(b[0][0] <= cx <= b[2][0] and b[0][1] <= cy <= b[2][1] for b in boxes)
+
+
+def merge_results(native, ocr):
+    """
+    텍스트 레이어 결과와 OCR 결과 합치기
+
+    텍스트 레이어와 겹치는 OCR 박스(같은 글자를 다시 읽은 것)는 버리고,
+    남은 박스를 위→아래, 왼쪽→오른쪽 순서로 정렬한다.
+    """
+    native_boxes = [d["bbox"] for d in native["details"]]
+    extra = [d for d in ocr["details"] if not _center_inside(d["bbox"], native_boxes)]
+
+    details = sorted(native["details"] + extra, key=lambda d: (d["bbox"][0][1], d["bbox"][0][0]))
+    return {
+        "full_text": "\n".join(d["text"] for d in details),
+        "details": details
+    }
+
+
+def _merge_boxes(boxes):
+    """겹치는 사각형을 합쳐서 서로 겹치지 않는 사각형 리스트로 만들기"""
+    boxes = [list(box) for box in boxes]
+    merged = True
+    while merged:
+        merged = False
+        result = []
+        for box in boxes:
+            for other in result:
+                if box[0] < other[2] and other[0] < box[2] and box[1] < other[3] and other[1] < box[3]:
+                    other[:] = [min(box[0], other[0]), min(box[1], other[1]),
+                                max(box[2], other[2]), max(box[3], other[3])]
+                    merged = True
+                    break
+            else:
+                result.append(box)
+        boxes = result
+    return [tuple(box) for box in boxes]
+
+
+def ocr_regions(image_boxes, scale, image_size, padding=8, min_side=24, max_coverage=0.8):
+    """
+    OCR할 픽셀 영역 계산 (페이지 전체 대신 이미지 블록만 OCR)
+
+    이미지 블록의 PDF 좌표를 렌더링된 픽셀 좌표로 바꾸고, 글자가 잘리지 않도록
+    여백을 더한 뒤 겹치는 영역을 합친다. 글자가 들어갈 수 없을 만큼 작은 영역은 버린다.
+
+    Args:
+        image_boxes: 이미지 영역 (PDF 좌표)
+        scale: PDF 좌표 → 픽셀 배율
+        image_size: 렌더링된 이미지 (너비, 높이)
+        padding: 영역 주변 여백 (픽셀)
+        min_side: 이보다 짧은 변이 있는 영역은 제외 (픽셀)
+        max_coverage: 영역 합이 페이지의 이 비율을 넘으면 None (페이지 전체 OCR이 나음)
+
+    Returns:
+        [(x0, y0, x1, y1), ...] 픽셀 영역 리스트, 또는 페이지 전체를 OCR해야 하면 None
+    """
+    width, height = image_size
+    boxes = []
+    for x0, y0, x1, y1 in image_boxes:
+        box = (max(0, int(x0 * scale) - padding), max(0, int(y0 * scale) - padding),
+               min(width, int(x1 * scale + 0.5) + padding), min(height, int(y1 * scale + 0.5) + padding))
+        if box[2] - box[0] >= min_side and box[3] - box[1] >= min_side:
+            boxes.append(box)
+
+    boxes = _merge_boxes(boxes)
+    if sum(_rect_area(box) for box in boxes) > max_coverage * width * height:
+        return None
+    return boxes
+
+
+def plan_page(page, image_path, min_chars=20, min_coverage=0.5):
+    """
+    페이지 하나의 텍스트 레이어를 읽고 OCR 필요 여부 결정
+
+    Args:
+        page: fitz.Page
+        image_path: 렌더링된 페이지 이미지 경로 (픽셀 좌표 변환용)
+        min_chars, min_coverage: classify_page() 참고
+
+    Returns:
+        {"mode": str, "native": {full_text, details}, "image_boxes": [...],
+         "scale": float, "image_size": (너비, 높이)}
+    """
+    # 헤더만 읽어서 렌더링된 이미지 크기 확인 → PDF 좌표를 픽셀 좌표로 변환
+    with Image.open(image_path) as img:
+        image_size = img.size
+    scale = image_size[0] / page.rect.width
+
+    lines, image_boxes = page_layout(page)
+    return {
+        "mode": classify_page(lines, image_boxes, min_chars, min_coverage),
+        "native": native_text_result(lines, scale),
+        "image_boxes": image_boxes,
+        "scale": scale,
+        "image_size": image_size
+    }
+
+
+def page_number(image_path):
+    """page_XXX.png 경로 → 1-based 페이지 번호"""
+    return int(os.path.basename(image_path).replace('page_', '').replace('.png', ''))
+
+
+def plan_text_extraction(pdf_path, image_paths, min_chars=20, min_coverage=0.5):
+    """
+    렌더링된 페이지마다 텍스트 레이어를 읽고 OCR 필요 여부 결정
+
+    Args:
+        pdf_path: PDF 파일 경로
+        image_paths: page_XXX.png 경로 리스트 (파일명의 번호가 1-based 페이지 번호)
+        min_chars, min_coverage: classify_page() 참고
+
+    Returns:
+        {파일명: plan_page() 결과}
+    """
+    with fitz.open(pdf_path) as doc:
+        return {
+            os.path.basename(image_path): plan_page(doc[page_number(image_path) - 1], image_path,
+                                                    min_chars, min_coverage)
+            for image_path in image_paths
+        }
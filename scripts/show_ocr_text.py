@@ -3,23 +3,23 @@ OCR 텍스트 확인 스크립트
 """
 import sys
 import io
-import json
 from pathlib import Path
 
 # UTF-8 인코딩 강제 설정
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
 
+from ocr_store import load_ocr_data
+
 def show_project_text(project_path):
     """프로젝트의 OCR 텍스트 표시"""
     json_path = project_path / "ocr_text.backup.json"
 
-    if not json_path.exists():
+    # JSON 또는 연도별 컬럼형 저장소(ocr_text.backup.bin)에서 읽기
+    data = load_ocr_data(json_path)
+    if data is None:
         print(f"파일 없음: {json_path}")
         return
 
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
     print(f"\n{'='*80}")
     print(f"프로젝트: {data['title']}")
     print(f"연도: {data['year']}")
@@ -35,6 +35,8 @@ def show_project_text(project_path):
         print()
 
 if __name__ == "__main__":
+    from catalog_config import load_config, project_dir
+
     # 첫 번째 프로젝트 표시
-    project_path = Path("public/assets/projects/2023/snowcchio")
+    project_path = Path(project_dir(load_config(), "2023", "snowcchio"))
     show_project_text(project_path)
@@ -0,0 +1,260 @@
+"""
+타일 단위 렌더링 (메모리 상한을 지키는 고해상도 페이지 렌더링)
+
+인쇄 해상도(600 DPI 이상)에서 HQ 아트북의 펼침면은 페이지 하나의 Pixmap만 수백 MB가
+되므로, 페이지 전체를 한 번에 렌더링하지 않고 클립 사각형으로 고정 크기 타일을 렌더링한다.
+가로 한 줄의 타일을 띠(band) 버퍼에 모은 뒤 바로 PNG 인코더(zlib 스트림)로 흘려보내므로,
+페이지 크기와 상관없이 메모리는 띠 하나 + 타일 하나 정도만 쓴다.
+
+    페이지 → DisplayList (한 번만 해석)
+           → 띠마다: 타일 렌더링(clip) → 띠 Pixmap에 복사 → PNG 필터(NumPy) → zlib → IDAT
+
+띠 높이는 메모리 상한(memory_budget)에서 계산한다. MuPDF가 디코딩한 원본 이미지 캐시는
+페이지 해상도가 아니라 원본 이미지 크기에 비례하며, 페이지마다 비운다.
+
+사용법:
+    python scripts/tiled_render.py book.pdf 12 --dpi 600
+    python scripts/tiled_render.py book.pdf 12-15 --dpi 1200 --budget-mb 64 -o exports/
+"""
+import os
+import struct
+import sys
+import time
+import zlib
+
+import fitz  # PyMuPDF
+import numpy as np
+
+from metrics import METRICS
+
+# 타일 한 변 (픽셀)
+TILE_SIZE = 512
+
+# 기본 메모리 상한 (띠 버퍼 + 필터 작업 배열 + 타일)
+DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024
+
+# 띠 한 줄당 메모리: 띠 Pixmap + Sub/Up 필터 결과 + 필터 점수 계산용 배열 + 출력 행
+BAND_COPIES = 6
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# IDAT 청크 크기 (zlib 출력을 모았다가 이 크기마다 씀)
+IDAT_CHUNK = 1024 * 1024
+
+
+def band_height(width, memory_budget, tile_size=TILE_SIZE, channels=3):
+    """
+    메모리 상한 안에서 쓸 수 있는 띠 높이 (타일 높이와 같음)
+
+    Raises:
+        MemoryError: 한 줄짜리 띠도 상한을 넘는 경우
+    """
+    tile_row = (tile_size + 2) * channels
+    row_bytes = width * channels * BAND_COPIES + tile_row
+    height = (memory_budget - tile_row * 2) // row_bytes
+    if height < 1:
+        raise MemoryError(f"메모리 상한 {memory_budget / 1024 / 1024:.0f}MB로는 "
+                          f"너비 {width}px 페이지를 렌더링할 수 없습니다")
+    return min(height, tile_size)
+
+
+class PngWriter:
+    """
+    한 번에 여러 줄씩 받아 쓰는 PNG 인코더 (8비트 RGB)
+
+    줄마다 Sub/Up 필터 중 차이가 작은 쪽을 고른다 (PIL의 적응형 필터와 비슷한 기준).
+
+    Args:
+        path: 저장 경로
+        width, height: 이미지 크기
+        level: zlib 압축 수준
+    """
+
+    def __init__(self, path, width, height, level=6):
+        self.width = width
+        self.height = height
+        self.rows_written = 0
+        self._bpp = 3
+        self._previous = np.zeros(width * self._bpp, dtype=np.uint8)
+        self._compressor = zlib.compressobj(level)
+        self._pending = []
+        self._pending_size = 0
+        self._file = open(path, "wb")
+        self._file.write(PNG_SIGNATURE)
+        # 8비트, 색 형식 2(RGB), 압축 0, 필터 0, 인터레이스 없음
+        self._chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+
+    def _chunk(self, kind, data):
+        self._file.write(struct.pack(">I", len(data)))
+        self._file.write(kind)
+        self._file.write(data)
+        self._file.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(kind)) & 0xffffffff))
+
+    def _flush_idat(self, force=False):
+        if self._pending_size >= IDAT_CHUNK or (force and self._pending_size):
+            self._chunk(b"IDAT", b"".join(self._pending))
+            self._pending = []
+            self._pending_size = 0
+
+    def write_rows(self, rows):
+        """
+        줄 추가
+
+        Args:
+            rows: (줄 수, width * 3) uint8 배열
+        """
+        bpp = self._bpp
+        # uint8 뺄셈은 256으로 나눈 나머지가 되므로 PNG 필터 정의와 같음
+        sub = rows.copy()
+        sub[:, bpp:] -= rows[:, :-bpp]
+        up = np.empty_like(rows)
+        up[0] = rows[0] - self._previous
+        up[1:] = rows[1:] - rows[:-1]
+
+        # 필터 점수: 부호 있는 차이의 절댓값 합 (min(v, 256 - v))
+        def score(filtered):
+            return np.minimum(filtered, -filtered).sum(axis=1, dtype=np.uint64)
+
+        use_up = score(up) < score(sub)
+        filtered = np.where(use_up[:, None], up, sub)
+        del sub, up
+
+        out = np.empty((len(rows), rows.shape[1] + 1), dtype=np.uint8)
+        out[:, 0] = np.where(use_up, 2, 1)
+        out[:, 1:] = filtered
+        data = self._compressor.compress(out.tobytes())
+        if data:
+            self._pending.append(data)
+            self._pending_size += len(data)
+            self._flush_idat()
+
+        self._previous = rows[-1].copy()
+        self.rows_written += len(rows)
+
+    def close(self):
+        if self._file is None:
+            return
+        if self.rows_written != self.height:
+            self._file.close()
+            self._file = None
+            raise ValueError(f"PNG 줄 수 불일치: {self.rows_written}/{self.height}")
+        self._pending.append(self._compressor.flush())
+        self._pending_size += len(self._pending[-1])
+        self._flush_idat(force=True)
+        self._chunk(b"IEND", b"")
+        self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        elif self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def iter_bands(page, matrix, memory_budget=DEFAULT_MEMORY_BUDGET, tile_size=TILE_SIZE):
+    """
+    페이지를 위에서부터 띠 단위로 렌더링
+
+    띠마다 가로로 tile_size 폭의 타일을 클립 렌더링해 띠 Pixmap에 복사한다.
+    타일은 경계 반올림 오차를 피하려고 1픽셀씩 넓게 렌더링한 뒤 정확한 영역만 복사한다.
+
+    Yields:
+        (띠 왼쪽 위 y, (높이, width * 3) uint8 배열). 배열은 다음 띠를 렌더링하기 전까지만 유효
+    """
+    full = (page.rect * matrix).irect
+    height = band_height(full.width, memory_budget, tile_size)
+    inverse = ~matrix
+    display_list = page.get_displaylist()
+
+    for y0 in range(full.y0, full.y1, height):
+        y1 = min(y0 + height, full.y1)
+        band = fitz.Pixmap(fitz.csRGB, fitz.IRect(full.x0, y0, full.x1, y1), False)
+        band.clear_with(255)
+        for x0 in range(full.x0, full.x1, tile_size):
+            tile_rect = fitz.IRect(x0, y0, min(x0 + tile_size, full.x1), y1)
+            clip = fitz.Rect(tile_rect.x0 - 1, tile_rect.y0 - 1,
+                             tile_rect.x1 + 1, tile_rect.y1 + 1) * inverse
+            tile = display_list.get_pixmap(matrix=matrix, clip=clip, alpha=False)
+            band.copy(tile, tile_rect)
+            del tile
+        rows = np.frombuffer(band.samples_mv, dtype=np.uint8)
+        rows = rows.reshape(y1 - y0, band.stride)[:, :full.width * 3]
+        yield y0, rows
+        del rows, band
+
+
+def render_page_tiled(page, filepath, dpi=600, memory_budget=DEFAULT_MEMORY_BUDGET,
+                      tile_size=TILE_SIZE, matrix=None):
+    """
+    페이지 하나를 타일 단위로 렌더링하여 PNG로 저장 (메모리 상한 유지)
+
+    Args:
+        page: fitz.Page
+        filepath: 저장 경로
+        dpi: 해상도 (matrix를 주면 무시)
+        memory_budget: 띠 버퍼/필터/타일에 쓸 최대 바이트
+        tile_size: 타일 한 변 (픽셀)
+        matrix: 렌더링 행렬 (pdf_render.target_matrix 결과 등)
+
+    Returns:
+        (너비, 높이)
+    """
+    matrix = matrix or fitz.Matrix(dpi / 72, dpi / 72)
+    full = (page.rect * matrix).irect
+    with PngWriter(filepath, full.width, full.height) as writer:
+        for _, rows in iter_bands(page, matrix, memory_budget, tile_size):
+            writer.write_rows(rows)
+            METRICS.count("tiles_rendered", -(-full.width // tile_size))
+
+    # 디코딩해 둔 원본 이미지 캐시를 비워 다음 페이지까지 들고 가지 않음
+    fitz.TOOLS.store_shrink(100)
+    return full.width, full.height
+
+
+def parse_pages(spec):
+    """'12' 또는 '12-15' → [12, 13, 14, 15]"""
+    start, _, end = spec.partition("-")
+    return list(range(int(start), int(end or start) + 1))
+
+
+def main():
+    import argparse
+
+    from pdf_render import page_filename
+
+    parser = argparse.ArgumentParser(description="인쇄 해상도 페이지 렌더링 (타일 단위, 메모리 상한)")
+    parser.add_argument("pdf", help="PDF 파일 경로")
+    parser.add_argument("pages", help="페이지 번호 또는 범위 (예: 12, 12-15)")
+    parser.add_argument("--dpi", type=int, default=600)
+    parser.add_argument("--budget-mb", type=int, default=DEFAULT_MEMORY_BUDGET // 1024 // 1024,
+                        help="페이지 하나를 렌더링할 때 쓸 최대 메모리 (MB)")
+    parser.add_argument("--tile", type=int, default=TILE_SIZE, help="타일 한 변 (픽셀)")
+    parser.add_argument("-o", "--output-dir", default=".")
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    with fitz.open(args.pdf) as doc:
+        for page_num in parse_pages(args.pages):
+            filepath = os.path.join(args.output_dir, page_filename(page_num))
+            start = time.perf_counter()
+            width, height = render_page_tiled(doc[page_num - 1], filepath, dpi=args.dpi,
+                                              memory_budget=args.budget_mb * 1024 * 1024,
+                                              tile_size=args.tile)
+            print(f"✓ 페이지 {page_num}: {width}x{height} "
+                  f"(전체 Pixmap이면 {width * height * 3 / 1024 / 1024:.0f}MB) "
+                  f"→ {filepath} ({os.path.getsize(filepath) / 1024 / 1024:.1f}MB, "
+                  f"{time.perf_counter() - start:.1f}초)")
+    return 0
+
+
+if __name__ == "__main__":
+    # UTF-8 인코딩 강제 설정 (Windows cp949 문제 해결)
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+    sys.stderr.reconfigure(encoding='utf-8', errors='replace')
+
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""
+테스트 공통 설정
+
+scripts/의 모듈은 `python scripts/xxx.py`로 실행할 때처럼 서로를 최상위 모듈로
+import하므로, 테스트에서도 scripts/를 import 경로에 추가한다.
+"""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+
+@pytest.fixture
+def make_pdf(tmp_path):
+    """
+    페이지마다 글자만 있는 작은 PDF 만들기
+
+    make_pdf(["1쪽 텍스트", "2쪽 텍스트"], name="book.pdf") → 경로
+    """
+    import fitz
+
+    def make(texts, name="book.pdf"):
+        path = tmp_path / name
+        doc = fitz.open()
+        for text in texts:
+            page = doc.new_page(width=200, height=280)
+            page.insert_text((20, 40), text, fontsize=14)
+        doc.save(path)
+        doc.close()
+        return str(path)
+
+    return make
+
+
+class RecordingOCR:
+    """
+    BatchOCREngine 대신 쓰는 OCR 엔진 (인식한 파일명을 기록하고 고정된 결과를 돌려줌)
+
+    Args:
+        fail_after: 이만큼 인식한 뒤 다음 이미지에서 RuntimeError (중단 재현용)
+    """
+
+    def __init__(self, batch_size=2, fail_after=None):
+        self.batch_size = batch_size
+        self.workers = 1
+        self.settings = {"engine": "recording"}
+        self.fail_after = fail_after
+        self.calls = []
+
+    def iter_recognize(self, images):
+        for index, image in enumerate(images):
+            path = image if isinstance(image, str) else image[0]
+            if self.fail_after is not None and len(self.calls) >= self.fail_after:
+                raise RuntimeError("OCR 중단")
+            self.calls.append(os.path.basename(path))
+            yield index, {"full_text": f"text of {os.path.basename(path)}", "details": []}
+
+
+@pytest.fixture
+def recording_ocr():
+    """RecordingOCR 생성 함수"""
+    return RecordingOCR
@@ -0,0 +1,180 @@
+"""build_graph: 오래된 대상만 의존성 순서대로 다시 빌드하는지 (매니페스트는 파일로 저장/로드)"""
+import threading
+import time
+
+import pytest
+
+from build_graph import BuildGraph, Target
+from build_manifest import BuildManifest
+
+
+class Project:
+    """
+    render:{p} → ocr:{p} → export 대상을 가진 작은 빌드
+
+    inputs: {대상 이름: 입력 값} (바꾸면 그 대상이 오래됨)
+    """
+
+    def __init__(self, tmp_path, names=("a", "b")):
+        self.tmp_path = tmp_path
+        self.names = names
+        self.inputs = {}
+        self.calls = []
+        self.fail = set()
+
+    def output(self, name):
+        return self.tmp_path / (name.replace(":", "_").replace("/", "_") + ".txt")
+
+    def action(self, name):
+        def run():
+            self.calls.append(name)
+            if name in self.fail:
+                raise RuntimeError(f"{name} 실패")
+            path = self.output(name)
+            path.write_text(f"{name} {self.inputs.get(name)}", encoding="utf-8")
+            return [str(path)]
+        return run
+
+    def target(self, name, deps=()):
+        return Target(name, self.action(name), deps=deps,
+                      inputs=lambda: {"value": self.inputs.get(name)})
+
+    def graph(self):
+        # 실제 빌드처럼 매번 디스크의 매니페스트에서 시작
+        graph = BuildGraph(BuildManifest(str(self.tmp_path / "manifest.json")))
+        for p in self.names:
+            graph.add(self.target(f"render:{p}"))
+            graph.add(self.target(f"ocr:{p}", deps=[f"render:{p}"]))
+        graph.add(self.target("export", deps=[f"ocr:{p}" for p in self.names]))
+        return graph
+
+    def build(self, patterns=None, **kwargs):
+        self.calls = []
+        graph = self.graph()
+        return graph.run(graph.select(patterns), **kwargs)
+
+
+def test_clean_build_then_no_op(tmp_path):
+    project = Project(tmp_path)
+    built, skipped, failed = project.build()
+    assert set(built) == {"render:a", "ocr:a", "render:b", "ocr:b", "export"}
+    assert project.calls.index("render:a") < project.calls.index("ocr:a") \
+        < project.calls.index("export")
+    assert not skipped and not failed
+
+    built, skipped, failed = project.build()
+    assert built == [] and project.calls == []
+    assert len(skipped) == 5
+
+
+def test_changed_input_rebuilds_dependents_only(tmp_path):
+    project = Project(tmp_path)
+    project.build()
+
+    project.inputs["render:a"] = 2
+    graph = project.graph()
+    assert graph.plan(graph.select()) == ["render:a", "ocr:a", "export"]
+
+    built, skipped, _ = project.build()
+    assert built == ["render:a", "ocr:a", "export"]
+    assert set(skipped) == {"render:b", "ocr:b"}
+    assert project.build()[0] == []
+
+
+def test_missing_or_edited_output_rebuilds(tmp_path):
+    project = Project(tmp_path)
+    project.build()
+
+    project.output("ocr:b").unlink()
+    assert project.build()[0] == ["ocr:b", "export"]
+
+    # 크기는 같고 내용만 바뀐 출력도 해시로 감지
+    path = project.output("render:a")
+    path.write_text(path.read_text(encoding="utf-8").upper(), encoding="utf-8")
+    assert project.build()[0] == ["render:a", "ocr:a", "export"]
+
+
+def test_inputs_recorded_after_action(tmp_path):
+    # 실행하면서 입력이 생기는 대상 (예: 렌더링 중에 판정되는 중복 페이지)도
+    # 한 번 빌드한 뒤에는 최신이어야 함
+    project = Project(tmp_path)
+    run_render = project.action("render:a")
+
+    def render_with_side_effect():
+        project.inputs["render:a"] = "found during build"
+        return run_render()
+
+    def graph():
+        graph = BuildGraph(BuildManifest(str(tmp_path / "manifest.json")))
+        graph.add(Target("render:a", render_with_side_effect,
+                         inputs=lambda: {"value": project.inputs.get("render:a")}))
+        graph.add(project.target("ocr:a", deps=["render:a"]))
+        return graph
+
+    assert graph().run({"render:a", "ocr:a"})[0] == ["render:a", "ocr:a"]
+    built, skipped, _ = graph().run({"render:a", "ocr:a"})
+    assert built == [] and skipped == ["render:a", "ocr:a"]
+
+
+def test_failure_skips_dependents_and_retries(tmp_path):
+    project = Project(tmp_path)
+    project.fail = {"ocr:a"}
+    built, _, failed = project.build()
+    assert set(built) == {"render:a", "render:b", "ocr:b"}
+    assert set(failed) == {"ocr:a", "export"}
+    assert "export" not in project.calls
+
+    project.fail = set()
+    assert project.build()[0] == ["ocr:a", "export"]
+
+
+def test_force_and_select(tmp_path):
+    project = Project(tmp_path, names=("2024/a", "2024/b"))
+    project.build()
+
+    graph = project.graph()
+    assert graph.select(["ocr:2024/b"]) == {"render:2024/b", "ocr:2024/b"}
+    assert graph.select(["2024/b"]) == {"render:2024/b", "ocr:2024/b"}
+    assert graph.select(["render"]) == {"render:2024/a", "render:2024/b"}
+    assert graph.select(["ocr:2024/*"]) == graph.select(["2024/a", "2024/b"])
+    with pytest.raises(KeyError):
+        graph.select(["tiles"])
+
+    assert project.build(["ocr:2024/b"], force=True)[0] == ["render:2024/b", "ocr:2024/b"]
+    # ocr:2024/b가 다시 빌드되었으므로 export도 오래됨
+    assert project.build()[0] == ["export"]
+
+
+def test_cycle_is_rejected(tmp_path):
+    graph = BuildGraph(BuildManifest(str(tmp_path / "manifest.json")))
+    graph.add(Target("x:1", list, deps=["y:1"]))
+    graph.add(Target("y:1", list, deps=["x:1"]))
+    with pytest.raises(ValueError):
+        graph.order({"x:1", "y:1"})
+    with pytest.raises(ValueError):
+        graph.add(Target("x:1", list))
+
+
+def test_resource_runs_one_at_a_time(tmp_path):
+    lock = threading.Lock()
+    running = []
+    overlaps = []
+
+    def action(name):
+        def run():
+            with lock:
+                running.append(name)
+                if len(running) > 1:
+                    overlaps.append(tuple(running))
+            time.sleep(0.02)
+            with lock:
+                running.remove(name)
+            return []
+        return run
+
+    graph = BuildGraph(BuildManifest(str(tmp_path / "manifest.json")))
+    for p in "abcd":
+        graph.add(Target(f"render:{p}", action(p), resource="render"))
+    built, _, _ = graph.run(graph.select(), jobs=4)
+    assert len(built) == 4
+    assert overlaps == []
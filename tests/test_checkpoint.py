@@ -0,0 +1,144 @@
+"""page_pipeline: 체크포인트 기록/복구와 스트리밍 처리의 이어서 처리"""
+import json
+import os
+
+import pytest
+
+from page_pipeline import (CHECKPOINT_FILENAME, CHECKPOINT_VERSION, Checkpoint, finalize,
+                           settings_digest, stream_pages)
+
+SETTINGS = {
+    "dpi": 72,
+    "max_width": 200,
+    "quality": 85,
+    "single_pass": True,
+    "render_memory_mb": 64,
+    "web_formats": [],
+    "web_widths": [],
+    "text_layer": False,
+    "ocr_regions": False,
+    "dedupe": False,
+}
+WORKERS = {"render": 1, "encode": 1}
+
+
+def result(text):
+    return {"full_text": text, "details": []}
+
+
+def touch(path):
+    with open(path, "wb"):
+        pass
+
+
+def test_resume_after_reopen(tmp_path):
+    path = str(tmp_path / CHECKPOINT_FILENAME)
+    checkpoint = Checkpoint(path, "digest")
+    checkpoint.append("page_001.png", result("하나"), fingerprint="f1")
+    checkpoint.append("page_002.png", result("둘"), fingerprint="f2")
+    checkpoint.close()
+
+    reopened = Checkpoint(path, "digest")
+    assert list(reopened.pages) == ["page_001.png", "page_002.png"]
+    assert reopened.pages["page_002.png"]["result"] == result("둘")
+
+    # 이미지 파일도 남아 있어야 끝난 페이지
+    assert not reopened.done("page_001.png", str(tmp_path))
+    touch(tmp_path / "page_001.png")
+    assert reopened.done("page_001.png", str(tmp_path), "f1")
+
+
+def test_fingerprint_mismatch_drops_entry(tmp_path):
+    checkpoint = Checkpoint(str(tmp_path / CHECKPOINT_FILENAME), "digest")
+    checkpoint.append("page_001.png", result("옛 판"), fingerprint="old")
+    touch(tmp_path / "page_001.png")
+
+    assert not checkpoint.done("page_001.png", str(tmp_path), "new")
+    assert "page_001.png" not in checkpoint.pages
+
+
+def test_truncated_line_is_discarded(tmp_path):
+    path = str(tmp_path / CHECKPOINT_FILENAME)
+    checkpoint = Checkpoint(path, "digest")
+    checkpoint.append("page_001.png", result("하나"))
+    checkpoint.close()
+    # 쓰는 도중 중단되어 마지막 줄이 잘린 상태
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"page": "page_002.png", "result": {"full_te')
+
+    reopened = Checkpoint(path, "digest")
+    assert list(reopened.pages) == ["page_001.png"]
+    reopened.append("page_002.png", result("둘"))
+    reopened.close()
+
+    # 잘린 줄이 지워졌으므로 이어 쓴 줄이 온전하게 읽힘
+    with open(path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert [json.loads(line).get("page") for line in lines[1:]] == ["page_001.png", "page_002.png"]
+    assert list(Checkpoint(path, "digest").pages) == ["page_001.png", "page_002.png"]
+
+
+@pytest.mark.parametrize("header", [
+    {"checkpoint": CHECKPOINT_VERSION, "settings": "other"},
+    {"checkpoint": CHECKPOINT_VERSION - 1, "settings": "digest"},
+    None,
+])
+def test_stale_checkpoint_is_discarded(tmp_path, header):
+    path = tmp_path / CHECKPOINT_FILENAME
+    entry = json.dumps({"page": "page_001.png", "result": result("x")})
+    path.write_text((json.dumps(header) if header else "not json") + "\n" + entry + "\n",
+                    encoding="utf-8")
+
+    checkpoint = Checkpoint(str(path), "digest")
+    assert checkpoint.pages == {}
+    assert not path.exists()
+
+
+def test_settings_digest_inputs():
+    base = settings_digest(SETTINGS, {"engine": 1}, "pdf-sha", (1, 3))
+    assert base == settings_digest(dict(SETTINGS), {"engine": 1}, "pdf-sha", [1, 3])
+    assert base != settings_digest({**SETTINGS, "dpi": 150}, {"engine": 1}, "pdf-sha", (1, 3))
+    assert base != settings_digest(SETTINGS, {"engine": 2}, "pdf-sha", (1, 3))
+    assert base != settings_digest(SETTINGS, {"engine": 1}, "other-pdf", (1, 3))
+    assert base != settings_digest(SETTINGS, {"engine": 1}, "pdf-sha", (1, 4))
+
+
+def test_stream_resumes_after_interruption(tmp_path, make_pdf, recording_ocr):
+    pdf_path = make_pdf([f"Page {n}" for n in range(1, 6)])
+    output_dir = str(tmp_path / "out")
+    os.makedirs(output_dir)
+
+    # 두 번째 배치 도중 OCR이 중단됨 → 첫 배치(2페이지)만 체크포인트에 남음
+    engine = recording_ocr(batch_size=2, fail_after=3)
+    with pytest.raises(RuntimeError):
+        stream_pages(pdf_path, (1, 5), output_dir, engine, SETTINGS, WORKERS)
+    assert os.path.exists(os.path.join(output_dir, CHECKPOINT_FILENAME))
+
+    engine = recording_ocr(batch_size=2)
+    checkpoint, filenames = stream_pages(pdf_path, (1, 5), output_dir, engine, SETTINGS, WORKERS)
+    assert engine.calls == ["page_003.png", "page_004.png", "page_005.png"]
+    assert filenames == [f"page_{n:03d}.png" for n in range(1, 6)]
+
+    outputs = finalize(checkpoint, filenames, output_dir, {"title": "책"}, SETTINGS)
+    with open(os.path.join(output_dir, "ocr_text.json"), encoding="utf-8") as f:
+        data = json.load(f)
+    assert data["title"] == "책"
+    assert {name: page["full_text"] for name, page in data["ocr_results"].items()} == \
+        {name: f"text of {name}" for name in filenames}
+    assert os.path.join(output_dir, "ocr_text.json") in outputs
+    assert not os.path.exists(os.path.join(output_dir, CHECKPOINT_FILENAME))
+
+
+def test_stream_restarts_when_pdf_changes(tmp_path, make_pdf, recording_ocr):
+    output_dir = str(tmp_path / "out")
+    os.makedirs(output_dir)
+    pdf_path = make_pdf(["Page 1", "Page 2", "Page 3"])
+    with pytest.raises(RuntimeError):
+        stream_pages(pdf_path, (1, 3), output_dir, recording_ocr(batch_size=1, fail_after=2),
+                     SETTINGS, WORKERS)
+
+    # 같은 경로에 수정된 PDF → 체크포인트를 버리고 모든 페이지를 다시 처리
+    make_pdf(["Page 1", "Page 2 (수정)", "Page 3"])
+    engine = recording_ocr(batch_size=1)
+    stream_pages(pdf_path, (1, 3), output_dir, engine, SETTINGS, WORKERS)
+    assert engine.calls == ["page_001.png", "page_002.png", "page_003.png"]
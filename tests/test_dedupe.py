@@ -0,0 +1,143 @@
+"""image_hash / image_encode: 지각 해시 색인과 중복 페이지 처리"""
+import io
+import json
+import os
+import random
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+
+from image_encode import VARIANTS_FILENAME, duplicate_sources, encode_pages, stale_duplicates
+from image_hash import (BKTree, HashIndex, _synthetic_page, hamming, image_hashes, same_image)
+
+FORMATS = ["webp"]
+WIDTHS = [160]
+
+
+def png_bytes(img, fmt="PNG", **options):
+    buffer = io.BytesIO()
+    img.save(buffer, fmt, **options)
+    return buffer.getvalue()
+
+
+def test_bk_tree_matches_brute_force():
+    rng = random.Random(0)
+    keys = [rng.getrandbits(64) for _ in range(300)]
+    tree = BKTree()
+    for index, key in enumerate(keys):
+        tree.add(key, index)
+    assert len(tree) == len(keys)
+
+    for _ in range(50):
+        query = rng.choice(keys) ^ rng.getrandbits(64) & rng.getrandbits(64) & rng.getrandbits(64)
+        expected = sorted(index for index, key in enumerate(keys) if hamming(query, key) <= 12)
+        assert sorted(value for _, _, value in tree.search(query, 12)) == expected
+
+
+@pytest.fixture(scope="module")
+def page():
+    return _synthetic_page(12, "Character design by Kim")
+
+
+@pytest.mark.parametrize("label, make_other, expected", [
+    ("쪽 번호만 다름", lambda page: png_bytes(_synthetic_page(13, "Character design by Kim")),
+     False),
+    ("캡션 한 단어만 다름", lambda page: png_bytes(_synthetic_page(12, "Character design by Lee")),
+     False),
+    ("JPEG 재압축", lambda page: png_bytes(page, "JPEG", quality=70), True),
+    ("WebP 재압축", lambda page: png_bytes(page, "WEBP", quality=60), True),
+    ("절반 크기", lambda page: png_bytes(page.reduce(2)), True),
+    ("가로세로 비율이 다름", lambda page: png_bytes(page.crop((0, 0, 1920, 2400))), False),
+])
+def test_same_image(page, label, make_other, expected):
+    assert same_image(png_bytes(page), make_other(page)) is expected, label
+
+
+def make_page(path, seed, caption=""):
+    """잡음 그림 + 캡션이 있는 작은 페이지 PNG"""
+    rng = np.random.default_rng(seed)
+    img = Image.new("RGB", (320, 448), "white")
+    img.paste(Image.fromarray(rng.integers(0, 255, (300, 280, 3), dtype=np.uint8)), (20, 20))
+    ImageDraw.Draw(img).text((20, 400), caption, fill="black")
+    img.save(path)
+    return str(path)
+
+
+def test_hash_index_find(tmp_path):
+    index = HashIndex(str(tmp_path / "index.json"))
+    original = make_page(tmp_path / "a.png", 1)
+    copy = make_page(tmp_path / "b.png", 1)
+    other = make_page(tmp_path / "c.png", 2)
+    hashes = dict(zip([original, copy, other], image_hashes([original, copy, other])))
+
+    index.add(original, hashes[original], "web")
+    # 저장 정보가 아직 없는 원본은 같은 호출에서 등록한 경우(pending)에만 후보
+    assert index.find(copy, hashes[copy], "web") is None
+    assert index.find(copy, hashes[copy], "web", pending={original}) == original
+
+    index.set_variants(original, {"path": original})
+    assert index.find(copy, hashes[copy], "web") == original
+    assert index.find(original, hashes[original], "web") is None   # 자기 자신
+    assert index.find(copy, hashes[copy], "other-space") is None
+    assert index.find(other, hashes[other], "web") is None
+
+    # 저장하고 다시 읽어도 같은 결과
+    index.save()
+    reloaded = HashIndex(str(tmp_path / "index.json"))
+    assert reloaded.find(copy, hashes[copy], "web") == original
+
+    # 원본 파일이 없어지면 후보에서 제외
+    os.remove(original)
+    assert reloaded.find(copy, hashes[copy], "web") is None
+
+
+@pytest.fixture
+def projects(tmp_path):
+    """프로젝트 A(원본)와 B(A의 1쪽과 같은 페이지 + 다른 페이지)를 인코딩한 상태"""
+    a_dir, b_dir = tmp_path / "2023" / "alpha", tmp_path / "2024" / "beta"
+    a_dir.mkdir(parents=True)
+    b_dir.mkdir(parents=True)
+    a_pages = [make_page(a_dir / "page_001.png", 1, "Kim"), make_page(a_dir / "page_002.png", 2)]
+    b_pages = [make_page(b_dir / "page_001.png", 3), make_page(b_dir / "page_002.png", 1, "Kim")]
+
+    index = HashIndex(str(tmp_path / "index.json"))
+    encode_pages(a_pages, FORMATS, WIDTHS, hash_index=index)
+    encode_pages(b_pages, FORMATS, WIDTHS, hash_index=index)
+    with open(b_dir / VARIANTS_FILENAME, encoding="utf-8") as f:
+        sidecar = json.load(f)
+    return index, str(a_dir), str(b_dir), sidecar
+
+
+def test_encode_pages_shares_duplicate(projects):
+    index, a_dir, b_dir, sidecar = projects
+    assert sidecar["page_001.png"].get("same_as") is None
+    duplicate = sidecar["page_002.png"]
+    assert duplicate["same_as"] == "../../2023/alpha/page_001.png"
+    # 원본 프로젝트의 웹 이미지를 가리킴 (따로 인코딩하지 않음)
+    assert [v["path"] for v in duplicate["variants"]] == ["../../2023/alpha/page_001-160.webp"]
+    assert not os.path.exists(os.path.join(b_dir, "page_002-160.webp"))
+    assert stale_duplicates(b_dir, sidecar, index) == set()
+    assert set(duplicate_sources(b_dir)) == {"page_002.png"}
+
+
+def test_stale_when_canonical_changes(projects):
+    index, a_dir, b_dir, sidecar = projects
+    before = duplicate_sources(b_dir)
+
+    # 캡션 한 단어만 바뀌어도 (해시는 같더라도) 원본이 바뀐 것으로 봄
+    make_page(os.path.join(a_dir, "page_001.png"), 1, "Lee")
+    assert stale_duplicates(b_dir, sidecar, index) == {"page_002.png"}
+    assert duplicate_sources(b_dir) != before
+
+
+def test_stale_when_canonical_files_missing(projects):
+    index, a_dir, b_dir, sidecar = projects
+    os.remove(os.path.join(a_dir, "page_001-160.webp"))
+    assert stale_duplicates(b_dir, sidecar, index) == {"page_002.png"}
+
+
+def test_stale_when_canonical_dropped_from_index(projects, tmp_path):
+    _, _, b_dir, sidecar = projects
+    empty = HashIndex(str(tmp_path / "empty.json"))
+    assert stale_duplicates(b_dir, sidecar, empty) == {"page_002.png"}
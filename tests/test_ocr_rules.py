@@ -0,0 +1,109 @@
+"""ocr_rules: 단일 패스 치환이 차례로 str.replace 한 결과와 같은지, 규칙 파일 계층"""
+import json
+import os
+import random
+
+import pytest
+
+from ocr_rules import RULES_DIR, RuleStore, _read_layer, compile_replacements
+
+
+def sequential(replacements, text):
+    """기준: 치환 표를 순서대로 str.replace"""
+    for wrong, correct in replacements.items():
+        text = text.replace(wrong, correct)
+    return text
+
+
+@pytest.mark.parametrize("replacements, text", [
+    # 연쇄 치환 (앞 항목의 결과가 뒤 항목의 키)
+    ({"a": "b", "b": "c"}, "aabbcc"),
+    ({"b": "c", "a": "b"}, "aabbcc"),
+    # 겹치는 여러 글자 키
+    ({"ab": "x", "b": "y", "bc": "z"}, "abcabc bcab"),
+    ({"aa": "a"}, "aaaaa"),
+    # 삭제로 떨어져 있던 문자열이 붙는 경우
+    ({"-": "", "ab": "X"}, "a-b a--b ab"),
+    ({"ab": "X", "-": ""}, "a-b a--b ab"),
+    # 한 글자/여러 글자 섞임, 결과가 다른 키를 만드는 경우
+    ({"ㅇ": "이", "이다": "입니다", "다.": "다!"}, "ㅇ다. 이다. 다."),
+    # 키와 값이 같은 항목은 무시
+    ({"a": "a", "b": "c"}, "abc"),
+    ({}, "그대로"),
+])
+def test_compile_matches_sequential(replacements, text):
+    assert compile_replacements(replacements)(text) == sequential(replacements, text)
+
+
+def test_compile_matches_sequential_random():
+    # 작은 알파벳으로 만든 무작위 치환 표는 연쇄/겹침이 자주 생김
+    rng = random.Random(0)
+    alphabet = "abc-"
+    for _ in range(500):
+        replacements = {}
+        for _ in range(rng.randint(1, 6)):
+            wrong = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 3)))
+            replacements[wrong] = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 2)))
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+        assert compile_replacements(replacements)(text) == sequential(replacements, text), \
+            (replacements, text)
+
+
+def test_shipped_rules_match_sequential():
+    # 저장소의 실제 공통 규칙으로 규칙의 키가 모두 들어간 텍스트를 정리
+    replacements = {}
+    for wrong, correct in _read_layer(RULES_DIR / "common.json")[0]:
+        replacements[wrong] = correct
+    text = " ".join(f"가{wrong}나" for wrong in replacements) + " 그대로인 문장"
+    assert compile_replacements(replacements)(text) == sequential(replacements, text)
+
+
+def write_rules(path, replacements=(), pages=None):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"version": 1, "replacements": [list(pair) for pair in replacements],
+                                "pages": pages or {}}, ensure_ascii=False), encoding="utf-8")
+
+
+def test_rule_store_layers(tmp_path):
+    write_rules(tmp_path / "common.json", [("a", "1"), ("b", "2")])
+    write_rules(tmp_path / "2024.json", [("b", "3")])
+    write_rules(tmp_path / "2024" / "cat.json", [("c", "4")], pages={"page_001.png": "새 텍스트"})
+    store = RuleStore(tmp_path)
+
+    rules = store.get("2024", "cat")
+    # 뒤 단계가 같은 키를 덮어쓰되 처음 등장한 순서는 유지
+    assert list(rules.replacements.items()) == [("a", "1"), ("b", "3"), ("c", "4")]
+    assert rules.pages == {"page_001.png": "새 텍스트"}
+    assert rules.apply("abc") == "134"
+    assert store.get("2023", "cat").replacements == {"a": "1", "b": "2"}
+    assert store.projects_with_pages() == [("2024", "cat")]
+
+
+def test_rule_store_reloads_changed_file(tmp_path):
+    path = tmp_path / "common.json"
+    write_rules(path, [("a", "1")])
+    store = RuleStore(tmp_path)
+    assert store.get().apply("a") == "1"
+    assert store.get() is store.get()
+
+    write_rules(path, [("a", "2")])
+    stat = path.stat()
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+    assert store.get().apply("a") == "2"
+
+
+def test_page_digest_tracks_only_relevant_rules(tmp_path):
+    path = tmp_path / "common.json"
+    write_rules(path, [("x", "y")])
+    store = RuleStore(tmp_path)
+    before = store.get().page_digest("page_001.png", ["abc"])
+
+    # 페이지에 나올 수 없는 규칙이 추가되면 지문은 그대로
+    write_rules(path, [("x", "y"), ("q", "r")])
+    os.utime(path, (path.stat().st_atime, path.stat().st_mtime + 10))
+    assert store.get().page_digest("page_001.png", ["abc"]) == before
+
+    # 페이지 텍스트에 적용되는 규칙이 추가되면 지문이 바뀜
+    write_rules(path, [("x", "y"), ("q", "r"), ("b", "B")])
+    os.utime(path, (path.stat().st_atime, path.stat().st_mtime + 20))
+    assert store.get().page_digest("page_001.png", ["abc"]) != before
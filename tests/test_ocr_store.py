@@ -0,0 +1,113 @@
+"""ocr_store: 컬럼형 저장소가 ocr_text.json과 같은 내용을 돌려주는지"""
+import json
+import os
+
+import pytest
+
+from ocr_store import OCRStore, convert_year, load_ocr_data, store_path_for, write_store
+
+
+def box(text, confidence, x=0, y=0):
+    return {"text": text, "confidence": confidence,
+            "bbox": [[x, y], [x + 10, y], [x + 10, y + 5], [x, y + 5]]}
+
+
+def make_doc(project_id, title):
+    return {
+        "project_id": project_id,
+        "title": title,
+        "year": "2024",
+        "pages": [1, 3],
+        "applied_rules": {"page_001.png": "abc"},
+        "ocr_results": {
+            "page_001.png": {"full_text": "캐릭터 디자인 Character",
+                             "details": [box("캐릭터", 0.9), box("디자인", 0.123456789, 20, 0),
+                                         box("Character", 1.0, -5, 32762)]},
+            # 같은 문자열이 여러 번 나와도 그대로 (문자열 표에서 중복 제거)
+            "page_002.png": {"full_text": "캐릭터", "details": [box("캐릭터", 0.5)],
+                             "source": "text_layer"},
+            "page_003.png": {"full_text": "", "details": []},
+        },
+    }
+
+
+def test_round_trip(tmp_path):
+    docs = [("alpha", make_doc("alpha", "알파")), ("beta", make_doc("beta", "Beta"))]
+    path = tmp_path / "ocr_text.bin"
+    write_store(path, docs)
+
+    with OCRStore(path) as store:
+        assert store.project_ids == ["alpha", "beta"]
+        for project_id, doc in docs:
+            assert store.document(project_id) == doc
+            assert store.page_names(project_id) == list(doc["ocr_results"])
+            assert store.full_text(project_id, "page_001.png") == "캐릭터 디자인 Character"
+        # float64로 저장하므로 JSON의 신뢰도와 정확히 같음
+        assert store.page("alpha", "page_001.png")["details"][1]["confidence"] == 0.123456789
+
+
+def test_empty_documents(tmp_path):
+    path = tmp_path / "ocr_text.bin"
+    write_store(path, [("empty", {"title": "빈 프로젝트", "ocr_results": {}})])
+    with OCRStore(path) as store:
+        assert store.document("empty") == {"title": "빈 프로젝트", "ocr_results": {}}
+
+
+def test_bbox_out_of_range(tmp_path):
+    doc = {"ocr_results": {"page_001.png": {"full_text": "x",
+                                            "details": [box("x", 1.0, 0, 40000)]}}}
+    with pytest.raises(ValueError):
+        write_store(tmp_path / "ocr_text.bin", [("p", doc)])
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "ocr_text.bin"
+    path.write_bytes(b"JUNK" + bytes(32))
+    with pytest.raises(ValueError):
+        OCRStore(path)
+
+
+def write_json(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+
+def set_mtime(path, mtime):
+    os.utime(path, (mtime, mtime))
+
+
+def test_load_ocr_data_prefers_newer_source(tmp_path):
+    json_path = tmp_path / "2024" / "alpha" / "ocr_text.json"
+    stored = make_doc("alpha", "저장소")
+    write_json(json_path, make_doc("alpha", "JSON"))
+    assert store_path_for(json_path) == tmp_path / "2024" / "ocr_text.bin"
+
+    convert_year(tmp_path / "2024")
+    with OCRStore(store_path_for(json_path)) as store:
+        assert store.document("alpha")["title"] == "JSON"
+
+    # 저장소가 JSON보다 최신이면 저장소에서, JSON이 더 최신이면 JSON에서 읽음
+    write_store(store_path_for(json_path), [("alpha", stored)])
+    set_mtime(json_path, 1_000_000)
+    set_mtime(store_path_for(json_path), 2_000_000)
+    assert load_ocr_data(json_path) == stored
+
+    set_mtime(json_path, 3_000_000)
+    assert load_ocr_data(json_path)["title"] == "JSON"
+
+
+def test_load_ocr_data_falls_back_to_json(tmp_path):
+    json_path = tmp_path / "2024" / "beta" / "ocr_text.json"
+    write_json(json_path, make_doc("beta", "JSON"))
+    store_path = store_path_for(json_path)
+
+    # 저장소에 없는 프로젝트, 읽을 수 없는 저장소는 JSON에서 읽음
+    write_store(store_path, [("alpha", make_doc("alpha", "다른 프로젝트"))])
+    set_mtime(json_path, 1_000_000)
+    assert load_ocr_data(json_path)["title"] == "JSON"
+
+    store_path.write_bytes(b"JUNK" + bytes(32))
+    set_mtime(json_path, 1_000_000)
+    assert load_ocr_data(json_path)["title"] == "JSON"
+
+    assert load_ocr_data(tmp_path / "2024" / "gamma" / "ocr_text.json") is None
@@ -0,0 +1,81 @@
+"""page_fingerprint: 개정판 사이에 바뀐 페이지만 다시 렌더링 대상이 되는지"""
+import io
+
+import fitz
+import numpy as np
+from PIL import Image
+
+from page_fingerprint import (diff_pdfs, fingerprint_pages, save_index, unchanged_pages)
+from pdf_render import page_filename
+
+SETTINGS = {"dpi": 72, "max_width": 200}
+
+
+def jpeg(seed):
+    rng = np.random.default_rng(seed)
+    buffer = io.BytesIO()
+    Image.fromarray(rng.integers(0, 255, (40, 60, 3), dtype=np.uint8)).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+def make_book(path, texts, image_seeds=None, **save_options):
+    """페이지마다 글자와 (선택) 이미지가 있는 PDF"""
+    doc = fitz.open()
+    for index, text in enumerate(texts):
+        page = doc.new_page(width=200, height=280)
+        page.insert_text((20, 40), text, fontsize=14)
+        if image_seeds and image_seeds[index] is not None:
+            page.insert_image(fitz.Rect(20, 60, 140, 140), stream=jpeg(image_seeds[index]))
+    doc.save(str(path), **save_options)
+    doc.close()
+    return str(path)
+
+
+def test_resave_keeps_fingerprints(tmp_path):
+    texts = ["Page 1", "Page 2", "Page 3"]
+    old = make_book(tmp_path / "old.pdf", texts, [1, None, 2])
+    # 다시 저장하면서 xref 번호가 바뀌어도 지문은 같음
+    new = make_book(tmp_path / "new.pdf", texts, [1, None, 2], garbage=4, deflate=True)
+    assert fingerprint_pages(old) == fingerprint_pages(new)
+    assert diff_pdfs(old, new) == ([], [], [])
+
+
+def test_diff_finds_changed_pages(tmp_path):
+    old = make_book(tmp_path / "old.pdf", ["Page 1", "Page 2", "Page 3"], [1, 2, 3])
+    new = make_book(tmp_path / "new.pdf", ["Page 1", "Page 2 fixed", "Page 3", "Page 4"],
+                    [1, 2, 4, None])
+    # 2쪽은 글자, 3쪽은 이미지가 바뀜
+    assert diff_pdfs(old, new) == ([2, 3], [4], [])
+    assert diff_pdfs(new, old) == ([2, 3], [], [4])
+
+
+def write_images(output_dir, page_numbers):
+    for n in page_numbers:
+        (output_dir / page_filename(n)).write_bytes(b"png")
+
+
+def test_unchanged_pages(tmp_path):
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+    old = make_book(tmp_path / "old.pdf", ["Page 1", "Page 2", "Page 3"])
+
+    # 기록이 없으면 모든 페이지를 렌더링
+    current, same = unchanged_pages(old, [1, 2, 3], str(output_dir), SETTINGS)
+    assert same == set()
+    assert sorted(current) == [page_filename(n) for n in (1, 2, 3)]
+
+    write_images(output_dir, [1, 2, 3])
+    save_index(str(output_dir), current, SETTINGS)
+    assert unchanged_pages(old, [1, 2, 3], str(output_dir), SETTINGS)[1] == {1, 2, 3}
+
+    # 새 개정판: 2쪽만 바뀜, 3쪽은 이미지 파일이 없어짐
+    new = make_book(tmp_path / "new.pdf", ["Page 1", "Page 2 fixed", "Page 3"])
+    (output_dir / page_filename(3)).unlink()
+    assert unchanged_pages(new, [1, 2, 3], str(output_dir), SETTINGS)[1] == {1}
+
+    # 렌더링 설정이 바뀌면 모든 페이지를 다시 렌더링
+    assert unchanged_pages(old, [1, 2], str(output_dir), {**SETTINGS, "dpi": 150})[1] == set()
+
+    # PDF에 없는 페이지는 지문도 없음
+    current, same = unchanged_pages(old, [1, 4], str(output_dir), SETTINGS)
+    assert sorted(current) == [page_filename(1)] and same == {1}